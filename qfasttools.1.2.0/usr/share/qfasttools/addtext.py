@@ -1,34 +1,83 @@
 #!/usr/bin/env python3
 import sys
 import os
-import io
 from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, 
                              QLabel, QPushButton, QMessageBox, QSlider, 
                              QGroupBox, QFrame, QCheckBox, QLineEdit, 
                              QFontComboBox, QSpinBox, QColorDialog)
-from PyQt5.QtGui import QPixmap, QImage, QCursor, QPalette, QColor, QFont, QIcon
-from PyQt5.QtCore import Qt, QTimer, QPoint
-from PIL import Image, ImageDraw, ImageFont
+from PyQt5.QtGui import QPixmap, QImage, QCursor, QPalette, QColor, QFont, QIcon, QPainter
+from PyQt5.QtCore import Qt, QTimer, QPoint, QRect, QRectF
+from PIL import Image, ImageDraw
+from fontcache import load_font
+from qtimage import pil_to_qimage
 import sip
+from outputnames import claim_unique_path, discard_claim
 
 # Debian/Pardus grafik uyumluluğu
 os.environ['QT_QPA_PLATFORM'] = 'xcb'
 
 class TextLabel(QLabel):
-    """Resim üzerinde tıklama konumunu yakalayan özel etiket"""
+    """Resim üzerinde tıklama konumunu yakalayan ve katmanları birleştiren özel etiket.
+
+    Taban resim değişmez bir QImage olarak tutulur; yazı kendi sınır kutusu
+    boyutundaki küçük bir RGBA katmandır ve sadece kirlenen dikdörtgende çizilir.
+    """
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
+        self.base_scaled = None
+
+    def image_rect(self):
+        """Proxy resmin etiket içinde (en-boy oranı korunarak) çizildiği alan ve ölçek."""
+        base = self.parent.base_qimage
+        scale = min(self.width() / base.width(), self.height() / base.height())
+        w, h = int(base.width() * scale), int(base.height() * scale)
+        return QRect((self.width() - w) // 2, (self.height() - h) // 2, w, h), scale
+
+    def layer_rect(self):
+        layer = self.parent.text_layer
+        if self.parent.base_qimage is None or layer is None:
+            return QRect()
+        area, scale = self.image_rect()
+        x, y = self.parent.text_layer_origin
+        return QRectF(area.x() + x * scale, area.y() + y * scale,
+                      layer.width() * scale, layer.height() * scale).toAlignedRect()
+
+    def set_text_pos_from_event(self, event):
+        if self.parent.base_qimage is None: return
+        area, scale = self.image_rect()
+        # Tıklanan yerin proxy üzerindeki koordinatı
+        self.parent.text_pos = (int((event.x() - area.x()) / scale), int((event.y() - area.y()) / scale))
+        self.parent.request_preview()
 
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton and self.parent.proxy_image:
-            # Tıklanan noktayı resim koordinatlarına çevir
-            ratio_w = self.parent.proxy_image.width / self.width()
-            ratio_h = self.parent.proxy_image.height / self.height()
-            
-            # Tıklanan yerin proxy üzerindeki koordinatı
-            self.parent.text_pos = (int(event.x() * ratio_w), int(event.y() * ratio_h))
-            self.parent.request_preview()
+            self.set_text_pos_from_event(event)
+
+    def mouseMoveEvent(self, event):
+        if event.buttons() & Qt.LeftButton and self.parent.proxy_image:
+            self.set_text_pos_from_event(event)
+
+    def resizeEvent(self, event):
+        self.base_scaled = None
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        base = self.parent.base_qimage
+        if base is None: return
+        area, _ = self.image_rect()
+        if self.base_scaled is None or self.base_scaled.size() != area.size():
+            self.base_scaled = QPixmap.fromImage(base.scaled(area.size(), Qt.IgnoreAspectRatio, Qt.SmoothTransformation))
+
+        painter = QPainter(self)
+        painter.setClipRect(event.rect())
+        painter.drawPixmap(area.topLeft(), self.base_scaled)
+        layer = self.parent.text_layer
+        if layer is not None:
+            painter.setRenderHint(QPainter.SmoothPixmapTransform)
+            painter.drawImage(QRectF(self.layer_rect()), layer)
+        painter.end()
 
 class QFastAddText(QWidget):
     def __init__(self, target_file=None):
@@ -36,7 +85,9 @@ class QFastAddText(QWidget):
         self.image_path = target_file
         self.original_full = None
         self.proxy_image = None
-        self.display_image = None
+        self.base_qimage = None
+        self.text_layer = None
+        self.text_layer_origin = (0, 0)
         self.text_pos = (50, 50) # Varsayılan başlangıç
         
         self.preview_timer = QTimer()
@@ -165,52 +216,51 @@ class QFastAddText(QWidget):
             w, h = self.original_full.size
             self.proxy_image = self.original_full.resize((w//4, h//4), Image.LANCZOS)
             if self.proxy_image.mode != "RGB": self.proxy_image = self.proxy_image.convert("RGB")
+            # Taban katman bir kez, ekrana hazır biçime çevrilir
+            self.base_qimage = pil_to_qimage(self.proxy_image).convertToFormat(QImage.Format_ARGB32_Premultiplied)
+            self.img_display.base_scaled = None
+            self.img_display.update()
             self.btn_do_it.setEnabled(True)
             self.request_preview()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Load failed: {e}")
 
-    def draw_text_on_image(self, image, is_proxy=True):
+    def render_text_layer(self):
+        """Yazıyı sadece kendi sınır kutusu boyutundaki şeffaf bir katmana çizer."""
         txt = self.input_text.text()
-        if not txt: return image
-        
-        working = image.copy()
-        draw = ImageDraw.Draw(working)
-        
-        font_size = self.spin_size.value()
-        if is_proxy: font_size = font_size // 4
-        
-        try:
-            font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", font_size)
-        except:
-            font = ImageFont.load_default()
+        if not txt: return None, (0, 0)
 
+        font = self.get_selected_font(self.spin_size.value() // 4)
+        left, top, right, bottom = font.getbbox(txt)
+        if right <= left or bottom <= top: return None, (0, 0)
+
+        layer = Image.new("RGBA", (right - left, bottom - top), (0, 0, 0, 0))
         color = (self.selected_color.red(), self.selected_color.green(), self.selected_color.blue())
-        pos = self.text_pos
-        
-        draw.text(pos, txt, fill=color, font=font)
-        return working
+        ImageDraw.Draw(layer).text((-left, -top), txt, fill=color, font=font)
+        origin = (self.text_pos[0] + left, self.text_pos[1] + top)
+        return pil_to_qimage(layer), origin
+
+    def get_selected_font(self, size):
+        """QFontComboBox'ta seçili aile ve B/I düğmelerine göre (önbellekten) font döndürür."""
+        family = self.combo_font.currentFont().family()
+        return load_font(family, size, bold=self.btn_bold.isChecked(), italic=self.btn_italic.isChecked())
 
     def request_preview(self):
         self.preview_timer.start(20)
 
     def process_preview(self):
         if not self.proxy_image: return
-        self.display_image = self.draw_text_on_image(self.proxy_image, is_proxy=True)
-        self.update_display()
-
-    def update_display(self):
-        if self.display_image:
-            byte_array = io.BytesIO()
-            self.display_image.save(byte_array, format='PNG')
-            qimage = QImage.fromData(byte_array.getvalue())
-            pixmap = QPixmap.fromImage(qimage)
-            scaled = pixmap.scaled(self.img_display.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            self.img_display.setPixmap(scaled)
+        old_rect = self.img_display.layer_rect()
+        self.text_layer, self.text_layer_origin = self.render_text_layer()
+        # Sadece eski ve yeni yazı alanları yeniden çizilir
+        dirty = old_rect.united(self.img_display.layer_rect())
+        if not dirty.isEmpty():
+            self.img_display.update(dirty.adjusted(-2, -2, 2, 2))
 
     def process_final_render(self):
         if not self.original_full: return
         QApplication.setOverrideCursor(QCursor(Qt.WaitCursor))
+        output_path = None
         try:
             keep_exif = self.cb_keep_exif.isChecked()
             exif_data = self.original_full.info.get('exif') if keep_exif else None
@@ -221,10 +271,7 @@ class QFastAddText(QWidget):
             work_img = self.original_full.copy()
             draw = ImageDraw.Draw(work_img)
             
-            try:
-                font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", self.spin_size.value())
-            except:
-                font = ImageFont.load_default()
+            font = self.get_selected_font(self.spin_size.value())
             
             color = (self.selected_color.red(), self.selected_color.green(), self.selected_color.blue())
             draw.text(orig_pos, self.input_text.text(), fill=color, font=font)
@@ -237,19 +284,17 @@ class QFastAddText(QWidget):
                 work_img.save(output_path, quality=95)
 
             QMessageBox.information(self, "Success", f"Text added and saved:\n{os.path.basename(output_path)}")
+        except Exception as e:
+            # Rezerve edilmiş ama yazılamamış boş dosya geride kalmasın
+            discard_claim(output_path)
+            QMessageBox.critical(self, "Error", f"Save failed: {e}")
         finally:
             QApplication.restoreOverrideCursor()
 
     def get_unique_path(self):
         directory = os.path.dirname(self.image_path)
         name_part, ext = os.path.splitext(os.path.basename(self.image_path))
-        counter = 1
-        while True:
-            suffix = f"_text{counter:02d}"
-            new_filename = f"{name_part}{suffix}{ext}"
-            full_path = os.path.join(directory, new_filename)
-            if not os.path.exists(full_path): return full_path
-            counter += 1
+        return claim_unique_path(directory, f"{name_part}_text", ext, digits=2)
 
     def dragEnterEvent(self, event):
         if event.mimeData().hasUrls(): event.accept()
@@ -260,7 +305,8 @@ class QFastAddText(QWidget):
         if files: self.load_image(files[0])
 
     def resizeEvent(self, event):
-        if self.display_image: self.update_display()
+        self.img_display.update()
+        super().resizeEvent(event)
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
@@ -9,6 +9,8 @@ from PyQt5.QtGui import QPixmap, QImage, QCursor, QPalette, QColor, QIcon
 from PyQt5.QtCore import Qt, QTimer
 from PIL import Image, ImageEnhance, ImageOps, ImageFilter, ImageDraw
 import sip
+from outputnames import claim_unique_path, discard_claim, strip_suffix
+import ssimquality
 
 # Debian/Pardus grafik uyumluluğu
 os.environ['QT_QPA_PLATFORM'] = 'xcb'
@@ -122,6 +124,12 @@ class QFastImageAdjust(QWidget):
         self.cb_keep_exif.setChecked(True)
         side_panel.addWidget(self.cb_keep_exif)
 
+        self.cb_auto_quality = QCheckBox(f"Auto Quality (SSIM ≥ {ssimquality.DEFAULT_SSIM_TARGET})")
+        if not ssimquality.is_available():
+            self.cb_auto_quality.setEnabled(False)
+            self.cb_auto_quality.setToolTip("Requires NumPy (python3-numpy).")
+        side_panel.addWidget(self.cb_auto_quality)
+
         self.btn_save = QPushButton("SAVE FINAL IMAGE")
         self.btn_save.setFixedHeight(60)
         self.btn_save.setEnabled(False)
@@ -223,6 +231,7 @@ class QFastImageAdjust(QWidget):
     def process_final_render(self):
         if not self.original_full: return
         QApplication.setOverrideCursor(QCursor(Qt.WaitCursor))
+        output_path = None
         try:
             work_img = self.apply_pipeline(self.original_full)
             output_path = self.get_unique_path()
@@ -236,9 +245,15 @@ class QFastImageAdjust(QWidget):
                 if work_img.mode != "RGB": 
                     work_img = work_img.convert("RGB")
             
-            work_img.save(output_path, **save_params)
-            QMessageBox.information(self, "Success", f"Final image saved:\n{os.path.basename(output_path)}")
+            result = None
+            if self.cb_auto_quality.isChecked():
+                result = ssimquality.save_with_target_ssim(work_img, output_path, save_params)
+            else:
+                work_img.save(output_path, **save_params)
+            detail = f"\nQuality {result.quality}, SSIM {result.score:.4f}" if result else ""
+            QMessageBox.information(self, "Success", f"Final image saved:\n{os.path.basename(output_path)}{detail}")
         except Exception as e:
+            discard_claim(output_path)
             QMessageBox.critical(self, "Error", f"Render failed: {e}")
         finally:
             QApplication.restoreOverrideCursor()
@@ -246,15 +261,8 @@ class QFastImageAdjust(QWidget):
     def get_unique_path(self):
         directory = os.path.dirname(self.image_path)
         name_part, ext = os.path.splitext(os.path.basename(self.image_path))
-        if "_adjust" in name_part: 
-            name_part = name_part.split("_adjust")[0]
-        
-        counter = 1
-        while True:
-            new_filename = f"{name_part}_adjust{counter:02d}{ext}"
-            full_path = os.path.join(directory, new_filename)
-            if not os.path.exists(full_path): return full_path
-            counter += 1
+        name_part = strip_suffix(name_part, "_adjust")
+        return claim_unique_path(directory, f"{name_part}_adjust", ext, digits=2)
 
     def dragEnterEvent(self, event):
         if event.mimeData().hasUrls(): event.accept()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""Resize aracının Qt içermeyen iş birimi ve akan toplu çalıştırıcısı.
+
+resize_file() arayüz ile komut satırının ortak kaydetme yoludur. run_plan()
+önceden çıkarılmış bir boyut planını (sizeplan, en büyük kaynak önce) işçi
+süreçlere plan sırasıyla verir; uzun işler başta başlar, toplu işin sonunda
+tek bir dev dosya beklenmez. run_stream()
+bir yol üretecini işçi süreçlere dağıtır: aynı anda en fazla jobs * 2 iş
+bekletilir, böylece klasör taraması sürerken ilk resimler işlenmeye başlar ve
+milyonlarca dosyada bile bekleyen iş listesi bellekte büyümez. Manifesto
+verilirse (artımlı kip) değişmemiş kaynaklar, iş günlüğü verilirse yarıda
+kalmış bir çalıştırmada bitmiş kaynaklar atlanır.
+"""
+import os
+from concurrent.futures import FIRST_COMPLETED, wait, as_completed
+from PIL import Image
+from outputnames import claim_unique_path, discard_claim, atomic_path
+from cachedir import content_hash
+from resizemanifest import params_key
+from workerpool import process_pool
+import resampling
+import sizeplan
+import ssimquality
+
+IN_FLIGHT_PER_JOB = 2
+# claim_output() adları: photo_resized.jpg, photo_resized_1.jpg ... (taramada girdi sayılmaz)
+OUTPUT_PATTERNS = ("*_resized.*", "*_resized_[0-9]*.*")
+
+
+class ResizeOptions:
+    """Bir toplu işin tüm ayarları; spawn işçilerine olduğu gibi gönderilir."""
+    def __init__(self, sizing=sizeplan.EXACT, width=None, height=None, percent=None, keep_ratio=True,
+                 no_upscale=False, method=Image.LANCZOS, fast=True, keep_exif=False, ssim_target=None,
+                 target_dir=None):
+        self.sizing = sizing
+        self.width = width
+        self.height = height
+        self.percent = percent
+        self.keep_ratio = keep_ratio
+        self.no_upscale = no_upscale
+        self.method = method
+        self.fast = fast
+        self.keep_exif = keep_exif
+        self.ssim_target = ssim_target
+        self.target_dir = target_dir
+
+    def plan_args(self):
+        return (self.sizing, self.width, self.height, self.percent, self.keep_ratio, self.no_upscale)
+
+    def params_key(self):
+        settings = dict(vars(self))
+        settings["target_dir"] = os.path.abspath(self.target_dir) if self.target_dir else None
+        return params_key(settings)
+
+
+def claim_output(path, target_dir=None):
+    """Çıktı adını ana süreçte rezerve eder. Hedef klasör bir kez taranır (outputnames),
+    düz bir klasördeki on binlerce dosyada da dosya başına maliyet sabittir."""
+    save_dir = target_dir or os.path.dirname(path)
+    base_name, ext = os.path.splitext(os.path.basename(path))
+    return claim_unique_path(save_dir, f"{base_name}_resized", ext, start=0, sep="_", bare_first=True)
+
+
+def resize_file(path, out_path, size, crop, opts):
+    """Tek dosyayı boyutlandırıp out_path'e (geçici dosya + os.replace ile) yazar.
+
+    SSIM rapor satırını ya da None döndürür.
+    """
+    img = Image.open(path)
+    exif_data = img.info.get('exif') if opts.keep_exif else None
+    resized = resampling.resize_image(img, size, opts.method, opts.fast)
+    if crop:
+        resized = resized.crop(crop)
+    with atomic_path(out_path) as tmp_path:
+        if opts.ssim_target:
+            result = ssimquality.save_with_target_ssim(resized, tmp_path, {'exif': exif_data} if exif_data else {},
+                                                       opts.ssim_target)
+            if result:
+                return f"{os.path.basename(out_path)}: quality {result.quality}, SSIM {result.score:.4f}"
+            return None
+        resized.save(tmp_path, exif=exif_data) if exif_data else resized.save(tmp_path)
+    return None
+
+
+def _plan_job(path, out_path, size, crop, opts):
+    """İşçi süreçte çalışır; boyut plandan gelir. (rapor, hata) döndürür."""
+    try:
+        return resize_file(path, out_path, size, crop, opts), None
+    except Exception as e:
+        return None, str(e)
+
+
+def run_plan(plan, opts, jobs=None, on_result=None):
+    """sizeplan.Plan öğelerini paralel işler. (işlenen, başarısız) döndürür.
+
+    Çıktı adları ana süreçte plan sırasıyla rezerve edilir ve işler aynı sırayla
+    kuyruğa girer; işçiler en büyük kaynaklardan başlar. on_result(yol, çıktı,
+    rapor, hata) her dosya bittiğinde ana süreçte çağrılır.
+    """
+    ok = failed = 0
+    with process_pool(jobs) as pool:
+        futures = {}
+        for item in plan.items:
+            out_path = claim_output(item.path, opts.target_dir)
+            future = pool.submit(_plan_job, item.path, out_path, item.size, item.crop, opts)
+            futures[future] = (item.path, out_path)
+        for future in as_completed(futures):
+            path, out_path = futures[future]
+            report, error = future.result()
+            if error is None:
+                ok += 1
+            else:
+                discard_claim(out_path)
+                failed += 1
+            if on_result:
+                on_result(path, out_path, report, error)
+    return ok, failed
+
+
+def _stream_job(path, out_path, opts, want_digest=False, known_digest=None):
+    """İşçi süreçte çalışır; boyut planı burada, sadece başlık okunarak çıkarılır.
+
+    (rapor, hata, içerik özeti, değişmedi mi) döndürür. known_digest verilmiş ve
+    içerik aynıysa resim hiç çözülmez.
+    """
+    try:
+        digest = content_hash(path) if want_digest else None
+        if known_digest and digest == known_digest:
+            return None, None, digest, True
+        size, crop = sizeplan.compute_size(sizeplan.read_size(path), *opts.plan_args())
+        return resize_file(path, out_path, size, crop, opts), None, digest, False
+    except Exception as e:
+        return None, str(e), None, False
+
+
+def run_stream(paths, opts, jobs=None, on_result=None, manifest=None, journal=None):
+    """paths (üreteç olabilir) içindeki dosyaları paralel işler. (işlenen, başarısız, atlanan) döndürür.
+
+    on_result(yol, çıktı, rapor, hata) her dosya bittiğinde ana süreçte çağrılır;
+    atlanan dosyalar için çağrılmaz. manifest (ResizeManifest) verilirse boyutu,
+    mtime'ı ve ayarları aynı olan, çıktısı yerinde duran kaynaklar atlanır.
+    journal (JobJournal) verilirse bitmiş kaynaklar atlanır, yarım kalanlar
+    önceki çalıştırmada rezerve edilen çıktı adına yazılır.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    counts = {"ok": 0, "failed": 0, "skipped": 0}
+    pending = {}
+    params = opts.params_key() if manifest else None
+
+    def collect(futures):
+        for future in futures:
+            path, out_path, claimed, st = pending.pop(future)
+            report, error, digest, unchanged = future.result()
+            if error is not None:
+                if claimed: discard_claim(out_path)
+                counts["failed"] += 1
+            elif unchanged:
+                counts["skipped"] += 1
+            else:
+                counts["ok"] += 1
+            if manifest and error is None:
+                manifest.record(os.path.abspath(path), params, st, digest, out_path)
+            if journal and error is None:
+                journal.complete(os.path.abspath(path), out_path)
+            if on_result and not unchanged:
+                on_result(path, out_path, report, error)
+
+    def claim(path):
+        source = os.path.abspath(path)
+        out_path = journal.claimed_output(source) if journal else None
+        if out_path:
+            return out_path, False  # yarım kalmış çalıştırmanın adı
+        out_path = claim_output(path, opts.target_dir)
+        if journal:
+            journal.claim(source, out_path)
+        return out_path, True
+
+    def prepare(path):
+        """(çıktı yolu, yeni mi rezerve edildi, stat, bilinen özet) ya da atlanacaksa None."""
+        if journal and journal.is_done(os.path.abspath(path)):
+            return None
+        if not manifest:
+            return (*claim(path), None, None)
+        source = os.path.abspath(path)
+        st = os.stat(path)
+        entry = manifest.lookup(source, params)
+        if entry and os.path.exists(entry.output):
+            if entry.same_stat(st):
+                return None
+            # Kaynak değişmiş olabilir: aynı çıktı yoluna yeniden yazılır
+            return entry.output, False, st, entry.digest
+        if entry:
+            return entry.output, False, st, None  # çıktı silinmiş; aynı adla yeniden üretilir
+        return (*claim(path), st, None)
+
+    with process_pool(jobs) as pool:
+        for path in paths:
+            if len(pending) >= jobs * IN_FLIGHT_PER_JOB:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            source = os.path.abspath(path)
+            if (manifest and manifest.is_output(source)) or (journal and journal.is_output(source)):
+                continue  # önceki çalıştırmanın çıktısı (kaynak klasörüne yazılmış); girdi değil
+            try:
+                prepared = prepare(path)
+            except OSError as e:
+                counts["failed"] += 1
+                if on_result:
+                    on_result(path, None, None, str(e))
+                continue
+            if prepared is None:
+                counts["skipped"] += 1
+                continue
+            out_path, claimed, st, known_digest = prepared
+            future = pool.submit(_stream_job, path, out_path, opts, manifest is not None, known_digest)
+            pending[future] = (path, out_path, claimed, st)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            collect(done)
+    return counts["ok"], counts["failed"], counts["skipped"]
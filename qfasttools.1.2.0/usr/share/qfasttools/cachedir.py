@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""QFast araçlarının ortak kullanıcı önbellek klasörü (~/.cache/qfasttools)
+ve önbellek anahtarları için dosya içerik özeti."""
+import os
+import hashlib
+
+HASH_CHUNK = 1024 * 1024
+
+
+def user_cache_dir(*parts):
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    path = os.path.join(base, 'qfasttools', *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def content_hash(path):
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(HASH_CHUNK)
+            if not chunk:
+                break
+            h.update(chunk)
+    return h.hexdigest()
@@ -8,6 +8,8 @@ from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout,
 from PyQt5.QtGui import QPixmap, QImage, QPainter, QPen, QColor, QCursor, QPalette, QIcon
 from PyQt5.QtCore import Qt, QRect, QPoint
 from PIL import Image, ImageFilter, ImageDraw
+from undohistory import UndoHistory
+from outputnames import claim_unique_path, discard_claim, strip_suffix
 
 # Debian/Pardus grafik uyumluluğu
 os.environ['QT_QPA_PLATFORM'] = 'xcb'
@@ -55,7 +57,7 @@ class QFastImageCensor(QWidget):
         super().__init__()
         self.image_path = target_file
         self.current_image = None
-        self.history = [] 
+        self.history = UndoHistory()
         self.apply_dark_theme()
         self.initUI()
         
@@ -185,7 +187,7 @@ class QFastImageCensor(QWidget):
             self.image_path = path
             img = Image.open(path).convert("RGBA")
             self.current_image = img
-            self.history = [img.copy()]
+            self.history.clear()
             self.update_display()
             self.btn_do_it.setEnabled(True)
             self.btn_undo.setEnabled(False)
@@ -207,10 +209,6 @@ class QFastImageCensor(QWidget):
         QApplication.setOverrideCursor(QCursor(Qt.WaitCursor))
         
         try:
-            self.history.append(self.current_image.copy())
-            if len(self.history) > 10: self.history.pop(0) 
-            self.btn_undo.setEnabled(True)
-
             img_w, img_h = self.current_image.size
             pixmap_w = self.img_display.pixmap().width()
             pixmap_h = self.img_display.pixmap().height()
@@ -230,6 +228,10 @@ class QFastImageCensor(QWidget):
                 QApplication.restoreOverrideCursor()
                 return
 
+            # Sadece değişecek dikdörtgeni sakla
+            self.history.push_region(self.current_image, (left, top, right, bottom))
+            self.btn_undo.setEnabled(True)
+
             region = self.current_image.crop((left, top, right, bottom))
             strength = self.strength_slider.value()
 
@@ -253,13 +255,12 @@ class QFastImageCensor(QWidget):
             QApplication.restoreOverrideCursor()
 
     def undo_action(self):
-        if len(self.history) > 0:
-            self.current_image = self.history.pop()
+        if self.history.undo(self.current_image):
             self.update_display()
-            if len(self.history) == 0:
-                self.btn_undo.setEnabled(False)
+        self.btn_undo.setEnabled(self.history.can_undo())
 
     def save_image(self):
+        output_path = None
         try:
             # EXIF verisini orijinal dosyadan oku (resize.py mantığı)
             original_img = Image.open(self.image_path)
@@ -276,18 +277,14 @@ class QFastImageCensor(QWidget):
                 
             QMessageBox.information(self, "Success", f"Saved: {os.path.basename(output_path)}")
         except Exception as e:
+            discard_claim(output_path)
             QMessageBox.critical(self, "Error", f"Save failed: {e}")
 
     def get_unique_path(self):
         directory = os.path.dirname(self.image_path)
         name_part, extension = os.path.splitext(os.path.basename(self.image_path))
-        if "_censored" in name_part: name_part = name_part.split("_censored")[0]
-        counter = 1
-        while True:
-            new_filename = f"{name_part}_censored{counter:02d}{extension}"
-            full_path = os.path.join(directory, new_filename)
-            if not os.path.exists(full_path): return full_path
-            counter += 1
+        name_part = strip_suffix(name_part, "_censored")
+        return claim_unique_path(directory, f"{name_part}_censored", extension, digits=2)
 
     def dragEnterEvent(self, event):
         if event.mimeData().hasUrls(): event.accept()
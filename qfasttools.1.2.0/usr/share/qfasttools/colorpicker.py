@@ -3,13 +3,66 @@ import sys
 import os
 from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, 
                              QLabel, QPushButton, QLineEdit, QGridLayout, 
-                             QFrame, QToolTip)
-from PyQt5.QtGui import QColor, QCursor, QPalette, QBrush, QPixmap, QPainter, QIcon
-from PyQt5.QtCore import Qt, pyqtSignal, QPoint
+                             QFrame, QToolTip, QComboBox, QFileDialog, QSpinBox, QMessageBox)
+from PyQt5.QtGui import QColor, QCursor, QPalette, QBrush, QPixmap, QPainter, QIcon, QImage, QPen, QFont
+from PyQt5.QtCore import Qt, pyqtSignal, QPoint, QRect
+from palette import extract_palette, DEFAULT_COLORS
 
 # Debian/Pardus grafik uyumluluğu
 os.environ['QT_QPA_PLATFORM'] = 'xcb'
 
+# Büyüteç: imlecin çevresindeki LOUPE_RADIUS piksel, LOUPE_ZOOM kat büyütülür
+LOUPE_RADIUS = 7
+LOUPE_ZOOM = 10
+LOUPE_OFFSET = 24
+SAMPLE_SIZES = (1, 3, 5, 7, 9, 11)
+
+class ScreenSampler:
+    """Ekran görüntüsünü bir kez QImage'a çevirir ve piksel okumalarını doğrudan bu tampondan yapar.
+
+    Fare her hareket ettiğinde tüm ekranın yeniden dönüştürülmesi engellenir;
+    NxN ortalama, bellek üzerindeki satırlardan (memoryview) hesaplanır.
+    """
+    def __init__(self, pixmap):
+        # Format_RGB32 bellekte B, G, R, X sırasıyla tutulur
+        self.image = pixmap.toImage().convertToFormat(QImage.Format_RGB32)
+        self.dpr = pixmap.devicePixelRatio() or 1.0
+        self.width = self.image.width()
+        self.height = self.image.height()
+        self.stride = self.image.bytesPerLine()
+        bits = self.image.constBits()
+        bits.setsize(self.image.byteCount())
+        self.buffer = memoryview(bits)
+
+    def to_image_pos(self, x, y):
+        """Mantıksal (widget) koordinatı, sınırlar içinde kalan fiziksel piksele çevirir."""
+        px = int(x * self.dpr)
+        py = int(y * self.dpr)
+        return min(max(px, 0), self.width - 1), min(max(py, 0), self.height - 1)
+
+    def sample(self, x, y, size=1):
+        """(x, y) merkezli size x size alanın ortalama rengini döndürür."""
+        px, py = self.to_image_pos(x, y)
+        if size <= 1:
+            return QColor(self.image.pixel(px, py))
+        half = size // 2
+        x0, x1 = max(0, px - half), min(self.width, px + half + 1)
+        y0, y1 = max(0, py - half), min(self.height, py + half + 1)
+        b = g = r = 0
+        for row in range(y0, y1):
+            start = row * self.stride
+            line = self.buffer[start + x0 * 4:start + x1 * 4]
+            b += sum(line[0::4])
+            g += sum(line[1::4])
+            r += sum(line[2::4])
+        count = (x1 - x0) * (y1 - y0)
+        return QColor(round(r / count), round(g / count), round(b / count))
+
+    def region(self, x, y, radius=LOUPE_RADIUS):
+        """Büyüteç için imleç çevresindeki küçük bölgeyi kopyalar (tam kare değil)."""
+        px, py = self.to_image_pos(x, y)
+        return self.image.copy(QRect(px - radius, py - radius, 2 * radius + 1, 2 * radius + 1))
+
 class ColorBox(QFrame):
     """Small boxes showing color history"""
     clicked = pyqtSignal(QColor)
@@ -31,22 +84,82 @@ class PickerOverlay(QWidget):
     """Transparent overlay for screen color picking"""
     color_selected = pyqtSignal(QColor)
 
-    def __init__(self, screenshot):
+    def __init__(self, screenshot, sample_size=1):
         super().__init__()
         self.screenshot = screenshot
+        self.sampler = ScreenSampler(screenshot)
+        self.sample_size = sample_size
+        self.cursor_pos = None
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
         self.setCursor(Qt.CrossCursor)
+        self.setMouseTracking(True)
         self.showFullScreen()
 
+    def loupe_rect(self, pos):
+        """Büyütecin çizileceği alan; ekran kenarında imlecin diğer tarafına geçer."""
+        side = (2 * LOUPE_RADIUS + 1) * LOUPE_ZOOM
+        box = QRect(pos.x() + LOUPE_OFFSET, pos.y() + LOUPE_OFFSET, side, side + 22)
+        if box.right() > self.width(): box.moveRight(pos.x() - LOUPE_OFFSET)
+        if box.bottom() > self.height(): box.moveBottom(pos.y() - LOUPE_OFFSET)
+        return box
+
     def paintEvent(self, event):
         painter = QPainter(self)
-        painter.drawPixmap(0, 0, self.screenshot)
+        # Sadece kirlenen alan yeniden çizilir
+        painter.drawPixmap(event.rect(), self.screenshot, self.source_rect(event.rect()))
+        if self.cursor_pos is None: return
+
+        box = self.loupe_rect(self.cursor_pos)
+        side = box.width()
+        zoomed = self.sampler.region(self.cursor_pos.x(), self.cursor_pos.y())
+        painter.drawImage(QRect(box.x(), box.y(), side, side), zoomed)
+
+        # Örnekleme alanını gösteren çerçeve
+        sample_side = min(self.sample_size, 2 * LOUPE_RADIUS + 1) * LOUPE_ZOOM
+        center = box.x() + side // 2, box.y() + side // 2
+        painter.setPen(QPen(Qt.white, 1))
+        painter.drawRect(center[0] - sample_side // 2, center[1] - sample_side // 2, sample_side, sample_side)
+        painter.setPen(QPen(QColor(80, 80, 80), 2))
+        painter.drawRect(box.x(), box.y(), side, side)
+
+        color = self.current_color()
+        label = QRect(box.x(), box.y() + side, side, 22)
+        painter.fillRect(label, QColor(30, 30, 30))
+        painter.fillRect(label.x() + 3, label.y() + 3, 16, 16, color)
+        painter.setPen(Qt.white)
+        painter.setFont(QFont("Monospace", 9))
+        size_text = f"{self.sample_size}x{self.sample_size}" if self.sample_size > 1 else "1px"
+        painter.drawText(label.adjusted(24, 0, -4, 0), Qt.AlignVCenter, f"{color.name().upper()}  {size_text}")
+
+    def source_rect(self, rect):
+        dpr = self.sampler.dpr
+        return QRect(int(rect.x() * dpr), int(rect.y() * dpr), int(rect.width() * dpr), int(rect.height() * dpr))
+
+    def current_color(self):
+        return self.sampler.sample(self.cursor_pos.x(), self.cursor_pos.y(), self.sample_size)
+
+    def mouseMoveEvent(self, event):
+        old = self.cursor_pos
+        self.cursor_pos = event.pos()
+        if old is not None: self.update(self.loupe_rect(old).adjusted(-2, -2, 2, 2))
+        self.update(self.loupe_rect(self.cursor_pos).adjusted(-2, -2, 2, 2))
+
+    def wheelEvent(self, event):
+        # Tekerlek örnekleme boyutunu değiştirir (1px, 3x3, 5x5...)
+        index = SAMPLE_SIZES.index(self.sample_size) if self.sample_size in SAMPLE_SIZES else 0
+        index += 1 if event.angleDelta().y() > 0 else -1
+        self.sample_size = SAMPLE_SIZES[min(max(index, 0), len(SAMPLE_SIZES) - 1)]
+        if self.cursor_pos is not None:
+            self.update(self.loupe_rect(self.cursor_pos).adjusted(-2, -2, 2, 2))
+
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key_Escape:
+            self.close()
+            self.color_selected.emit(QColor())
 
     def mousePressEvent(self, event):
-        x = event.globalPos().x()
-        y = event.globalPos().y()
-        pixel_color = QColor(self.screenshot.toImage().pixel(x, y))
-        self.color_selected.emit(pixel_color)
+        self.cursor_pos = event.pos()
+        self.color_selected.emit(self.current_color())
         self.close()
 
 class ColorPickerTool(QWidget):
@@ -54,10 +167,11 @@ class ColorPickerTool(QWidget):
         super().__init__()
         self.history_boxes = []
         self.initUI()
+        self.setAcceptDrops(True)
 
     def initUI(self):
         self.setWindowTitle('QFast Color Picker')
-        self.setFixedSize(350, 420)
+        self.setFixedSize(350, 520)
         
         # 1- İkon ayarı (icons/colorpicker.png)
         script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -113,6 +227,31 @@ class ColorPickerTool(QWidget):
         self.btn_pick.clicked.connect(self.start_picking)
         layout.addWidget(self.btn_pick)
 
+        sample_layout = QHBoxLayout()
+        lbl_sample = QLabel("Sample Size:")
+        lbl_sample.setStyleSheet(label_style)
+        sample_layout.addWidget(lbl_sample)
+        self.combo_sample = QComboBox()
+        self.combo_sample.addItems(["Point (1px)"] + [f"Average {n}x{n}" for n in SAMPLE_SIZES[1:]])
+        sample_layout.addWidget(self.combo_sample)
+        layout.addLayout(sample_layout)
+
+        # --- PALETTE FROM IMAGE ---
+        palette_layout = QHBoxLayout()
+        self.btn_palette = QPushButton("EXTRACT PALETTE FROM IMAGE")
+        self.btn_palette.clicked.connect(self.select_palette_image)
+        palette_layout.addWidget(self.btn_palette)
+        self.spin_palette = QSpinBox()
+        self.spin_palette.setRange(2, 24)
+        self.spin_palette.setValue(DEFAULT_COLORS)
+        self.spin_palette.setToolTip("Number of colors")
+        palette_layout.addWidget(self.spin_palette)
+        layout.addLayout(palette_layout)
+
+        self.label_palette_info = QLabel("Drop an image to extract its palette")
+        self.label_palette_info.setStyleSheet("color: #888; font-size: 8pt;")
+        layout.addWidget(self.label_palette_info)
+
         # --- COLOR HISTORY ---
         lbl_history = QLabel("Color History:")
         lbl_history.setStyleSheet(label_style)
@@ -137,6 +276,33 @@ class ColorPickerTool(QWidget):
         palette.setColor(QPalette.ButtonText, Qt.white)
         self.setPalette(palette)
 
+    def dragEnterEvent(self, event):
+        if event.mimeData().hasUrls(): event.accept()
+        else: event.ignore()
+
+    def dropEvent(self, event):
+        files = [u.toLocalFile() for u in event.mimeData().urls()]
+        if files: self.load_palette(files[0])
+
+    def select_palette_image(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Select Image", "", "Images (*.png *.jpg *.jpeg *.bmp *.webp *.tif *.tiff *.gif)")
+        if path: self.load_palette(path)
+
+    def load_palette(self, path):
+        try:
+            colors, elapsed = extract_palette(path, self.spin_palette.value())
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Could not read image: {str(e)}")
+            return
+        if not colors:
+            self.label_palette_info.setText("No opaque pixels found")
+            return
+        # En baskın renk en başta kalsın diye geçmişe sondan başlayarak eklenir
+        for rgb, _ in reversed(colors):
+            self.add_to_history(QColor(*rgb))
+        self.set_color(QColor(*colors[0][0]), add_to_history=False)
+        self.label_palette_info.setText(f"{os.path.basename(path)}: {len(colors)} colors in {elapsed * 1000:.0f} ms")
+
     def copy_to_clipboard(self, text):
         QApplication.clipboard().setText(text)
         QToolTip.showText(QCursor.pos(), "Copied!", self)
@@ -165,12 +331,13 @@ class ColorPickerTool(QWidget):
         screen = QApplication.primaryScreen()
         screenshot = screen.grabWindow(0)
         
-        self.overlay = PickerOverlay(screenshot)
+        sample_size = SAMPLE_SIZES[self.combo_sample.currentIndex()]
+        self.overlay = PickerOverlay(screenshot, sample_size)
         self.overlay.color_selected.connect(self.handle_color_picked)
         self.overlay.show()
 
     def handle_color_picked(self, color):
-        self.set_color(color)
+        if color.isValid(): self.set_color(color)
         self.show()
         self.raise_()
         self.activateWindow()
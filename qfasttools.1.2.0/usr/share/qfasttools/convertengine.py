@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""Format Converter için Qt içermeyen kodlama motoru.
+
+Kaynak resim bir kez açılır, gerekirse ölçeklenir ve hedef kip'e çevrilir;
+hedef dosya boyutu modunda aynı resim farklı kalite değerleriyle bellek
+içi tamponlara tekrar tekrar kodlanır, diske sadece seçilen sonuç yazılır.
+Pillow'un JPEG/WebP/AVIF kodlayıcıları kodlama sırasında GIL'i bıraktığından
+aday kaliteler iş parçacıklarında paralel denenir.
+"""
+import io
+import os
+import time
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+
+try:
+    import pillow_avif
+except ImportError:
+    pass
+
+QUALITY_FORMATS = ("JPEG", "WebP", "AVIF")
+# Hedef boyutun altında kalınan bu oran içindeki sonuç yeterli kabul edilir
+TARGET_TOLERANCE = 0.05
+MIN_QUALITY, MAX_QUALITY = 1, 100
+# Pillow'un okurken verdiği, aslında hedef biçimin dosyası olan biçim adları
+# (MPO: fotoğraf makinelerinin ek önizleme kareli JPEG'i)
+FORMAT_ALIASES = {"MPO": "JPEG"}
+
+
+def default_search_threads():
+    return max(2, min(4, os.cpu_count() or 1))
+
+
+def load_source(path, scale=100):
+    """Kaynağı açar ve ölçekler. (resim, exif) döndürür; exif dönüşümlerde kaybolmasın diye baştan alınır."""
+    img = Image.open(path)
+    exif = img.info.get("exif")
+    if scale < 100:
+        new_size = (max(1, int(img.width * (scale/100))), max(1, int(img.height * (scale/100))))
+        img = img.resize(new_size, Image.Resampling.LANCZOS)
+    return img, exif
+
+
+def to_target_mode(img, fmt):
+    if fmt == "JPEG":
+        if img.mode in ("RGBA", "P"):
+            background = Image.new("RGB", img.size, (255, 255, 255))
+            mask = img.split()[3] if img.mode == "RGBA" else None
+            background.paste(img, mask=mask)
+            return background
+        return img.convert("RGB")
+    if fmt in ["PNG", "WebP", "AVIF"]:
+        if img.mode not in ("RGBA", "RGB", "P"):
+            return img.convert("RGBA")
+    return img
+
+
+def is_noop(path, fmt, scale=100, keep_exif=True):
+    """Kaynak zaten hedef biçimdeyse, ölçekleme yoksa ve metaveri politikası
+    kopyayla da sağlanıyorsa True döner (sadece başlık okunur).
+
+    Kalite ve kodlayıcı profili dikkate alınmaz; kopyalama kullanıcının açıkça
+    seçtiği bir davranış olmalıdır (Format Converter'da "Copy files already in
+    target format").
+    """
+    if scale < 100:
+        return False
+    with Image.open(path) as img:
+        source_fmt = (img.format or "").upper()
+        if FORMAT_ALIASES.get(source_fmt, source_fmt) != fmt.upper():
+            return False
+        if not keep_exif and img.info.get("exif"):
+            return False  # EXIF silinmeli; yeniden kodlamak gerekir
+    return True
+
+
+def fast_copy(src, dst):
+    """Dosyayı çekirdek içinde kopyalar (copy_file_range; btrfs/XFS'de reflink olabilir).
+
+    Desteklenmeyen sistemlerde ya da dosya sistemleri arasında shutil.copyfile'a düşer.
+    """
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                return
+        except OSError:
+            pass
+    shutil.copyfile(src, dst)
+
+
+def build_save_args(fmt, qual, exif=None, options=None):
+    """Image.save() parametreleri. options, kodlayıcı profilinin bu biçim için
+    ayarlarıdır (encoderprofiles.format_options); verilmezse optimize açık kalır."""
+    save_args = {"format": fmt}
+    if fmt in QUALITY_FORMATS:
+        save_args["quality"] = qual
+    if options is not None:
+        save_args.update(options)
+    elif fmt in ("PNG", "JPEG"):
+        save_args["optimize"] = True
+    if exif:
+        save_args["exif"] = exif
+    return save_args
+
+
+def encode(img, save_args):
+    buf = io.BytesIO()
+    img.save(buf, **save_args)
+    return buf.getvalue()
+
+
+class SearchResult:
+    """Kalite aramasının sonucu: seçilen kalite, kodlanmış veri ve istatistikler."""
+    def __init__(self, quality, data, iterations, elapsed, fits, score=None):
+        self.quality = quality
+        self.data = data
+        self.iterations = iterations
+        self.elapsed = elapsed
+        self.fits = fits
+        self.score = score
+
+    @property
+    def size(self):
+        return len(self.data)
+
+
+class ParallelEncoder:
+    """Aynı resmi farklı kalitelerle iş parçacıklarında paralel kodlar; sonuçları saklar.
+
+    Image.save() ayarları resim nesnesinin üzerine yazar (encoderinfo); aynı
+    nesne iki iş parçacığında kaydedilemez, her iş parçacığı kendi kopyasını alır.
+    """
+    def __init__(self, img, save_args, threads=None):
+        self.img = img
+        self.save_args = save_args
+        self.encoded = {}
+        self._local = threading.local()
+        self.threads = threads or default_search_threads()
+        self._pool = ThreadPoolExecutor(max_workers=self.threads)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._pool.shutdown()
+
+    def _attempt(self, q):
+        own = getattr(self._local, 'img', None)
+        if own is None:
+            own = self._local.img = self.img.copy()
+        return q, encode(own, dict(self.save_args, quality=q))
+
+    def encode_many(self, qualities):
+        todo = [q for q in qualities if q not in self.encoded]
+        for q, data in self._pool.map(self._attempt, todo):
+            self.encoded[q] = data
+        return [self.encoded[q] for q in qualities]
+
+
+def candidates(lo, hi, count):
+    """(lo, hi) açık aralığını count+1 parçaya bölen iç noktalar (tekrarsız)."""
+    if hi - lo <= 1:
+        return []
+    step = (hi - lo) / (count + 1)
+    points = sorted({min(hi - 1, max(lo + 1, round(lo + step * (i + 1)))) for i in range(count)})
+    return points
+
+
+def search_quality_for_size(img, save_args, target_bytes, tolerance=TARGET_TOLERANCE, threads=None):
+    """Hedef boyuta sığan en yüksek kaliteyi bulur (paralel k-li ikili arama).
+
+    Her turda aralık içinden threads kadar kalite aynı anda denenir. Sonuç
+    [hedef * (1 - tolerans), hedef] arasına düşünce arama erken biter.
+    En düşük kalite bile sığmıyorsa o sonuç fits=False ile döndürülür.
+    """
+    start = time.perf_counter()
+    lower_bound = target_bytes * (1 - tolerance)
+    with ParallelEncoder(img, save_args, threads) as encoder:
+        encoded = encoder.encoded
+        # Önce uçlar: en yüksek kalite zaten sığıyorsa arama gerekmez
+        encoder.encode_many((MAX_QUALITY, MIN_QUALITY))
+        if len(encoded[MAX_QUALITY]) <= target_bytes:
+            best = MAX_QUALITY
+        elif len(encoded[MIN_QUALITY]) > target_bytes:
+            return SearchResult(MIN_QUALITY, encoded[MIN_QUALITY], len(encoded),
+                                time.perf_counter() - start, False)
+        else:
+            lo, hi = MIN_QUALITY, MAX_QUALITY  # lo sığar, hi sığmaz
+            while len(encoded[lo]) < lower_bound:
+                points = candidates(lo, hi, encoder.threads)
+                if not points:
+                    break
+                for q, data in zip(points, encoder.encode_many(points)):
+                    if len(data) <= target_bytes:
+                        lo = q
+                    else:
+                        hi = q
+                        break
+            best = lo
+    return SearchResult(best, encoded[best], len(encoded), time.perf_counter() - start, True)
@@ -1,31 +1,42 @@
 #!/usr/bin/env python3
 import sys
 import os
+import html
+import json
+import hashlib
 from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, 
                              QLabel, QPushButton, QListWidget, QComboBox, 
-                             QCheckBox, QProgressBar, QFileDialog, QMessageBox, QSlider, QListWidgetItem, QGroupBox)
+                             QCheckBox, QProgressBar, QFileDialog, QMessageBox, QSlider, QListWidgetItem, QGroupBox,
+                             QSpinBox, QDoubleSpinBox)
 from PyQt5.QtGui import QPalette, QColor, QBrush, QIcon
 from PyQt5.QtCore import Qt
 from PIL import Image
+from outputnames import claim_unique_path, discard_claim, atomic_path
+from cachedir import user_cache_dir
+from jobjournal import JobJournal
+from convertengine import (QUALITY_FORMATS, load_source, to_target_mode, build_save_args,
+                           encode, search_quality_for_size, is_noop, fast_copy)
+from encoderprofiles import (PROFILES, DEFAULT_PROFILE, JPEG_SUBSAMPLING, AVIF_SUBSAMPLING, PNG_STRATEGIES,
+                             supported_formats, copy_profile, format_options, benchmark, format_benchmark)
+import ssimquality
 
 # Debian/Pardus grafik uyumluluğu
 os.environ['QT_QPA_PLATFORM'] = 'xcb'
 
-try:
-    import pillow_avif
-except ImportError:
-    pass
-
 class ConverterTool(QWidget):
     def __init__(self):
         super().__init__()
         self.dest_path = ""
+        self.report = []
+        self.journal = None
+        self.profile_options = copy_profile(DEFAULT_PROFILE)
+        self._loading_profile = False
         self.initUI()
         self.setAcceptDrops(True)
 
     def initUI(self):
         self.setWindowTitle('QFast - Smart Format Converter')
-        self.setFixedSize(850, 650)
+        self.setFixedSize(850, 745)
         
         script_dir = os.path.dirname(os.path.abspath(__file__))
         icon_path = os.path.join(script_dir, "icons", "format.png")
@@ -95,6 +106,56 @@ class ConverterTool(QWidget):
         self.combo_format.currentTextChanged.connect(self.toggle_options)
         settings_layout.addWidget(self.combo_format)
 
+        # --- ENCODER PROFILE ---
+        profile_layout = QHBoxLayout()
+        profile_layout.addWidget(QLabel("Encoder profile:"))
+        self.combo_profile = QComboBox()
+        self.combo_profile.addItems(list(PROFILES) + ["custom"])
+        self.combo_profile.setCurrentText(DEFAULT_PROFILE)
+        self.combo_profile.currentTextChanged.connect(self.load_profile)
+        profile_layout.addWidget(self.combo_profile)
+        self.btn_benchmark = QPushButton("Benchmark")
+        self.btn_benchmark.setToolTip("Encodes the selected (or first) image with every profile and lists time vs size.")
+        self.btn_benchmark.clicked.connect(self.run_benchmark)
+        profile_layout.addWidget(self.btn_benchmark)
+        settings_layout.addLayout(profile_layout)
+
+        # Sadece seçili biçimin kodlayıcı ayarları görünür; değiştirmek profili "custom" yapar
+        encoder_layout = QHBoxLayout()
+        self.check_progressive = QCheckBox("Progressive")
+        self.combo_jpeg_sub = QComboBox()
+        self.combo_jpeg_sub.addItems(list(JPEG_SUBSAMPLING))
+        self.spin_webp_method = QSpinBox()
+        self.spin_webp_method.setRange(0, 6)
+        self.spin_webp_method.setPrefix("Method ")
+        self.check_lossless = QCheckBox("Lossless")
+        self.spin_avif_speed = QSpinBox()
+        self.spin_avif_speed.setRange(0, 10)
+        self.spin_avif_speed.setPrefix("Speed ")
+        self.combo_avif_sub = QComboBox()
+        self.combo_avif_sub.addItems(list(AVIF_SUBSAMPLING))
+        self.spin_png_level = QSpinBox()
+        self.spin_png_level.setRange(0, 9)
+        self.spin_png_level.setPrefix("zlib ")
+        self.combo_png_strategy = QComboBox()
+        self.combo_png_strategy.addItems(list(PNG_STRATEGIES))
+        self.format_widgets = {
+            "JPEG": [self.check_progressive, self.combo_jpeg_sub],
+            "WebP": [self.spin_webp_method, self.check_lossless],
+            "AVIF": [self.spin_avif_speed, self.combo_avif_sub],
+            "PNG": [self.spin_png_level, self.combo_png_strategy],
+        }
+        for widgets in self.format_widgets.values():
+            for w in widgets:
+                encoder_layout.addWidget(w)
+        for check in (self.check_progressive, self.check_lossless):
+            check.toggled.connect(self.on_encoder_option_changed)
+        for spin in (self.spin_webp_method, self.spin_avif_speed, self.spin_png_level):
+            spin.valueChanged.connect(self.on_encoder_option_changed)
+        for combo in (self.combo_jpeg_sub, self.combo_avif_sub, self.combo_png_strategy):
+            combo.currentTextChanged.connect(self.on_encoder_option_changed)
+        settings_layout.addLayout(encoder_layout)
+
         self.quality_label = QLabel("Quality / Effort: 85%")
         settings_layout.addWidget(self.quality_label)
         self.slider_quality = QSlider(Qt.Horizontal)
@@ -103,6 +164,35 @@ class ConverterTool(QWidget):
         self.slider_quality.valueChanged.connect(self.update_quality_label)
         settings_layout.addWidget(self.slider_quality)
 
+        size_layout = QHBoxLayout()
+        self.check_target_size = QCheckBox("Target file size (KB):")
+        self.check_target_size.toggled.connect(self.toggle_target_size)
+        size_layout.addWidget(self.check_target_size)
+        self.spin_target_size = QSpinBox()
+        self.spin_target_size.setRange(1, 100000)
+        self.spin_target_size.setValue(200)
+        self.spin_target_size.setEnabled(False)
+        size_layout.addWidget(self.spin_target_size)
+        settings_layout.addLayout(size_layout)
+
+        ssim_layout = QHBoxLayout()
+        self.check_ssim = QCheckBox("Perceptual target (SSIM):")
+        self.check_ssim.setToolTip("Picks the lowest quality whose SSIM against the source reaches the target.")
+        self.check_ssim.toggled.connect(self.toggle_ssim)
+        ssim_layout.addWidget(self.check_ssim)
+        self.spin_ssim = QDoubleSpinBox()
+        self.spin_ssim.setDecimals(3)
+        self.spin_ssim.setRange(0.900, 0.999)
+        self.spin_ssim.setSingleStep(0.005)
+        self.spin_ssim.setValue(ssimquality.DEFAULT_SSIM_TARGET)
+        self.spin_ssim.setEnabled(False)
+        ssim_layout.addWidget(self.spin_ssim)
+        settings_layout.addLayout(ssim_layout)
+        if not ssimquality.is_available():
+            self.check_ssim.setEnabled(False)
+            self.check_ssim.setToolTip("Requires NumPy (python3-numpy).")
+        self.load_profile(DEFAULT_PROFILE)
+
         self.check_merge_pdf = QCheckBox("Merge into a single PDF")
         self.check_merge_pdf.setVisible(False)
         settings_layout.addWidget(self.check_merge_pdf)
@@ -111,6 +201,15 @@ class ConverterTool(QWidget):
         self.check_exif.setChecked(True)
         settings_layout.addWidget(self.check_exif)
 
+        self.check_smaller = QCheckBox("Convert only if smaller")
+        self.check_smaller.setToolTip("Keeps the original when re-encoding does not reduce the file size.")
+        settings_layout.addWidget(self.check_smaller)
+
+        self.check_passthrough = QCheckBox("Copy files already in target format")
+        self.check_passthrough.setToolTip("Files already in the target format (and not resized) are copied as they are;\n"
+                                          "quality and encoder profile are not applied to them.")
+        settings_layout.addWidget(self.check_passthrough)
+
         settings_layout.addSpacing(10)
         self.check_default_dir = QCheckBox("Save to source folder")
         self.check_default_dir.setChecked(True)
@@ -174,16 +273,122 @@ class ConverterTool(QWidget):
     def update_quality_label(self, val):
         fmt = self.combo_format.currentText()
         if fmt == "PNG":
-            level = int(val / 11)
-            self.quality_label.setText(f"Compression Effort: {level} (0-9)")
+            self.quality_label.setText("Lossless (effort set by encoder profile)")
+        elif fmt == "WebP" and self.check_lossless.isChecked():
+            self.quality_label.setText(f"Lossless Effort: {val}%")
         else:
             self.quality_label.setText(f"Quality: {val}%")
 
     def toggle_options(self, fmt):
         self.check_merge_pdf.setVisible(fmt == "PDF")
-        self.slider_quality.setEnabled(fmt not in ["PDF", "BMP"])
+        for name, widgets in self.format_widgets.items():
+            for w in widgets:
+                w.setVisible(name == fmt)
+        searchable = self.quality_searchable(fmt)
+        self.check_target_size.setEnabled(searchable)
+        self.check_ssim.setEnabled(searchable and ssimquality.is_available())
+        self.update_search_controls()
         self.update_quality_label(self.slider_quality.value())
 
+    def toggle_target_size(self, checked):
+        # Boyut ve SSIM hedefleri aynı anda kullanılamaz
+        if checked: self.check_ssim.setChecked(False)
+        self.update_search_controls()
+
+    def toggle_ssim(self, checked):
+        if checked: self.check_target_size.setChecked(False)
+        self.update_search_controls()
+
+    def update_search_controls(self):
+        # Arama modlarında kaliteyi arama belirler, kaydırıcı devre dışı kalır
+        quality_fmt = self.quality_searchable(self.combo_format.currentText())
+        size_active = self.check_target_size.isChecked() and quality_fmt
+        ssim_active = self.check_ssim.isChecked() and quality_fmt and ssimquality.is_available()
+        self.spin_target_size.setEnabled(size_active)
+        self.spin_ssim.setEnabled(ssim_active)
+        self.slider_quality.setEnabled(self.combo_format.currentText() not in ["PDF", "BMP", "PNG"]
+                                       and not (size_active or ssim_active))
+
+    def quality_searchable(self, fmt):
+        # Kayıpsız WebP'de kalite bir emek ayarıdır; boyut/SSIM araması anlamsız
+        return fmt in QUALITY_FORMATS and not (fmt == "WebP" and self.check_lossless.isChecked())
+
+    def load_profile(self, name):
+        if name not in PROFILES:
+            return  # "custom": mevcut ayarlar korunur
+        self.profile_options = copy_profile(name)
+        opts = self.profile_options
+        self._loading_profile = True
+        self.check_progressive.setChecked(opts["JPEG"]["progressive"])
+        self.combo_jpeg_sub.setCurrentIndex(list(JPEG_SUBSAMPLING.values()).index(opts["JPEG"]["subsampling"]))
+        self.spin_webp_method.setValue(opts["WebP"]["method"])
+        self.check_lossless.setChecked(opts["WebP"]["lossless"])
+        self.spin_avif_speed.setValue(opts["AVIF"]["speed"])
+        self.combo_avif_sub.setCurrentText(opts["AVIF"]["subsampling"])
+        self.spin_png_level.setValue(9 if opts["PNG"]["optimize"] else opts["PNG"]["compress_level"])
+        self.combo_png_strategy.setCurrentIndex(list(PNG_STRATEGIES.values()).index(opts["PNG"]["compress_type"]))
+        self._loading_profile = False
+        self.toggle_options(self.combo_format.currentText())
+
+    def on_encoder_option_changed(self, *_):
+        if self._loading_profile:
+            return
+        opts = self.profile_options
+        opts["JPEG"]["progressive"] = self.check_progressive.isChecked()
+        opts["JPEG"]["subsampling"] = JPEG_SUBSAMPLING[self.combo_jpeg_sub.currentText()]
+        opts["WebP"]["method"] = self.spin_webp_method.value()
+        opts["WebP"]["lossless"] = self.check_lossless.isChecked()
+        opts["AVIF"]["speed"] = self.spin_avif_speed.value()
+        opts["AVIF"]["subsampling"] = self.combo_avif_sub.currentText()
+        opts["PNG"]["compress_level"] = self.spin_png_level.value()
+        opts["PNG"]["optimize"] = self.spin_png_level.value() == 9
+        opts["PNG"]["compress_type"] = PNG_STRATEGIES[self.combo_png_strategy.currentText()]
+        self._loading_profile = True
+        self.combo_profile.setCurrentText("custom")
+        self._loading_profile = False
+        self.toggle_options(self.combo_format.currentText())
+
+    def run_benchmark(self):
+        items = self.file_list.selectedItems() or [self.file_list.item(i) for i in range(min(1, self.file_list.count()))]
+        if not items:
+            QMessageBox.warning(self, "Warning", "Add a sample image first.")
+            return
+        path = items[0].data(Qt.UserRole)
+        quality = self.slider_quality.value()
+        scale = self.slider_resize.value() if self.check_resize.isChecked() else 100
+        profiles = dict(PROFILES)
+        if self.combo_profile.currentText() == "custom":
+            profiles["custom"] = self.profile_options
+
+        self.progress_bar.setMaximum(len(supported_formats()) * len(profiles))
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.btn_benchmark.setEnabled(False)
+        self.btn_convert.setEnabled(False)
+        QApplication.processEvents()
+
+        def on_progress(done, total):
+            self.progress_bar.setValue(done)
+            QApplication.processEvents()
+
+        try:
+            # Çözme ve ölçekleme bir kez yapılır; ölçülen sadece kodlama süresidir
+            img, _ = load_source(path, scale)
+            img.load()
+            results = benchmark(img, quality, profiles=profiles, progress=on_progress)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", str(e))
+            return
+        finally:
+            self.progress_bar.setVisible(False)
+            self.btn_benchmark.setEnabled(True)
+            self.btn_convert.setEnabled(True)
+
+        box = QMessageBox(QMessageBox.Information, "Encoder Benchmark",
+                          f"{os.path.basename(path)}: {img.width}x{img.height}, quality {quality}", parent=self)
+        box.setInformativeText(f"<pre>{html.escape(format_benchmark(results, profiles))}</pre>")
+        box.exec_()
+
     def toggle_folder_button(self, checked):
         self.btn_dest.setEnabled(not checked)
         if checked:
@@ -243,60 +448,123 @@ class ConverterTool(QWidget):
             self.merge_to_pdf(resize_scale)
         else:
             success = 0
-            for i in range(count):
-                original_path = self.file_list.item(i).data(Qt.UserRole)
-                if self.process_single_image(original_path, target_fmt, quality, resize_scale):
-                    success += 1
-                self.progress_bar.setValue(i + 1)
-                QApplication.processEvents()
-            
-            QMessageBox.information(self, "Finished", f"{success} files converted successfully.")
+            self.report = []
+            paths = [self.file_list.item(i).data(Qt.UserRole) for i in range(count)]
+            self.journal = self.open_journal(paths, target_fmt, quality, resize_scale)
+            try:
+                for i, original_path in enumerate(paths):
+                    # Yarıda kalmış bir çalıştırmada bitmiş dosyalar tekrar işlenmez
+                    if self.journal.is_done(original_path):
+                        success += 1
+                    elif self.process_single_image(original_path, target_fmt, quality, resize_scale):
+                        success += 1
+                        self.journal.complete(original_path)
+                    self.progress_bar.setValue(i + 1)
+                    QApplication.processEvents()
+                self.report += ["", "Throughput:"] + self.journal.throughput_report()
+            finally:
+                # Hatasız biten işin günlüğü silinir; aksi halde tekrar başlatınca kalanlar yapılır
+                if success == count: self.journal.remove()
+                else: self.journal.close()
+                self.journal = None
+
+            box = QMessageBox(QMessageBox.Information, "Finished", f"{success} files converted successfully.", parent=self)
+            if self.report:
+                box.setDetailedText("\n".join(self.report))
+            box.exec_()
         
         self.progress_bar.setVisible(False)
 
+    def open_journal(self, paths, fmt, quality, scale):
+        """Aynı dosya listesi ve ayarlar için iş günlüğünü açar; yarım kalmış iş varsa devam etmeyi sorar."""
+        settings = {
+            "paths": paths, "fmt": fmt, "quality": quality, "scale": scale, "profile": self.profile_options,
+            "exif": self.check_exif.isChecked(), "smaller": self.check_smaller.isChecked(),
+            "passthrough": self.check_passthrough.isChecked(),
+            "target_size": self.check_target_size.isChecked() and self.spin_target_size.value(),
+            "ssim": self.check_ssim.isChecked() and self.spin_ssim.value(),
+            "dest": None if self.check_default_dir.isChecked() else self.dest_path,
+        }
+        key = hashlib.blake2b(json.dumps(settings, sort_keys=True).encode('utf-8'), digest_size=12).hexdigest()
+        path = os.path.join(user_cache_dir('journals'), f"converter-{key}.jsonl")
+        journal = JobJournal(path)
+        if journal.resumed:
+            answer = QMessageBox.question(
+                self, "Resume",
+                f"An interrupted batch with the same files and settings was found "
+                f"({journal.resumed} of {len(paths)} done).\nResume where it stopped?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes)
+            if answer == QMessageBox.No:
+                journal.remove()
+                journal = JobJournal(path)
+        return journal
+
+    def claim_output(self, path, out_dir, base_name, fmt):
+        # Yarım kalmış çalıştırmanın rezerve ettiği ad tekrar kullanılır; yeni kopya oluşmaz
+        final_out = self.journal.claimed_output(path) if self.journal else None
+        if final_out is None:
+            final_out = claim_unique_path(out_dir, f"{base_name}.converted", f".{fmt.lower()}")
+            if self.journal: self.journal.claim(path, final_out)
+        return final_out
+
     def process_single_image(self, path, fmt, qual, scale):
+        final_out = None
+        name = os.path.basename(path)
         try:
-            img = Image.open(path)
-            if scale < 100:
-                new_size = (max(1, int(img.width * (scale/100))), max(1, int(img.height * (scale/100))))
-                img = img.resize(new_size, Image.Resampling.LANCZOS)
-
-            if fmt == "JPEG":
-                if img.mode in ("RGBA", "P"):
-                    background = Image.new("RGB", img.size, (255, 255, 255))
-                    mask = img.split()[3] if img.mode == "RGBA" else None
-                    background.paste(img, mask=mask)
-                    img = background
-                else:
-                    img = img.convert("RGB")
-            elif fmt in ["PNG", "WebP", "AVIF"]:
-                if img.mode not in ("RGBA", "RGB", "P"):
-                    img = img.convert("RGBA")
-
             out_dir = self.dest_path if (self.dest_path and not self.check_default_dir.isChecked()) else os.path.dirname(path)
-            base_name = os.path.splitext(os.path.basename(path))[0]
-            
-            c = 1
-            while True:
-                new_name = f"{base_name}.converted{c}.{fmt.lower()}"
-                final_out = os.path.join(out_dir, new_name)
-                if not os.path.exists(final_out): break
-                c = c + 1
-
-            save_args = {"format": fmt}
-            if fmt == "PNG":
-                save_args["optimize"] = True
-                save_args["compress_level"] = max(0, min(9, int(qual / 11)))
-            elif fmt in ["JPEG", "WebP", "AVIF"]:
-                save_args["optimize"] = True
-                save_args["quality"] = qual
-
-            if self.check_exif.isChecked() and "exif" in img.info:
-                save_args["exif"] = img.info["exif"]
-            
-            img.save(final_out, **save_args)
+            base_name = os.path.splitext(name)[0]
+            keep_exif = self.check_exif.isChecked()
+            options = format_options(self.profile_options, fmt)
+            size_search = self.quality_searchable(fmt) and self.check_target_size.isChecked()
+            ssim_search = self.quality_searchable(fmt) and self.check_ssim.isChecked() and ssimquality.is_available()
+
+            passthrough = self.check_passthrough.isChecked() and not (size_search or ssim_search)
+            if passthrough and is_noop(path, fmt, scale, keep_exif):
+                # Kullanıcı istedi: aynı biçim ve ölçekte çözüp yeniden kodlamak sadece CPU ve kalite kaybı
+                final_out = self.claim_output(path, out_dir, base_name, fmt)
+                with atomic_path(final_out) as tmp_path:
+                    fast_copy(path, tmp_path)
+                self.report.append(f"{name}: already {fmt}, copied without re-encoding")
+                return True
+
+            img, exif = load_source(path, scale)
+            img = to_target_mode(img, fmt)
+            final_out = self.claim_output(path, out_dir, base_name, fmt)
+            save_args = build_save_args(fmt, qual, exif if keep_exif else None, options)
+
+            line = None
+            if size_search:
+                # Aynı (çözülmüş, ölçeklenmiş) resim bellekte farklı kalitelerle denenir
+                target = self.spin_target_size.value() * 1024
+                result = search_quality_for_size(img, save_args, target)
+                data = result.data
+                status = "" if result.fits else "  (does not fit, smallest kept)"
+                line = (f"{name}: quality {result.quality}, {result.size / 1024:.0f} KB, "
+                        f"{result.iterations} encodes, {result.elapsed:.2f}s{status}")
+            elif ssim_search:
+                result = ssimquality.search_quality_for_ssim(img, save_args, self.spin_ssim.value())
+                data = result.data
+                status = "" if result.fits else "  (target not reached)"
+                line = (f"{name}: quality {result.quality}, SSIM {result.score:.4f}, {result.size / 1024:.0f} KB, "
+                        f"{result.iterations} encodes, {result.elapsed:.2f}s{status}")
+            else:
+                data = encode(img, save_args)
+
+            original_size = os.path.getsize(path)
+            if self.check_smaller.isChecked() and len(data) >= original_size:
+                discard_claim(final_out)
+                self.report.append(f"{name}: kept original (re-encoded {len(data) / 1024:.0f} KB "
+                                   f">= original {original_size / 1024:.0f} KB)")
+                return True
+
+            # Önce geçici dosyaya; çökmede son adda yarım dosya kalmaz
+            with atomic_path(final_out) as tmp_path:
+                with open(tmp_path, 'wb') as f:
+                    f.write(data)
+            if line: self.report.append(line)
             return True
         except Exception:
+            discard_claim(final_out)
             return False
 
     def merge_to_pdf(self, scale):
@@ -312,7 +580,8 @@ class ConverterTool(QWidget):
             
             save_path, _ = QFileDialog.getSaveFileName(self, "Save as PDF", "merged.pdf", "*.pdf")
             if save_path:
-                pdf_list[0].save(save_path, save_all=True, append_images=pdf_list[1:])
+                with atomic_path(save_path) as tmp_path:
+                    pdf_list[0].save(tmp_path, save_all=True, append_images=pdf_list[1:])
                 QMessageBox.information(self, "Success", "PDF created successfully.")
         except Exception as e:
             QMessageBox.critical(self, "Error", str(e))
@@ -1,22 +1,66 @@
 #!/usr/bin/env python3
 import sys
 import os
+import shutil
+import subprocess
 from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QLabel, QPushButton, QMessageBox, QRubberBand, QCheckBox)
-from PyQt5.QtGui import QPixmap, QIcon, QPalette, QColor
+                             QLabel, QPushButton, QMessageBox, QRubberBand, QCheckBox, QFrame)
+from PyQt5.QtGui import QPixmap, QImage, QIcon, QPalette, QColor
 from PyQt5.QtCore import Qt, QRect, QPoint, QSize
 from PIL import Image
+from regionloader import is_region_loadable, read_region, build_preview, get_image_size, open_unchecked
+from outputnames import claim_unique_path, discard_claim, strip_suffix
+import ssimquality
 
 # Debian/Pardus grafik uyumluluğu
 os.environ['QT_QPA_PLATFORM'] = 'xcb'
 
+JPEG_EXTENSIONS = ('.jpg', '.jpeg', '.jpe', '.jfif')
+
+# Dev TIFF/PNG dosyalarında ekranda gösterilecek önizlemenin en uzun kenarı
+PREVIEW_MAX_SIDE = 2048
+
+def get_jpeg_mcu_size(img):
+    """JPEG dosyasının MCU (iMCU) boyutunu örnekleme faktörlerinden hesaplar."""
+    layers = getattr(img, 'layer', None)
+    if not layers:
+        return 8, 8
+    max_h = max(layer[1] for layer in layers)
+    max_v = max(layer[2] for layer in layers)
+    return 8 * max_h, 8 * max_v
+
+def snap_box_to_mcu(box, mcu_w, mcu_h, img_w, img_h):
+    """Seçimin sol-üst köşesini MCU sınırına indirir (jpegtran -crop ile aynı kural).
+    Sağ-alt kenar korunur; kısmi blok sadece görüntünün kenarında kalabilir."""
+    left, top, right, bottom = box
+    left = max(0, min(img_w - 1, int(left)))
+    top = max(0, min(img_h - 1, int(top)))
+    right = max(left + 1, min(img_w, int(round(right))))
+    bottom = max(top + 1, min(img_h, int(round(bottom))))
+    left -= left % mcu_w
+    top -= top % mcu_h
+    return left, top, right, bottom
+
+def lossless_jpeg_crop(src, dst, box, keep_exif=True):
+    """DCT bloklarını yeniden sıkıştırmadan kopyalayarak kırpar (jpegtran)."""
+    left, top, right, bottom = box
+    crop_spec = f"{right - left}x{bottom - top}+{left}+{top}"
+    cmd = ['jpegtran', '-crop', crop_spec, '-copy', 'all' if keep_exif else 'none',
+           '-outfile', dst, src]
+    subprocess.run(cmd, check=True, capture_output=True)
+
 class QFastCropper(QWidget):
     def __init__(self, target_file=None):
         super().__init__()
         self.image_path = target_file
         self.origin = QPoint()
         self.rubberBand = None
+        self.snap_hint = None
         self.pixmap = None
+        self.image_size = None
+        self.region_source = False
+        self.jpeg_mcu = None
+        self.jpegtran_path = shutil.which('jpegtran')
         self.apply_dark_theme() # Koyu temayı uygula
         self.initUI()
         
@@ -73,6 +117,21 @@ class QFastCropper(QWidget):
         self.cb_keep_exif = QCheckBox("Keep Metadata (EXIF)")
         self.cb_keep_exif.setChecked(True)
         self.cb_keep_exif.setStyleSheet("font-weight: bold; color: #aaaaaa;")
+
+        # Kayıpsız JPEG kırpma (jpegtran ile MCU hizalı)
+        self.cb_lossless = QCheckBox("Lossless JPEG Crop (MCU-aligned)")
+        self.cb_lossless.setEnabled(False)
+        self.cb_lossless.setStyleSheet("font-weight: bold; color: #aaaaaa;")
+        self.cb_lossless.setToolTip("Copies JPEG blocks without re-encoding. "
+                                    "The top-left corner snaps to the 8/16 px block grid.")
+        self.cb_lossless.toggled.connect(self.update_snap_hint)
+
+        self.cb_auto_quality = QCheckBox("Auto Quality (SSIM)")
+        self.cb_auto_quality.setStyleSheet("font-weight: bold; color: #aaaaaa;")
+        self.cb_auto_quality.setToolTip(f"JPEG/WebP/AVIF: lowest quality with SSIM ≥ {ssimquality.DEFAULT_SSIM_TARGET}")
+        if not ssimquality.is_available():
+            self.cb_auto_quality.setEnabled(False)
+            self.cb_auto_quality.setToolTip("Requires NumPy (python3-numpy).")
         
         self.btn_crop = QPushButton("Do it! (Crop & Save)")
         self.btn_crop.setFixedHeight(45)
@@ -91,6 +150,8 @@ class QFastCropper(QWidget):
         self.btn_crop.clicked.connect(self.save_cropped_image)
         
         controls_layout.addWidget(self.cb_keep_exif)
+        controls_layout.addWidget(self.cb_lossless)
+        controls_layout.addWidget(self.cb_auto_quality)
         controls_layout.addStretch()
         controls_layout.addWidget(self.btn_crop)
         
@@ -110,9 +171,28 @@ class QFastCropper(QWidget):
     def load_image(self, path):
         try:
             self.image_path = path
-            self.pixmap = QPixmap(path)
+            # Dev TIFF/PNG: tam bitmap yerine parça parça küçültülmüş önizleme
+            self.region_source = is_region_loadable(path)
+            if self.region_source:
+                preview = build_preview(path, PREVIEW_MAX_SIDE).convert("RGBA")
+                data = preview.tobytes("raw", "RGBA")
+                qimage = QImage(data, preview.width, preview.height, QImage.Format_RGBA8888)
+                self.pixmap = QPixmap.fromImage(qimage)
+                self.image_size = get_image_size(path)
+            else:
+                self.pixmap = QPixmap(path)
+                self.image_size = (self.pixmap.width(), self.pixmap.height())
             if self.pixmap.isNull():
                 raise Exception("Could not load image.")
+            self.jpeg_mcu = None
+            if path.lower().endswith(JPEG_EXTENSIONS):
+                with Image.open(path) as img:
+                    if img.format == 'JPEG':
+                        self.jpeg_mcu = get_jpeg_mcu_size(img)
+            lossless_ok = self.jpeg_mcu is not None and self.jpegtran_path is not None
+            self.cb_lossless.setEnabled(lossless_ok)
+            if not lossless_ok:
+                self.cb_lossless.setChecked(False)
             self.update_image_display()
             self.btn_crop.setEnabled(True)
         except Exception as e:
@@ -127,8 +207,54 @@ class QFastCropper(QWidget):
     def resizeEvent(self, event):
         if self.pixmap:
             self.update_image_display()
+            self.update_snap_hint()
         super().resizeEvent(event)
 
+    def get_display_geometry(self):
+        """Ekrandaki pixmap'in ofsetini ve orijinal görüntüye ölçek katsayısını döndürür."""
+        displayed_pixmap = self.img_label.pixmap()
+        dw = displayed_pixmap.width()
+        dh = displayed_pixmap.height()
+        offset_x = (self.img_label.width() - dw) / 2 + self.img_label.x()
+        offset_y = (self.img_label.height() - dh) / 2 + self.img_label.y()
+        scale_factor = self.image_size[0] / dw
+        return offset_x, offset_y, scale_factor
+
+    def selection_to_image_box(self, selection_rect):
+        offset_x, offset_y, scale_factor = self.get_display_geometry()
+        left = (selection_rect.left() - offset_x) * scale_factor
+        top = (selection_rect.top() - offset_y) * scale_factor
+        right = (selection_rect.right() - offset_x) * scale_factor
+        bottom = (selection_rect.bottom() - offset_y) * scale_factor
+        return left, top, right, bottom
+
+    def get_snapped_box(self, selection_rect):
+        mcu_w, mcu_h = self.jpeg_mcu
+        img_w, img_h = self.image_size
+        return snap_box_to_mcu(self.selection_to_image_box(selection_rect), mcu_w, mcu_h, img_w, img_h)
+
+    def update_snap_hint(self):
+        """Kayıpsız modda MCU'ya hizalanmış gerçek kırpma alanını gösterir."""
+        active = (self.cb_lossless.isChecked() and self.rubberBand is not None
+                  and self.rubberBand.isVisible() and not self.rubberBand.geometry().isEmpty()
+                  and self.img_label.pixmap() is not None)
+        if not active:
+            if self.snap_hint: self.snap_hint.hide()
+            return
+
+        offset_x, offset_y, scale_factor = self.get_display_geometry()
+        left, top, right, bottom = self.get_snapped_box(self.rubberBand.geometry())
+        hint_rect = QRect(QPoint(int(left / scale_factor + offset_x), int(top / scale_factor + offset_y)),
+                          QPoint(int(right / scale_factor + offset_x), int(bottom / scale_factor + offset_y)))
+
+        if not self.snap_hint:
+            self.snap_hint = QFrame(self)
+            self.snap_hint.setAttribute(Qt.WA_TransparentForMouseEvents)
+            self.snap_hint.setStyleSheet("border: 2px dashed #27ae60; background: transparent;")
+        self.snap_hint.setGeometry(hint_rect)
+        self.snap_hint.show()
+        self.snap_hint.raise_()
+
     def mousePressEvent(self, event):
         if self.img_label.pixmap():
             label_rect = self.img_label.geometry()
@@ -138,64 +264,67 @@ class QFastCropper(QWidget):
                     self.rubberBand = QRubberBand(QRubberBand.Rectangle, self)
                 self.rubberBand.setGeometry(QRect(self.origin, QSize()))
                 self.rubberBand.show()
+                self.update_snap_hint()
 
     def mouseMoveEvent(self, event):
         if self.rubberBand:
             self.rubberBand.setGeometry(QRect(self.origin, event.pos()).normalized())
+            self.update_snap_hint()
 
     def get_unique_path(self):
         directory = os.path.dirname(self.image_path)
-        base_name, ext = os.path.splitext(os.path.basename(self.image_path))
-        if "_cropped" in base_name:
-            base_name = base_name.split("_cropped")[0]
-        counter = 1
-        while True:
-            new_name = f"{base_name}_cropped{counter:02d}{ext}"
-            full_path = os.path.join(directory, new_name)
-            if not os.path.exists(full_path):
-                return full_path
-            counter += 1
+        name_part, ext = os.path.splitext(os.path.basename(self.image_path))
+        name_part = strip_suffix(name_part, "_cropped")
+        return claim_unique_path(directory, f"{name_part}_cropped", ext, digits=2)
 
     def save_cropped_image(self):
         if not self.rubberBand or self.rubberBand.geometry().isEmpty():
             QMessageBox.warning(self, "Warning", "Please select an area first!")
             return
 
+        output_path = None
         try:
             selection_rect = self.rubberBand.geometry()
-            displayed_pixmap = self.img_label.pixmap()
-            
-            dw = displayed_pixmap.width()
-            dh = displayed_pixmap.height()
-            offset_x = (self.img_label.width() - dw) / 2 + self.img_label.x()
-            offset_y = (self.img_label.height() - dh) / 2 + self.img_label.y()
 
-            orig_img = Image.open(self.image_path)
-            orig_w, orig_h = orig_img.size
+            if self.cb_lossless.isChecked() and self.jpeg_mcu:
+                # Kayıpsız yol: piksel çözülmez, DCT blokları doğrudan kopyalanır
+                output_path = self.get_unique_path()
+                lossless_jpeg_crop(self.image_path, output_path, self.get_snapped_box(selection_rect),
+                                   keep_exif=self.cb_keep_exif.isChecked())
+                QMessageBox.information(self, "Success", f"Saved (lossless): {os.path.basename(output_path)}")
+                self.rubberBand.hide()
+                self.update_snap_hint()
+                return
+
+            orig_img = open_unchecked(self.image_path) if self.region_source else Image.open(self.image_path)
             
             # EXIF verisini al (resize.py mantığı)
             exif_data = orig_img.info.get('exif') if self.cb_keep_exif.isChecked() else None
-            
-            scale_factor = orig_w / dw
-            
-            left = (selection_rect.left() - offset_x) * scale_factor
-            top = (selection_rect.top() - offset_y) * scale_factor
-            right = (selection_rect.right() - offset_x) * scale_factor
-            bottom = (selection_rect.bottom() - offset_y) * scale_factor
 
-            cropped_img = orig_img.crop((left, top, right, bottom))
+            left, top, right, bottom = self.selection_to_image_box(selection_rect)
+
+            if self.region_source:
+                # Sadece seçimle kesişen tile/strip/satırlar çözülür
+                cropped_img = read_region(self.image_path, (left, top, right, bottom))
+            else:
+                cropped_img = orig_img.crop((left, top, right, bottom))
             output_path = self.get_unique_path()
             
             # Kaydetme sırasında EXIF ekle
-            if exif_data:
-                cropped_img.save(output_path, quality=95, exif=exif_data)
+            save_params = {'quality': 95}
+            if exif_data: save_params['exif'] = exif_data
+            result = None
+            if self.cb_auto_quality.isChecked():
+                result = ssimquality.save_with_target_ssim(cropped_img, output_path, save_params)
             else:
-                cropped_img.save(output_path, quality=95)
+                cropped_img.save(output_path, **save_params)
             
-            QMessageBox.information(self, "Success", f"Saved: {os.path.basename(output_path)}")
+            detail = f" (quality {result.quality}, SSIM {result.score:.4f})" if result else ""
+            QMessageBox.information(self, "Success", f"Saved: {os.path.basename(output_path)}{detail}")
             self.rubberBand.hide()
             
         except Exception as e:
+            discard_claim(output_path)
             QMessageBox.critical(self, "Error", f"Crop failed: {str(e)}")
 
 if __name__ == '__main__':
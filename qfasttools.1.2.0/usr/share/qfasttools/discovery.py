@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Komut satırı araçları için akan (streaming) girdi keşfi.
+
+Girdiler dosya, klasör (alt klasörlerle), glob kalıbı ya da "-" (stdin'den
+NUL ile ayrılmış liste, ör. find -print0) olabilir. Hepsi üreteçtir: klasör
+os.scandir ile dolaşılırken bulunan ilk resim hemen işe verilir, milyonlarca
+dosyalık ağaçlarda listenin tamamı beklenmez ve bellekte tutulmaz. Taranan
+klasöre yazılan çıktılar (skip kalıpları) ve yarıda kalmış geçici dosyalar
+sonraki taramada girdi sayılmaz.
+"""
+import os
+import sys
+import glob
+from fnmatch import fnmatch
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.avif', '.bmp', '.tif', '.tiff', '.gif')
+NUL_CHUNK = 64 * 1024
+GLOB_CHARS = "*?["
+# outputnames.atomic_path geçici dosyaları (süreç öldürülürse geride kalabilir)
+PARTIAL_PATTERNS = (".*.partial.*",)
+
+
+def read_nul_separated(stream):
+    """NUL ile ayrılmış yolları geldikçe verir; read1 boru dolmasını beklemez."""
+    read = getattr(stream, 'read1', stream.read)
+    pending = b""
+    while True:
+        chunk = read(NUL_CHUNK)
+        if not chunk:
+            break
+        *names, pending = (pending + chunk).split(b"\0")
+        for name in names:
+            if name:
+                yield os.fsdecode(name)
+    if pending.strip(b"\n"):
+        yield os.fsdecode(pending.strip(b"\n"))
+
+
+def walk_files(directory, recursive=True):
+    """Klasördeki dosyaları bulundukça verir (sıralama yapılmaz, sembolik klasör bağları izlenmez)."""
+    stack = [directory]
+    while stack:
+        current = stack.pop()
+        subdirs = []
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.is_file():
+                            yield entry.path
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+        if recursive:
+            stack.extend(reversed(subdirs))
+
+
+class PathFilter:
+    """Uzantı ve --include/--exclude kalıpları. Kalıplar dosya adına ve tam yola uygulanır.
+
+    skip kalıpları (aracın kendi çıktıları) sadece taranarak bulunan dosyalara uygulanır.
+    """
+    def __init__(self, include=(), exclude=(), extensions=IMAGE_EXTENSIONS, skip=()):
+        self.include = list(include)
+        self.exclude = list(exclude)
+        self.extensions = extensions
+        self.skip = list(skip) + list(PARTIAL_PATTERNS)
+
+    def _matches(self, path, patterns):
+        name = os.path.basename(path)
+        return any(fnmatch(name, p) or fnmatch(path, p) for p in patterns)
+
+    def __call__(self, path, explicit=False):
+        # Komut satırında adıyla verilen dosya uzantısına bakılmadan kabul edilir
+        if not explicit and (not path.lower().endswith(self.extensions) or self._matches(path, self.skip)):
+            return False
+        if self.include and not self._matches(path, self.include):
+            return False
+        return not self._matches(path, self.exclude)
+
+
+def iter_inputs(args, include=(), exclude=(), recursive=True, stdin=None, skip=()):
+    """Girdi argümanlarını tek bir yol üretecine açar.
+
+    Adıyla ve glob ile verilen yollar hatırlanır ve ikinci kez verilmez; klasör
+    taraması ve stdin'den gelen yollar bellekte tutulmaz, sadece bu kümeyle
+    karşılaştırılır (iç içe iki klasör verilirse ortak dosyalar iki kez gelir).
+    skip: aracın çıktı adı kalıpları (ör. "*_resized.*"); klasör, glob ve stdin ile
+    bulunan eşleşen dosyalar atlanır, adıyla verilen dosyalar atlanmaz.
+    """
+    accept = PathFilter(include, exclude, skip=skip)
+    seen = set()
+    for arg in args:
+        remember = True
+        if arg == "-":
+            source = ((path, False) for path in read_nul_separated(stdin or sys.stdin.buffer))
+            remember = False
+        elif os.path.isdir(arg):
+            source = ((path, False) for path in walk_files(arg, recursive))
+            remember = False
+        elif any(c in arg for c in GLOB_CHARS) and not os.path.exists(arg):
+            source = ((path, False) for path in glob.iglob(arg, recursive=True) if os.path.isfile(path))
+        else:
+            source = [(arg, True)]
+        for path, explicit in source:
+            if path in seen or not accept(path, explicit):
+                continue
+            if remember:
+                seen.add(path)
+            yield path
@@ -9,6 +9,7 @@ from PyQt5.QtGui import QPixmap, QImage, QCursor, QPalette, QColor, QIcon
 from PyQt5.QtCore import Qt, QTimer
 from PIL import Image
 import sip
+from outputnames import claim_unique_path, discard_claim, strip_suffix
 
 # Debian/Pardus grafik uyumluluğu
 os.environ['QT_QPA_PLATFORM'] = 'xcb'
@@ -173,6 +174,7 @@ class QFastPhotoDuplicator(QWidget):
     def process_final_render(self):
         if not self.original_full: return
         QApplication.setOverrideCursor(QCursor(Qt.WaitCursor))
+        output_path = None
         try:
             # Orijinal resim üzerinden render alındığında spacing_px otomatik olarak artacak
             work_img = self.create_multi_layout(self.original_full)
@@ -187,6 +189,7 @@ class QFastPhotoDuplicator(QWidget):
             QMessageBox.information(self, "Success", f"Photo sheet saved as:\n{os.path.basename(output_path)}")
             
         except Exception as e:
+            discard_claim(output_path)
             QMessageBox.critical(self, "Error", f"Render failed: {e}")
         finally:
             QApplication.restoreOverrideCursor()
@@ -194,14 +197,8 @@ class QFastPhotoDuplicator(QWidget):
     def get_unique_path(self):
         directory = os.path.dirname(self.image_path)
         name_part, ext = os.path.splitext(os.path.basename(self.image_path))
-        if "_sheet" in name_part: name_part = name_part.split("_sheet")[0]
-        
-        counter = 1
-        while True:
-            new_filename = f"{name_part}_sheet{counter:02d}{ext if ext else '.jpg'}"
-            full_path = os.path.join(directory, new_filename)
-            if not os.path.exists(full_path): return full_path
-            counter += 1
+        name_part = strip_suffix(name_part, "_sheet")
+        return claim_unique_path(directory, f"{name_part}_sheet", ext if ext else '.jpg', digits=2)
 
     def dragEnterEvent(self, event):
         if event.mimeData().hasUrls(): event.accept()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Format Converter için kodlayıcı profilleri ve kodlama kıyaslaması.
+
+Kalite değeri çıktının ne kadar kayıplı olacağını belirler; profil ise
+kodlayıcının bu kaliteye ne kadar emekle ulaşacağını: WebP'de method (0-6),
+AVIF'te speed (0-10), JPEG'de progressive/optimize ve renk alt örneklemesi,
+PNG'de zlib seviyesi ve stratejisi. Aynı kalitede profil değiştirmek çoğunlukla
+sadece süreyi ve birkaç yüzde boyutu etkiler; kıyaslama bu dengeyi seçilen
+örnek resim üzerinde ölçer. Bu modül Qt içermez.
+"""
+import io
+import time
+import zlib
+from PIL import Image, features
+from convertengine import to_target_mode, build_save_args
+
+BENCHMARK_FORMATS = ("JPEG", "WebP", "AVIF", "PNG")
+BENCHMARK_REPEATS = 3
+
+# PNG: Pillow compress_type değerini zlib stratejisi olarak kullanır
+PNG_STRATEGIES = {
+    "default": zlib.Z_DEFAULT_STRATEGY,
+    "filtered": zlib.Z_FILTERED,
+    "huffman": zlib.Z_HUFFMAN_ONLY,
+    "rle": zlib.Z_RLE,
+    "fixed": zlib.Z_FIXED,
+}
+# JPEG subsampling: 0 = 4:4:4, 1 = 4:2:2, 2 = 4:2:0
+JPEG_SUBSAMPLING = {"4:4:4": 0, "4:2:2": 1, "4:2:0": 2}
+AVIF_SUBSAMPLING = ("4:2:0", "4:2:2", "4:4:4")
+
+# Anahtarlar doğrudan Image.save() parametreleridir
+PROFILES = {
+    "fast-draft": {
+        "JPEG": {"optimize": False, "progressive": False, "subsampling": 2},
+        "WebP": {"method": 0, "lossless": False},
+        "AVIF": {"speed": 10, "subsampling": "4:2:0"},
+        "PNG": {"optimize": False, "compress_level": 1, "compress_type": zlib.Z_RLE},
+    },
+    "balanced": {
+        "JPEG": {"optimize": True, "progressive": True, "subsampling": 2},
+        "WebP": {"method": 4, "lossless": False},
+        "AVIF": {"speed": 6, "subsampling": "4:2:0"},
+        "PNG": {"optimize": False, "compress_level": 6, "compress_type": zlib.Z_DEFAULT_STRATEGY},
+    },
+    "archival": {
+        "JPEG": {"optimize": True, "progressive": True, "subsampling": 0},
+        "WebP": {"method": 6, "lossless": False},
+        "AVIF": {"speed": 4, "subsampling": "4:4:4"},
+        # optimize=True zlib'i seviye 9 ile çalıştırır
+        "PNG": {"optimize": True, "compress_level": 9, "compress_type": zlib.Z_DEFAULT_STRATEGY},
+    },
+}
+DEFAULT_PROFILE = "balanced"
+
+
+def copy_profile(name):
+    """Düzenlenebilir (özel profil için) bir kopya döndürür."""
+    return {fmt: dict(opts) for fmt, opts in PROFILES[name].items()}
+
+
+def format_options(profile, fmt):
+    """Profilin bu biçim için kaydetme parametreleri; profil yoksa varsayılan profil."""
+    profile = profile or PROFILES[DEFAULT_PROFILE]
+    return dict(profile.get(fmt, {}))
+
+
+def describe(profile, fmt):
+    opts = format_options(profile, fmt)
+    if fmt == "JPEG":
+        sub = {v: k for k, v in JPEG_SUBSAMPLING.items()}.get(opts.get("subsampling"), "auto")
+        return f"{'progressive' if opts.get('progressive') else 'baseline'}, {sub}"
+    if fmt == "WebP":
+        return f"method {opts.get('method', 4)}" + (", lossless" if opts.get("lossless") else "")
+    if fmt == "AVIF":
+        return f"speed {opts.get('speed', 6)}, {opts.get('subsampling', '4:2:0')}"
+    if fmt == "PNG":
+        strategy = {v: k for k, v in PNG_STRATEGIES.items()}.get(opts.get("compress_type"), "default")
+        level = 9 if opts.get("optimize") else opts.get("compress_level", 6)
+        return f"zlib {level}, {strategy}"
+    return ""
+
+
+def supported_formats(formats=BENCHMARK_FORMATS):
+    """Bu Pillow kurulumunun kaydedebildiği biçimler (AVIF/WebP desteği olmayan derlemeler olabilir)."""
+    Image.init()
+    supported = []
+    for fmt in formats:
+        if fmt.upper() not in Image.SAVE:
+            continue
+        module = fmt.lower()
+        if module in features.modules and not features.check(module):
+            continue
+        supported.append(fmt)
+    return tuple(supported)
+
+
+class BenchmarkResult:
+    def __init__(self, profile, fmt, size, seconds, megapixels):
+        self.profile = profile
+        self.fmt = fmt
+        self.size = size
+        self.seconds = seconds
+        self.megapixels = megapixels
+
+    @property
+    def throughput(self):
+        return self.megapixels / self.seconds if self.seconds else 0.0
+
+
+def benchmark(img, quality, formats=BENCHMARK_FORMATS, profiles=None, repeats=BENCHMARK_REPEATS, progress=None):
+    """Her biçim/profil çifti için aynı (çözülmüş) resmi belleğe kodlar.
+
+    Süre, repeats denemenin en kısasıdır; dosya okuma ve çözme ölçüme girmez.
+    Her biçimden önce ölçülmeyen bir ısınma kodlaması yapılır, yoksa kodlayıcının
+    ilk kullanım maliyeti listedeki ilk profile yazılır. Kurulumda olmayan
+    biçimler atlanır. progress(done, total) her kodlamadan sonra çağrılır.
+    """
+    profiles = profiles or PROFILES
+    formats = supported_formats(formats)
+    megapixels = img.width * img.height / 1e6
+    total, done, results = len(formats) * len(profiles), 0, []
+    for fmt in formats:
+        target = to_target_mode(img, fmt)
+        target.load()
+        first = next(iter(profiles.values()))
+        target.save(io.BytesIO(), **build_save_args(fmt, quality, options=format_options(first, fmt)))
+        for name, profile in profiles.items():
+            save_args = build_save_args(fmt, quality, options=format_options(profile, fmt))
+            best, size = None, 0
+            for _ in range(max(1, repeats)):
+                buf = io.BytesIO()
+                start = time.perf_counter()
+                target.save(buf, **save_args)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+                size = buf.tell()
+            results.append(BenchmarkResult(name, fmt, size, best, megapixels))
+            done += 1
+            if progress:
+                progress(done, total)
+    return results
+
+
+def format_benchmark(results, profiles=None):
+    profiles = profiles or PROFILES
+    lines = [f"{'format':<6} {'profile':<11} {'size':>10} {'time':>9} {'MP/s':>7}  settings"]
+    for r in results:
+        lines.append(f"{r.fmt:<6} {r.profile:<11} {r.size / 1024:>7.0f} KB {r.seconds * 1000:>6.0f} ms "
+                     f"{r.throughput:>7.2f}  {describe(profiles.get(r.profile), r.fmt)}")
+    return "\n".join(lines)
@@ -7,6 +7,7 @@ from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout,
 from PyQt5.QtGui import QPixmap, QImage, QPalette, QColor, QIcon
 from PyQt5.QtCore import Qt
 from PIL import Image
+from outputnames import claim_unique_path, discard_claim, strip_suffix
 
 # Debian/Pardus grafik uyumluluğu
 os.environ['QT_QPA_PLATFORM'] = 'xcb'
@@ -184,22 +185,13 @@ class QFastFlipRotate(QWidget):
 
     def get_unique_path(self):
         directory = os.path.dirname(self.image_path)
-        filename = os.path.basename(self.image_path)
-        name_part, extension = os.path.splitext(filename)
-        
-        if "_modified" in name_part:
-            name_part = name_part.split("_modified")[0]
-        
-        counter = 1
-        while True:
-            new_filename = f"{name_part}_modified{counter:02d}{extension}"
-            full_path = os.path.join(directory, new_filename)
-            if not os.path.exists(full_path):
-                return full_path
-            counter += 1
+        name_part, extension = os.path.splitext(os.path.basename(self.image_path))
+        name_part = strip_suffix(name_part, "_modified")
+        return claim_unique_path(directory, f"{name_part}_modified", extension, digits=2)
 
     def save_image(self):
         if not self.current_image: return
+        output_path = None
         try:
             # EXIF verisini orijinal dosyadan al (resize.py mantığı)
             exif_data = self.original_raw.info.get('exif') if self.cb_keep_exif.isChecked() else None
@@ -221,6 +213,7 @@ class QFastFlipRotate(QWidget):
             self.original_image = save_img.copy()
             self.original_raw = Image.open(output_path)
         except Exception as e:
+            discard_claim(output_path)
             QMessageBox.critical(self, "Error", f"Save failed: {str(e)}")
 
 if __name__ == '__main__':
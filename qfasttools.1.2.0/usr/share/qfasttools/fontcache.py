@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Qt font ailesi + kalın/italik seçimini font dosyasına çeviren önbellekli katman.
+
+fontconfig (fc-list) bir kez taranır ve indeks diske yazılır; font klasörleri
+değişmedikçe tekrar taranmaz. Ayrıştırılmış FreeTypeFont nesneleri
+(dosya, boyut) anahtarıyla LRU önbellekte tutulur, böylece her önizlemede
+TTF dosyası yeniden okunmaz.
+"""
+import os
+import json
+import subprocess
+from functools import lru_cache
+from PIL import ImageFont
+from cachedir import user_cache_dir
+
+FALLBACK_FONTS = {
+    False: "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    True: "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+}
+FONT_DIRS = ("/usr/share/fonts", "/usr/local/share/fonts",
+             os.path.expanduser("~/.local/share/fonts"), os.path.expanduser("~/.fonts"))
+FONT_EXTENSIONS = ('.ttf', '.otf', '.ttc')
+# fc-cache font eklenip silindikçe bu klasörleri de günceller
+FONTCONFIG_CACHE_DIRS = ("/var/cache/fontconfig", os.path.expanduser("~/.cache/fontconfig"))
+
+# fontconfig ağırlık/eğim değerleri
+FC_WEIGHT_REGULAR = 80
+FC_WEIGHT_BOLD = 200
+FC_SLANT_ROMAN = 0
+
+_index = None
+_resolved = {}
+
+
+def _font_dirs_signature():
+    """Font klasörlerinin ve tüm alt klasörlerinin en yeni mtime'ı.
+
+    Yeni bir aile genelde kendi alt klasörüne kurulur (truetype/yeniaile/); bu
+    sadece o klasörün üstündekinin mtime'ını değiştirir, en üst klasörü değil.
+    Sadece klasörler stat edilir, font dosyaları değil.
+    """
+    sig = 0
+    stack = list(FONT_DIRS + FONTCONFIG_CACHE_DIRS)
+    while stack:
+        d = stack.pop()
+        try:
+            sig = max(sig, os.stat(d).st_mtime_ns)
+            with os.scandir(d) as entries:
+                stack.extend(e.path for e in entries if e.is_dir(follow_symlinks=False))
+        except OSError:
+            pass
+    return sig
+
+
+def _scan_fontconfig():
+    """fc-list çıktısından {aile: [(dosya, ağırlık, eğim), ...]} indeksi üretir."""
+    index = {}
+    try:
+        out = subprocess.run(['fc-list', '--format', '%{file}\t%{family}\t%{weight}\t%{slant}\n'],
+                             check=True, capture_output=True, text=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return index
+    for line in out.splitlines():
+        parts = line.split('\t')
+        if len(parts) != 4 or not parts[0].lower().endswith(FONT_EXTENSIONS):
+            continue
+        path, families, weight, slant = parts
+        try:
+            weight = int(float(weight.split(',')[0].strip('[] ') or FC_WEIGHT_REGULAR))
+            slant = int(float(slant.split(',')[0].strip('[] ') or FC_SLANT_ROMAN))
+        except ValueError:
+            weight, slant = FC_WEIGHT_REGULAR, FC_SLANT_ROMAN
+        for family in families.split(','):
+            index.setdefault(family.strip().lower(), []).append((path, weight, slant))
+    return index
+
+
+def get_font_index():
+    global _index
+    if _index is not None:
+        return _index
+    cache_file = os.path.join(user_cache_dir(), 'fontindex.json')
+    signature = _font_dirs_signature()
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('signature') == signature:
+            _index = data['fonts']
+            return _index
+    except (OSError, ValueError, KeyError):
+        pass
+
+    _index = _scan_fontconfig()
+    try:
+        tmp = cache_file + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'signature': signature, 'fonts': _index}, f)
+        os.replace(tmp, cache_file)
+    except OSError:
+        pass
+    return _index
+
+
+def resolve_font_file(family, bold=False, italic=False):
+    """Aile adı ve stil için en uygun font dosyasını döndürür."""
+    key = (family.lower(), bold, italic)
+    if key in _resolved:
+        return _resolved[key]
+
+    target_weight = FC_WEIGHT_BOLD if bold else FC_WEIGHT_REGULAR
+    best, best_score = None, None
+    for path, weight, slant in get_font_index().get(family.lower(), []):
+        score = abs(weight - target_weight) + (0 if (slant != FC_SLANT_ROMAN) == italic else 1000)
+        if best_score is None or score < best_score:
+            best, best_score = path, score
+
+    if best is None and os.path.exists(FALLBACK_FONTS[bold]):
+        best = FALLBACK_FONTS[bold]
+    _resolved[key] = best
+    return best
+
+
+@lru_cache(maxsize=64)
+def get_truetype(path, size):
+    return ImageFont.truetype(path, size)
+
+
+def load_font(family, size, bold=False, italic=False):
+    path = resolve_font_file(family, bold, italic)
+    if path:
+        try:
+            return get_truetype(path, max(1, size))
+        except OSError:
+            pass
+    return ImageFont.load_default()
@@ -7,6 +7,7 @@ from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout,
                              QFrame, QSlider, QCheckBox, QGroupBox)
 from PyQt5.QtGui import QColor, QPalette, QMovie, QIcon # QIcon eklendi
 from PyQt5.QtCore import Qt, QTimer
+from outputnames import claim_unique_path, discard_claim
 
 # Debian/Pardus grafik uyumluluğu
 os.environ['QT_QPA_PLATFORM'] = 'xcb'
@@ -158,11 +159,7 @@ class GifOptimizer(QWidget):
         folder = os.path.dirname(self.input_path)
         base_name_orig = os.path.splitext(os.path.basename(self.input_path))[0]
         
-        counter = 1
-        output_path = os.path.join(folder, f"{base_name_orig}_optimized_{counter}.gif")
-        while os.path.exists(output_path):
-            counter += 1
-            output_path = os.path.join(folder, f"{base_name_orig}_optimized_{counter}.gif")
+        output_path = claim_unique_path(folder, f"{base_name_orig}_optimized_", ".gif")
 
         try:
             with Image.open(self.input_path) as img:
@@ -189,6 +186,7 @@ class GifOptimizer(QWidget):
             QTimer.singleShot(3000, lambda: self.btn_optimize.setText("Optimize and Save"))
             
         except Exception as e:
+            discard_claim(output_path)
             QMessageBox.critical(self, "Error", str(e))
 
 if __name__ == '__main__':
@@ -8,6 +8,7 @@ from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout,
 from PyQt5.QtGui import QPixmap, QImage, QCursor, QPalette, QColor, QIcon
 from PyQt5.QtCore import Qt
 from PIL import Image, ImageOps
+from outputnames import claim_unique_path, discard_claim, strip_suffix
 
 # Debian/Pardus grafik uyumluluğu
 os.environ['QT_QPA_PLATFORM'] = 'xcb'
@@ -114,6 +115,7 @@ class QFastInverter(QWidget):
     def process_final_render(self):
         if not self.original_full: return
         QApplication.setOverrideCursor(QCursor(Qt.WaitCursor))
+        output_path = None
         try:
             # Gerçek render (arabını üretme)
             work_img = ImageOps.invert(self.original_full.convert('RGB'))
@@ -128,6 +130,7 @@ class QFastInverter(QWidget):
             QMessageBox.information(self, "Success", f"Inverted image saved:\n{os.path.basename(output_path)}")
             
         except Exception as e:
+            discard_claim(output_path)
             QMessageBox.critical(self, "Error", f"Render failed: {e}")
         finally:
             QApplication.restoreOverrideCursor()
@@ -135,14 +138,8 @@ class QFastInverter(QWidget):
     def get_unique_path(self):
         directory = os.path.dirname(self.image_path)
         name_part, ext = os.path.splitext(os.path.basename(self.image_path))
-        if "_inverted" in name_part: name_part = name_part.split("_inverted")[0]
-        
-        counter = 1
-        while True:
-            new_filename = f"{name_part}_inverted{counter:02d}{ext if ext else '.jpg'}"
-            full_path = os.path.join(directory, new_filename)
-            if not os.path.exists(full_path): return full_path
-            counter += 1
+        name_part = strip_suffix(name_part, "_inverted")
+        return claim_unique_path(directory, f"{name_part}_inverted", ext if ext else '.jpg', digits=2)
 
     def dragEnterEvent(self, event):
         if event.mimeData().hasUrls(): event.accept()
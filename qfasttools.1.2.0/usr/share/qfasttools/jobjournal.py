@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Toplu işler için yalnızca eklenen (append-only) iş günlüğü.
+
+Her satır bir JSON kaydıdır: "claim" (kaynak için rezerve edilen çıktı adı)
+ve "done" (kaynak tamamlandı). Çökme ya da kapatma sonrası aynı günlükle
+yeniden başlatılan iş, bitmiş kaynakları atlar ve yarım kalanları daha önce
+rezerve edilmiş çıktı adına yazar; yeni _01 kopyaları oluşmaz. Yarım yazılmış
+son satır okunurken yok sayılır. Tamamlanma zamanları iş hızını (dosya/sn)
+zaman içinde raporlamak için de kullanılır.
+"""
+import os
+import json
+import time
+
+# Bu kadar kayıtta bir diske zorla (fsync); arada çökmede en fazla bu kadar iş tekrarlanır
+SYNC_EVERY = 64
+THROUGHPUT_BUCKET = 60
+
+
+class JobJournal:
+    def __init__(self, path):
+        self.path = path
+        self.claimed = {}
+        self.done = {}
+        self.outputs = set()  # rezerve edilen ve yazılan tüm çıktı yolları
+        self.times = []      # bu çalıştırmadaki tamamlanma zamanları
+        self.resumed = 0     # günlükten gelen (önceki çalıştırmalarda) bitmiş iş sayısı
+        self._unsynced = 0
+        if os.path.exists(path):
+            self._load()
+        self.resumed = len(self.done)
+        self.started = time.time()
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def _load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # çökmede yarım kalmış satır
+                if record.get("event") == "claim":
+                    self.claimed[record["src"]] = record["out"]
+                    self.outputs.add(record["out"])
+                elif record.get("event") == "done":
+                    self.done[record["src"]] = record.get("out")
+                    if record.get("out"):
+                        self.outputs.add(record["out"])
+
+    def _append(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self._unsynced += 1
+        if self._unsynced >= SYNC_EVERY:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    def is_done(self, src):
+        return src in self.done
+
+    def is_output(self, path):
+        """Yol bu işin çıktısı mı? (kaynak klasörüne yazılan çıktılar tekrar girdi sayılmasın)"""
+        return path in self.outputs
+
+    def claimed_output(self, src):
+        """Önceki (yarım kalmış) çalıştırmada bu kaynak için rezerve edilmiş çıktı adı."""
+        return self.claimed.get(src)
+
+    def claim(self, src, out):
+        self.claimed[src] = out
+        self.outputs.add(out)
+        self._append({"event": "claim", "src": src, "out": out})
+
+    def complete(self, src, out=None):
+        now = time.time()
+        out = out or self.claimed.get(src)
+        self.done[src] = out
+        if out:
+            self.outputs.add(out)
+        self.times.append(now)
+        self._append({"event": "done", "src": src, "out": out, "t": round(now, 3)})
+
+    def close(self):
+        if not self._file.closed:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+    def remove(self):
+        """İş tamamen bittiğinde günlüğü siler."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def throughput(self):
+        elapsed = time.time() - self.started
+        return len(self.times) / elapsed if elapsed > 0 else 0.0
+
+    def throughput_report(self, bucket=THROUGHPUT_BUCKET):
+        """Bu çalıştırmanın hızı: toplam ve her bucket saniyelik dilim için dosya/sn."""
+        elapsed = max(time.time() - self.started, 1e-6)
+        lines = [f"{len(self.times)} items in {elapsed:.1f} s ({len(self.times) / elapsed:.2f}/s)"]
+        if self.resumed:
+            lines.append(f"{self.resumed} items were already done in an earlier run")
+        counts = {}
+        for t in self.times:
+            index = int((t - self.started) // bucket)
+            counts[index] = counts.get(index, 0) + 1
+        if len(counts) > 1:
+            for index in range(max(counts) + 1):
+                n = counts.get(index, 0)
+                lines.append(f"  {index * bucket:>5d}-{(index + 1) * bucket:<5d}s: {n:>5d} items, {n / bucket:.2f}/s")
+        return lines
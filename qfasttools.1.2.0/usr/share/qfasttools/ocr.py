@@ -1,14 +1,15 @@
 #!/usr/bin/env python3
 import sys
 import os
-import subprocess
-import tempfile
 import re
 from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, 
                              QLabel, QPushButton, QTextEdit, QFileDialog, 
-                             QMessageBox, QFrame, QComboBox)
+                             QMessageBox, QFrame, QComboBox, QCheckBox)
 from PyQt5.QtGui import QPixmap, QColor, QPalette, QIcon
 from PyQt5.QtCore import Qt
+from ocrengine import TesseractEngine, BatchOCR, expand_pages
+from ocrprep import preprocess, open_grayscale, format_timings, StepTimer
+from ocrcache import OCRCache, content_hash, make_key
 
 # Debian/Pardus grafik uyumluluğu
 os.environ['QT_QPA_PLATFORM'] = 'xcb'
@@ -19,6 +20,8 @@ class OCRTool(QWidget):
         self.initUI()
         self.setAcceptDrops(True)
         self.input_path = None
+        self.engine = None
+        self.cache = None
 
     def initUI(self):
         self.setWindowTitle('QFast OCR Tool')
@@ -72,6 +75,15 @@ class OCRTool(QWidget):
         lang_layout.addWidget(self.combo_lang)
         right_layout.addLayout(lang_layout)
 
+        self.check_prep = QCheckBox("Preprocess (scale, binarize, deskew)")
+        self.check_prep.setChecked(True)
+        right_layout.addWidget(self.check_prep)
+
+        self.label_timing = QLabel("")
+        self.label_timing.setWordWrap(True)
+        self.label_timing.setStyleSheet("color: #888; font-size: 8pt;")
+        right_layout.addWidget(self.label_timing)
+
         right_layout.addSpacing(10)
 
         self.btn_scan = QPushButton("Scan Text")
@@ -80,6 +92,10 @@ class OCRTool(QWidget):
         self.btn_scan.clicked.connect(self.perform_ocr)
         right_layout.addWidget(self.btn_scan)
 
+        self.btn_batch = QPushButton("Batch OCR (Images / TIFF / PDF)")
+        self.btn_batch.clicked.connect(self.perform_batch_ocr)
+        right_layout.addWidget(self.btn_batch)
+
         btn_copy = QPushButton("Copy to Clipboard")
         btn_copy.clicked.connect(self.copy_text)
         right_layout.addWidget(btn_copy)
@@ -136,26 +152,99 @@ class OCRTool(QWidget):
         
         return cleaned
 
+    def get_lang(self):
+        return self.combo_lang.currentText().split('(')[1].replace(')', '')
+
+    def get_engine(self):
+        """Motor dil değişene kadar saklanır; model her taramada yeniden yüklenmez."""
+        lang = self.get_lang()
+        if self.engine is None or self.engine.lang != lang:
+            if self.engine: self.engine.close()
+            self.engine = TesseractEngine(lang, omp_threads=os.cpu_count() or 1)
+        return self.engine
+
+    def get_prep_options(self):
+        return {} if self.check_prep.isChecked() else None
+
+    def get_cache(self):
+        # Önbellek açılamazsa (salt okunur ev dizini vb.) OCR önbelleksiz çalışır
+        if self.cache is None:
+            try:
+                self.cache = OCRCache()
+            except Exception:
+                self.cache = False
+        return self.cache or None
+
     def perform_ocr(self):
         if not self.input_path: return
-        lang = self.combo_lang.currentText().split('(')[1].replace(')', '')
-        
-        with tempfile.TemporaryDirectory() as temp_dir:
-            output_base = os.path.join(temp_dir, "ocr_res")
-            try:
-                # Tesseract çalıştırılırken 'quiet' modda çalışması için stderr yönlendirilebilir
-                subprocess.run(['tesseract', self.input_path, output_base, '-l', lang], 
-                               check=True, capture_output=True)
-                
-                result_file = output_base + ".txt"
-                if os.path.exists(result_file):
-                    with open(result_file, 'r', encoding='utf-8') as f:
-                        raw_text = f.read()
-                        # Metni mizanpaj hatalarından arındırıyoruz
-                        final_text = self.clean_text(raw_text)
-                        self.text_output.setText(final_text if final_text else "No text found!")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"OCR failed: {str(e)}")
+        try:
+            cache = self.get_cache()
+            key = None
+            if cache:
+                timer = StepTimer()
+                key = make_key(content_hash(self.input_path), 0, self.get_lang(), self.get_prep_options())
+                raw_text = cache.get(key)
+                timer.mark("hash + lookup")
+                if raw_text is not None:
+                    self.text_output.setText(self.clean_text(raw_text) or "No text found!")
+                    self.label_timing.setText("Cached result: " + format_timings(timer.timings))
+                    return
+
+            # Sonuç geçici dosya yerine doğrudan stdout'tan okunur
+            if self.get_prep_options() is None:
+                timer = StepTimer()
+                raw_text = self.get_engine().recognize(path=self.input_path)
+                timer.mark("ocr")
+                timings = timer.timings
+            else:
+                # Hazırlanan resim ham PGM olarak bellekten motora verilir
+                image, dpi, timings = preprocess(open_grayscale(self.input_path), self.get_prep_options())
+                timer = StepTimer()
+                raw_text = self.get_engine().recognize(image=image, dpi=dpi)
+                timer.mark("ocr")
+                timings.update(timer.timings)
+            self.label_timing.setText(format_timings(timings))
+            if key:
+                cache.put(key, raw_text)
+            # Metni mizanpaj hatalarından arındırıyoruz
+            final_text = self.clean_text(raw_text)
+            self.text_output.setText(final_text if final_text else "No text found!")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"OCR failed: {str(e)}")
+
+    def perform_batch_ocr(self):
+        files, _ = QFileDialog.getOpenFileNames(self, "Select Images or Documents", "",
+                                                "Images / Documents (*.png *.jpg *.jpeg *.bmp *.webp *.tif *.tiff *.pdf);;All Files (*)")
+        if not files: return
+        try:
+            pages = expand_pages(files)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Could not read input: {str(e)}")
+            return
+
+        self.btn_batch.setEnabled(False)
+        self.btn_scan.setEnabled(False)
+        try:
+            batch = BatchOCR(self.get_lang(), prep_options=self.get_prep_options(), cache=self.get_cache())
+            results = batch.run(pages, progress=self.on_batch_progress)
+            summary = f"{len(pages)} pages, {batch.cache_hits} cached"
+            if batch.timings:
+                summary += ": " + format_timings(batch.timings)
+            self.label_timing.setText(summary)
+        finally:
+            self.btn_batch.setText("Batch OCR (Images / TIFF / PDF)")
+            self.btn_batch.setEnabled(True)
+            self.btn_scan.setEnabled(self.input_path is not None)
+
+        blocks = []
+        for page, text in results:
+            body = f"[OCR failed: {text}]" if isinstance(text, Exception) else (self.clean_text(text) or "No text found!")
+            blocks.append(f"===== {page.label} =====\n{body}")
+        self.text_output.setText("\n\n".join(blocks))
+
+    def on_batch_progress(self, done, total):
+        self.btn_batch.setText(f"Scanning... {done}/{total}")
+        QApplication.processEvents()
 
     def copy_text(self):
         QApplication.clipboard().setText(self.text_output.toPlainText())
@@ -174,6 +263,7 @@ class OCRTool(QWidget):
         self.label_image.clear()
         self.label_image.setText("Drag & Drop Image Here")
         self.text_output.clear()
+        self.label_timing.clear()
         self.input_path = None
         self.btn_scan.setEnabled(False)
 
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""OCR sonuçları için kalıcı SQLite önbelleği (~/.cache/qfasttools/ocr.sqlite3).
+
+Anahtar; dosya içeriğinin BLAKE2b özeti, sayfa numarası, dil ve ön işleme
+ayarlarından oluşur. Aynı ekran görüntüsü tekrar bırakıldığında ya da yarıda
+kalmış bir toplu tarama yeniden başlatıldığında bitmiş sayfalar Tesseract'a
+gönderilmez. Toplam metin boyutu sınırı aşınca en uzun süredir kullanılmayan
+kayıtlar silinir.
+"""
+import os
+import json
+import time
+import sqlite3
+import threading
+from cachedir import user_cache_dir, content_hash
+
+DEFAULT_CACHE_MB = 32
+# Ön işleme ya da motor davranışı değişirse eski sonuçlar geçersiz olsun
+CACHE_VERSION = 1
+
+
+def make_key(digest, page_index, lang, prep_options):
+    prep = "raw" if prep_options is None else json.dumps(prep_options, sort_keys=True)
+    return f"{CACHE_VERSION}:{digest}:{page_index}:{lang}:{prep}"
+
+
+class OCRCache:
+    def __init__(self, path=None, max_mb=DEFAULT_CACHE_MB):
+        self.path = path or os.path.join(user_cache_dir(), 'ocr.sqlite3')
+        self.max_bytes = max_mb * 1024 * 1024
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+        with self._lock, self.db:
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("CREATE TABLE IF NOT EXISTS results ("
+                            "key TEXT PRIMARY KEY, text TEXT NOT NULL, "
+                            "size INTEGER NOT NULL, used REAL NOT NULL)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS results_used ON results(used)")
+
+    def close(self):
+        with self._lock:
+            self.db.close()
+
+    def get(self, key):
+        with self._lock, self.db:
+            row = self.db.execute("SELECT text FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self.db.execute("UPDATE results SET used = ? WHERE key = ?", (time.time(), key))
+            return row[0]
+
+    def put(self, key, text):
+        size = len(key) + len(text.encode('utf-8'))
+        with self._lock, self.db:
+            self.db.execute("INSERT OR REPLACE INTO results (key, text, size, used) VALUES (?, ?, ?, ?)",
+                            (key, text, size, time.time()))
+            self._evict()
+
+    def _evict(self):
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Sınırın %90'ına inene kadar en eski kayıtları sil, her put'ta tekrar etmesin
+        target = total - int(self.max_bytes * 0.9)
+        freed = 0
+        stale = []
+        for key, size in self.db.execute("SELECT key, size FROM results ORDER BY used"):
+            stale.append((key,))
+            freed += size
+            if freed >= target:
+                break
+        self.db.executemany("DELETE FROM results WHERE key = ?", stale)
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""OCR aracı için kalıcı Tesseract motoru ve paralel çok sayfalı toplu tarama.
+
+tesserocr (libtesseract bağlayıcısı) kuruluysa her işçi iş parçacığı kendi
+PyTessBaseAPI nesnesini bir kez oluşturur; dil modeli sayfa başına değil
+iş parçacığı başına bir kez yüklenir. Kurulu değilse tesseract komut satırı
+kullanılır; girdi stdin'den verilir, sonuç stdout'tan okunur (geçici dosya yok).
+"""
+import os
+import io
+import shutil
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed
+from PIL import Image, ImageSequence
+from ocrprep import preprocess, open_grayscale, StepTimer
+from ocrcache import content_hash, make_key
+
+# OpenMP OMP_THREAD_LIMIT'i kütüphane yüklenirken bir kez okur; sonradan os.environ'a
+# yazmak etkisizdir. Sınır OpenMP başlatan her iş parçacığına ayrı uygulanır: sayfalar
+# zaten çekirdek sayısı kadar iş parçacığında paralel tanındığından her biri tek OpenMP
+# iş parçacığıyla çalışır. Kullanıcı değişkeni kendisi verdiyse ona dokunulmaz.
+TESSEROCR_THREAD_LIMIT = 1
+
+_saved_limit = os.environ.get('OMP_THREAD_LIMIT')
+if _saved_limit is None:
+    os.environ['OMP_THREAD_LIMIT'] = str(TESSEROCR_THREAD_LIMIT)
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+finally:
+    # Kütüphane değeri okudu; pdftoppm gibi diğer alt süreçlere sızmasın
+    if _saved_limit is None:
+        del os.environ['OMP_THREAD_LIMIT']
+
+PDF_RENDER_DPI = 300
+MULTIPAGE_EXTENSIONS = ('.tif', '.tiff')
+
+
+def default_workers():
+    return max(1, os.cpu_count() or 1)
+
+
+class OCRPage:
+    """Bir dosyanın tek sayfası. Görüntü sadece işçi iş parçacığında yüklenir."""
+    def __init__(self, path, index=0, count=1):
+        self.path = path
+        self.index = index
+        self.count = count
+
+    @property
+    def label(self):
+        name = os.path.basename(self.path)
+        return f"{name} [page {self.index + 1}/{self.count}]" if self.count > 1 else name
+
+    def load(self):
+        """Sayfayı PIL resmi olarak döndürür; tek sayfalı dosyalar için None (yol doğrudan kullanılır)."""
+        if self.path.lower().endswith('.pdf'):
+            return render_pdf_page(self.path, self.index)
+        if self.count > 1:
+            with Image.open(self.path) as img:
+                img.seek(self.index)
+                return img.copy()
+        return None
+
+
+def count_pdf_pages(path):
+    out = subprocess.run(['pdfinfo', path], check=True, capture_output=True, text=True).stdout
+    for line in out.splitlines():
+        if line.startswith('Pages:'):
+            return int(line.split()[1])
+    return 1
+
+
+def render_pdf_page(path, index, dpi=PDF_RENDER_DPI):
+    """PDF sayfasını pdftoppm ile gri PGM olarak stdout üzerinden okur."""
+    page = str(index + 1)
+    data = subprocess.run(['pdftoppm', '-f', page, '-l', page, '-r', str(dpi), '-gray', '-singlefile', path, '-'],
+                          check=True, capture_output=True).stdout
+    return Image.open(io.BytesIO(data))
+
+
+def expand_pages(paths):
+    """Dosya listesini sayfa listesine açar (çok sayfalı TIFF ve PDF dahil)."""
+    pages = []
+    for path in paths:
+        lower = path.lower()
+        if lower.endswith('.pdf'):
+            if not shutil.which('pdftoppm'):
+                raise RuntimeError("PDF support requires poppler-utils (pdftoppm).")
+            count = count_pdf_pages(path)
+        elif lower.endswith(MULTIPAGE_EXTENSIONS):
+            with Image.open(path) as img:
+                count = sum(1 for _ in ImageSequence.Iterator(img))
+        else:
+            count = 1
+        pages.extend(OCRPage(path, i, count) for i in range(count))
+    return pages
+
+
+def encode_pnm(image):
+    """Resmi sıkıştırmasız ham PGM/PPM olarak kodlar (stdin için, PNG'den çok daha hızlı)."""
+    if image.mode not in ('L', 'RGB'):
+        image = image.convert('RGB' if image.mode in ('RGBA', 'P', 'CMYK') else 'L')
+    magic = b'P5' if image.mode == 'L' else b'P6'
+    return b'%s\n%d %d\n255\n' % (magic, image.width, image.height) + image.tobytes()
+
+
+class TesseractEngine:
+    """Tek bir iş parçacığına ait, modeli bir kez yüklenmiş OCR motoru.
+
+    omp_threads tesseract komut satırı yoluna (alt sürecin ortamı) uygulanır;
+    tesserocr yolunda sınır yükleme sırasında konan TESSEROCR_THREAD_LIMIT'tir.
+    """
+    def __init__(self, lang, omp_threads=1):
+        self.lang = lang
+        self.env = dict(os.environ, OMP_THREAD_LIMIT=str(omp_threads))
+        self.api = None
+        if tesserocr is not None:
+            self.api = tesserocr.PyTessBaseAPI(lang=lang)
+
+    def close(self):
+        if self.api is not None:
+            self.api.End()
+            self.api = None
+
+    def recognize(self, image=None, path=None, dpi=None):
+        """PIL resmi ya da dosya yolundan metni döndürür."""
+        if self.api is not None:
+            if image is None:
+                self.api.SetImageFile(path)
+            else:
+                self.api.SetImage(image)
+            if dpi:
+                self.api.SetSourceResolution(dpi)
+            return self.api.GetUTF8Text()
+
+        cmd = ['tesseract']
+        if image is None:
+            cmd.append(path)
+            stdin_data = None
+        else:
+            cmd.append('stdin')
+            stdin_data = encode_pnm(image)
+        cmd += ['stdout', '-l', self.lang]
+        if dpi:
+            cmd += ['--dpi', str(dpi)]
+        result = subprocess.run(cmd, input=stdin_data, check=True, capture_output=True, env=self.env)
+        return result.stdout.decode('utf-8', errors='replace')
+
+
+class BatchOCR:
+    """Sayfaları çekirdekler arasında paralel tanır; her iş parçacığının kendi motoru vardır."""
+    def __init__(self, lang, workers=None, prep_options=None, cache=None):
+        self.lang = lang
+        self.cache = cache
+        self.cache_hits = 0
+        self._digests = {}
+        self.workers = workers or default_workers()
+        # None ise ön işleme yapılmaz, dosya olduğu gibi tanınır
+        self.prep_options = prep_options
+        self.timings = {}
+        # Sayfalar zaten paralel; OpenMP iş parçacıkları çekirdekleri aşmasın
+        self.omp_threads = max(1, (os.cpu_count() or 1) // self.workers)
+        self._local = threading.local()
+        self._engines = []
+        self._lock = threading.Lock()
+
+    def _engine(self):
+        engine = getattr(self._local, 'engine', None)
+        if engine is None:
+            engine = TesseractEngine(self.lang, self.omp_threads)
+            self._local.engine = engine
+            with self._lock:
+                self._engines.append(engine)
+        return engine
+
+    def _page_key(self, page):
+        # Çok sayfalı dosyada özet bir kez hesaplanır; aynı dosyanın diğer sayfaları
+        # dosyayı tekrar okumak yerine ilk sayfanın hesabını bekler
+        with self._lock:
+            digest = self._digests.get(page.path)
+            first = digest is None
+            if first:
+                digest = self._digests[page.path] = Future()
+        if first:
+            try:
+                digest.set_result(content_hash(page.path))
+            except Exception as e:
+                digest.set_exception(e)
+        return make_key(digest.result(), page.index, self.lang, self.prep_options)
+
+    def _run_page(self, page):
+        if self.cache is None:
+            return self._recognize_page(page)
+        key = self._page_key(page)
+        text = self.cache.get(key)
+        if text is not None:
+            with self._lock:
+                self.cache_hits += 1
+            return text
+        text = self._recognize_page(page)
+        self.cache.put(key, text)
+        return text
+
+    def _recognize_page(self, page):
+        image = page.load()
+        if self.prep_options is None:
+            return self._engine().recognize(image=image, path=page.path)
+        if image is None:
+            image = open_grayscale(page.path)
+        image, dpi, timings = preprocess(image, self.prep_options)
+        timer = StepTimer()
+        text = self._engine().recognize(image=image, dpi=dpi)
+        timer.mark("ocr")
+        with self._lock:
+            for step, seconds in list(timings.items()) + list(timer.timings.items()):
+                self.timings[step] = self.timings.get(step, 0.0) + seconds
+        return text
+
+    def run(self, pages, progress=None):
+        """Sayfaları tanır; sonuçları sayfa sırasıyla [(sayfa, metin ya da Exception)] döndürür.
+
+        progress(done, total) her sayfa bittiğinde çağıran iş parçacığında çağrılır.
+        Ön işleme açıksa adım süreleri (tüm sayfaların toplamı) self.timings'e yazılır.
+        """
+        results = [None] * len(pages)
+        self.timings = {}
+        self.cache_hits = 0
+        self._digests = {}
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                futures = [pool.submit(self._run_page, page) for page in pages]
+                for done, (i, future) in enumerate(self._in_completion_order(futures), 1):
+                    try:
+                        results[i] = (pages[i], future.result())
+                    except Exception as e:
+                        results[i] = (pages[i], e)
+                    if progress:
+                        progress(done, len(pages))
+        finally:
+            for engine in self._engines:
+                engine.close()
+            self._engines = []
+        return results
+
+    @staticmethod
+    def _in_completion_order(futures):
+        index = {f: i for i, f in enumerate(futures)}
+        for future in as_completed(futures):
+            yield index[future], future
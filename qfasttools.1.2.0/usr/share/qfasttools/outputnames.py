@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Araçların ortak çıktı isimlendirme servisi.
+
+Her klasör bir kez os.scandir ile taranır ve dosya adları bellekte bir kümede
+tutulur; her kayıt için 1, 2, 3... adayları os.path.exists yerine bu kümede
+aranır ve rezerve edilen adlar kümeye eklenir. Böylece aynı klasöre N dosya
+yazan toplu iş, dosya başına farklı bir ad kökü kullansa da klasörü bir kez
+tarar. Önbellek en son kullanılan MAX_CACHED_DIRS klasörle sınırlıdır ve bir
+klasör, taraması eskidiğinde (dışarıdan silinen/eklenen dosyalar için)
+yeniden okunur. İsim O_EXCL ile atomik olarak oluşturularak "rezerve" edilir;
+küme eskimiş olsa bile paralel işlemler asla aynı dosya adını almaz. Çıktılar
+atomic_path() ile önce geçici dosyaya yazılıp os.replace ile yerine konur;
+yarıda kesilen bir kayıt son adda yarım dosya bırakmaz.
+"""
+import os
+import time
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+MAX_CACHED_DIRS = 8
+# Klasör en erken bu kadar saniye sonra yeniden taranır; büyük klasörlerde süre
+# tarama maliyetinin RESCAN_COST_RATIO katına uzar (tarama toplam sürenin ~%5'ini geçmez)
+MIN_RESCAN_SECONDS = 2.0
+RESCAN_COST_RATIO = 20
+
+_lock = threading.Lock()
+_dirs = OrderedDict()  # klasör -> _DirIndex, en son kullanılan sonda
+
+
+def format_name(stem, ext, counter, digits=0, start=1, sep="", bare_first=False):
+    if bare_first and counter == start:
+        return f"{stem}{ext}"
+    return f"{stem}{sep}{counter:0{digits}d}{ext}"
+
+
+class _DirIndex:
+    """Bir klasördeki dosya adları (tek tarama + bu süreçte rezerve edilenler)."""
+    def __init__(self, directory):
+        started = time.monotonic()
+        self.names = set()
+        try:
+            with os.scandir(directory) as entries:
+                self.names.update(entry.name for entry in entries)
+        except FileNotFoundError:
+            pass
+        self.scanned = time.monotonic()
+        self.max_age = max(MIN_RESCAN_SECONDS, RESCAN_COST_RATIO * (self.scanned - started))
+
+    @property
+    def stale(self):
+        return time.monotonic() - self.scanned > self.max_age
+
+
+def _dir_index(directory):
+    """Klasörün (gerekirse yeniden taranmış) indeksi; _lock altında çağrılır."""
+    index = _dirs.pop(directory, None)
+    if index is None or index.stale:
+        index = _DirIndex(directory)
+    _dirs[directory] = index
+    while len(_dirs) > MAX_CACHED_DIRS:
+        _dirs.popitem(last=False)
+    return index
+
+
+def claim_unique_path(directory, stem, ext, digits=0, start=1, sep="", bare_first=False):
+    """stem + sayaç + ext biçiminde boş bir dosya adı bulur ve atomik olarak oluşturur.
+
+    Dönen yol diskte boş bir dosya olarak vardır; çağıran taraf üzerine yazar.
+    Kayıt başarısız olursa discard_claim() ile boş dosya silinmelidir.
+    """
+    directory = os.path.abspath(directory or ".")
+    with _lock:
+        names = _dir_index(directory).names
+        counter = start
+        while True:
+            name = format_name(stem, ext, counter, digits, start, sep, bare_first)
+            counter += 1
+            if name in names:
+                continue
+            path = os.path.join(directory, name)
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                names.add(name)  # Tarama sonrası başka bir işlem almış; sıradakine geç
+                continue
+            os.close(fd)
+            names.add(name)
+            return path
+
+
+def discard_claim(path):
+    """claim_unique_path ile ayrılmış ama yazılamamış (boş) dosyayı siler."""
+    try:
+        if not path or os.path.getsize(path) != 0:
+            return
+        os.remove(path)
+    except OSError:
+        return
+    directory, name = os.path.split(os.path.abspath(path))
+    with _lock:
+        index = _dirs.get(directory)
+        if index is not None:
+            index.names.discard(name)
+
+
+def strip_suffix(name_part, tag):
+    """'photo_adjust03' gibi önceki çıktı adlarından asıl adı geri çıkarır."""
+    return name_part.split(tag)[0] if tag in name_part else name_part
+
+
+@contextmanager
+def atomic_path(path):
+    """Aynı klasörde, aynı uzantılı gizli bir geçici yol verir (Pillow biçimi uzantıdan
+    anlar). Blok hatasız biterse geçici dosya os.replace ile path'in yerine geçer,
+    hata olursa silinir.
+    """
+    directory, name = os.path.split(path)
+    stem, ext = os.path.splitext(name)
+    tmp = os.path.join(directory, f".{stem}.{os.getpid()}.partial{ext}")
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Color Picker için baskın renk paleti çıkarma.
+
+Resim tam boyutta işlenmez: JPEG'de çözücü draft() ile 1/8 ölçeğe kadar
+küçültülmüş çözer, ardından en fazla SAMPLE_SIDE x SAMPLE_SIDE piksellik bir
+örnek alınır. NumPy kuruluysa renkler örnek dizisi üzerinde vektörel
+median-cut ile başlatılıp k-means adımlarıyla iyileştirilir; kurulu değilse
+PIL'in C tarafındaki median-cut + k-means nicemlemesi kullanılır. Renkler
+kapladıkları alana göre sıralanır.
+"""
+import time
+from PIL import Image
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SAMPLE_SIDE = 256
+DEFAULT_COLORS = 8
+KMEANS_PASSES = 3
+# Bu değerin altındaki alfa saydam kabul edilir ve sayılmaz
+ALPHA_CUTOFF = 128
+# Kenar yumuşatma / JPEG gürültüsünden kalan çok küçük kümeler atlanır
+MIN_SHARE = 0.002
+
+
+def is_available():
+    """NumPy yolu kullanılabilir mi? (değilse PIL nicemlemesi kullanılır)"""
+    return np is not None
+
+
+def load_sample(path, side=SAMPLE_SIDE):
+    """Resmin en fazla side x side boyutunda RGB örneğini döndürür (saydam pikseller hariç)."""
+    with Image.open(path) as img:
+        if img.format == 'JPEG':
+            img.draft('RGB', (side, side))
+        if getattr(img, 'n_frames', 1) > 1:
+            img.seek(0)
+        img.thumbnail((side, side), Image.NEAREST, reducing_gap=None)
+        has_alpha = img.mode in ('RGBA', 'LA', 'PA') or 'transparency' in img.info
+        sample = img.convert('RGBA' if has_alpha else 'RGB')
+
+    if has_alpha:
+        alpha = sample.getchannel('A')
+        if alpha.getextrema()[0] < ALPHA_CUTOFF:
+            if np is not None:
+                pixels = np.asarray(sample)
+                opaque = pixels[pixels[..., 3] >= ALPHA_CUTOFF][:, :3]
+                return Image.fromarray(np.ascontiguousarray(opaque[None]), 'RGB') if len(opaque) else None
+            opaque = [px[:3] for px, a in zip(sample.getdata(), alpha.getdata()) if a >= ALPHA_CUTOFF]
+            if not opaque:
+                return None
+            flat = Image.new('RGB', (len(opaque), 1))
+            flat.putdata(opaque)
+            return flat
+        sample = sample.convert('RGB')
+    return sample
+
+
+def _unique_colors(pixels):
+    """Tekrarlanan renkleri birleştirir: (renkler (M, 3) uint8, piksel sayıları (M,))."""
+    keys = (pixels[:, 0].astype(np.int32) << 16) | (pixels[:, 1].astype(np.int32) << 8) | pixels[:, 2]
+    keys, counts = np.unique(keys, return_counts=True)
+    colors = np.stack([keys >> 16, (keys >> 8) & 0xFF, keys & 0xFF], axis=1).astype(np.uint8)
+    return colors, counts
+
+
+def _median_cut(colors, weights, count):
+    """Renkleri en fazla count kutuya böler; kutular renk indeksleridir.
+
+    Her adımda renk aralığı x piksel sayısı en büyük kutu, en geniş kanalının
+    (piksel sayısıyla ağırlıklı) medyanından ikiye bölünür.
+    """
+    def box_info(box):
+        return np.ptp(colors[box], axis=0), int(weights[box].sum())
+
+    boxes = [np.arange(len(colors))]
+    infos = [box_info(boxes[0])]
+    while len(boxes) < count:
+        scores = [int(spread.max()) * total if len(box) > 1 else 0
+                  for box, (spread, total) in zip(boxes, infos)]
+        i = max(range(len(boxes)), key=scores.__getitem__)
+        if scores[i] == 0:
+            break  # kalan kutuların hepsi tek renk
+        box = boxes.pop(i)
+        spread, total = infos.pop(i)
+        channel = int(np.argmax(spread))
+        box = box[np.argsort(colors[box, channel], kind='stable')]
+        cut = int(np.searchsorted(np.cumsum(weights[box]), total / 2))
+        cut = min(max(cut, 1), len(box) - 1)
+        for part in (box[:cut], box[cut:]):
+            boxes.append(part)
+            infos.append(box_info(part))
+    return boxes
+
+
+def _nearest(data, centers):
+    # |x - c|^2 = |x|^2 - 2 x.c + |c|^2; |x|^2 her satırda sabittir, argmin'i değiştirmez
+    return np.argmin((centers ** 2).sum(axis=1) - 2 * data @ centers.T, axis=1)
+
+
+def _palette_numpy(sample, count):
+    """[(piksel sayısı, (r, g, b)), ...]; ağırlıklı median-cut başlangıcı + vektörel k-means.
+
+    İşlem piksel yerine tekil renkler ve sayıları üzerinde yapılır.
+    """
+    colors, weights = _unique_colors(np.asarray(sample.convert('RGB')).reshape(-1, 3))
+    data = colors.astype(np.float32)
+    w = weights.astype(np.float64)
+    centers = np.array([np.average(data[box], axis=0, weights=w[box])
+                        for box in _median_cut(colors, weights, count)], dtype=np.float32)
+    k = len(centers)
+    for _ in range(KMEANS_PASSES):
+        labels = _nearest(data, centers)
+        sizes = np.bincount(labels, weights=w, minlength=k)
+        sums = np.stack([np.bincount(labels, weights=w * data[:, c], minlength=k) for c in range(3)], axis=1)
+        used = sizes > 0
+        centers[used] = sums[used] / sizes[used, None]
+    sizes = np.bincount(_nearest(data, centers), weights=w, minlength=k)
+    return [(int(n), tuple(int(round(v)) for v in center)) for n, center in zip(sizes, centers) if n]
+
+
+def _palette_pil(sample, count):
+    quantized = sample.quantize(colors=count, method=Image.Quantize.MEDIANCUT, kmeans=KMEANS_PASSES)
+    palette = quantized.getpalette()
+    return [(n, tuple(palette[index * 3:index * 3 + 3])) for n, index in quantized.getcolors(count)]
+
+
+def extract_palette(path, count=DEFAULT_COLORS):
+    """[((r, g, b), oran), ...] ve geçen süreyi (saniye) döndürür; en baskın renk ilk sıradadır."""
+    start = time.perf_counter()
+    sample = load_sample(path)
+    if sample is None:
+        return [], time.perf_counter() - start
+
+    clusters = _palette_numpy(sample, count) if np is not None else _palette_pil(sample, count)
+    total = sample.width * sample.height
+    colors = []
+    for pixels, rgb in sorted(clusters, reverse=True):
+        if pixels / total < MIN_SHARE and colors:
+            continue
+        colors.append((rgb, pixels / total))
+    return colors, time.perf_counter() - start
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""QR Tool için toplu QR üretimi (CSV / satır listesi) ve yazdırılabilir PDF sayfaları.
+
+Kodlar qrcode'un kutu kutu çizen make_image() yoluyla değil, modül matrisinden
+üretilir: matris 1 piksel = 1 modül olarak tek seferde 1-bit resme çevrilir ve
+Image.resize(NEAREST) ile büyütülür. Logo her kod boyutu için bir kez
+hazırlanıp önbelleğe alınır. Dosyalar ve PDF sayfaları işçi süreçlerde paralel
+üretilir.
+"""
+import re
+import csv
+from functools import lru_cache
+from concurrent.futures import as_completed
+import qrcode
+from PIL import Image, ImageDraw, ImageFont
+from outputnames import claim_unique_path, discard_claim
+from fontcache import FALLBACK_FONTS, get_truetype
+from workerpool import process_pool
+
+QUIET_ZONE = 4
+DEFAULT_BOX_SIZE = 10
+LOGO_RATIO = 0.22
+LOGO_PADDING = 6
+CHUNK_SIZE = 64
+
+MM_PER_INCH = 25.4
+A4_MM = (210, 297)
+
+
+def read_entries(path):
+    """CSV (1. sütun içerik, 2. sütun isteğe bağlı dosya adı) ya da satır listesi okur."""
+    entries = []
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        if path.lower().endswith('.csv'):
+            for row in csv.reader(f):
+                if row and row[0].strip():
+                    name = row[1].strip() if len(row) > 1 and row[1].strip() else None
+                    entries.append((row[0].strip(), name))
+        else:
+            for line in f:
+                line = line.strip()
+                if line:
+                    entries.append((line, None))
+    return entries
+
+
+def safe_stem(name):
+    stem = re.sub(r'[^\w.-]+', '_', name).strip('._')
+    return stem[:80] or "qr"
+
+
+def make_matrix(data):
+    qr = qrcode.QRCode(box_size=1, border=QUIET_ZONE, error_correction=qrcode.constants.ERROR_CORRECT_H)
+    qr.add_data(data)
+    qr.make(fit=True)
+    return qr.get_matrix()
+
+
+def render_matrix(matrix, box_size=DEFAULT_BOX_SIZE):
+    """Modül matrisini 1-bit resme çevirir (siyah modül = 0)."""
+    n = len(matrix)
+    data = bytes(0 if cell else 255 for row in matrix for cell in row)
+    img = Image.frombytes('L', (n, n), data).convert('1', dither=Image.Dither.NONE)
+    return img.resize((n * box_size, n * box_size), Image.NEAREST) if box_size > 1 else img
+
+
+@lru_cache(maxsize=4)
+def _load_logo(path):
+    with Image.open(path) as logo:
+        return logo.convert("RGBA")
+
+
+@lru_cache(maxsize=32)
+def logo_patch(path, qr_width):
+    """Beyaz zeminli, ortalanmış logo parçası. Her kod genişliği için bir kez üretilir."""
+    logo = _load_logo(path).copy()
+    logo_max_size = int(qr_width * LOGO_RATIO)
+    logo.thumbnail((logo_max_size, logo_max_size), Image.LANCZOS)
+    patch = Image.new("RGB", (logo.width + LOGO_PADDING, logo.height + LOGO_PADDING), "white")
+    patch.paste(logo, (LOGO_PADDING // 2, LOGO_PADDING // 2), mask=logo)
+    return patch
+
+
+def add_logo(img, logo_path):
+    patch = logo_patch(logo_path, img.width)
+    out = img.convert("RGB")
+    out.paste(patch, ((img.width - patch.width) // 2, (img.height - patch.height) // 2))
+    return out
+
+
+def render_code(data, box_size=DEFAULT_BOX_SIZE, logo_path=None):
+    img = render_matrix(make_matrix(data), box_size)
+    return add_logo(img, logo_path) if logo_path else img
+
+
+def _write_chunk(jobs, box_size, logo_path):
+    """İşçi süreçte çalışır: [(içerik, hedef)] listesini yazar, [(hedef, hata)] döndürür."""
+    results = []
+    for data, dst in jobs:
+        try:
+            render_code(data, box_size, logo_path).save(dst, format="PNG", optimize=False)
+            results.append((dst, None))
+        except Exception as e:
+            results.append((dst, str(e)))
+    return results
+
+
+def write_codes(entries, out_dir, box_size=DEFAULT_BOX_SIZE, logo_path=None, max_workers=None, progress=None):
+    """Her girdi için bir PNG yazar. (başarılı sayısı, [(hedef, hata)]) döndürür.
+
+    progress(done, total) her parça bittiğinde ana işlemde çağrılır.
+    """
+    jobs = []
+    for data, name in entries:
+        if name:
+            dst = claim_unique_path(out_dir, safe_stem(name), ".png", sep="_", bare_first=True)
+        else:
+            dst = claim_unique_path(out_dir, "qr_", ".png", digits=5)
+        jobs.append((data, dst))
+
+    total, done, success, failures = len(jobs), 0, 0, []
+    with process_pool(max_workers) as pool:
+        futures = [pool.submit(_write_chunk, jobs[i:i + CHUNK_SIZE], box_size, logo_path)
+                   for i in range(0, total, CHUNK_SIZE)]
+        for future in as_completed(futures):
+            for dst, error in future.result():
+                done += 1
+                if error is None:
+                    success += 1
+                else:
+                    discard_claim(dst)
+                    failures.append((dst, error))
+            if progress:
+                progress(done, total)
+    return success, failures
+
+
+class SheetLayout:
+    """Sayfa üzerindeki kod ızgarası; tüm ölçüler mm, çıktı piksel."""
+    def __init__(self, code_mm=40, margin_mm=10, gap_mm=6, caption=True, dpi=300, page_mm=A4_MM):
+        self.dpi = dpi
+        self.caption = caption
+        px = lambda mm: int(round(mm * dpi / MM_PER_INCH))
+        self.page_size = (px(page_mm[0]), px(page_mm[1]))
+        self.code_px = px(code_mm)
+        self.margin = px(margin_mm)
+        self.gap = px(gap_mm)
+        self.caption_px = px(4) if caption else 0
+        cell_w, cell_h = self.code_px, self.code_px + self.caption_px
+        usable_w = self.page_size[0] - 2 * self.margin + self.gap
+        usable_h = self.page_size[1] - 2 * self.margin + self.gap
+        self.cols = max(1, usable_w // (cell_w + self.gap))
+        self.rows = max(1, usable_h // (cell_h + self.gap))
+        self.cell = (cell_w, cell_h)
+
+    @property
+    def per_page(self):
+        return self.cols * self.rows
+
+
+def _caption_font(size):
+    try:
+        return get_truetype(FALLBACK_FONTS[False], size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+def render_sheet(entries, layout, logo_path=None):
+    """Bir sayfalık girdiyi ızgaraya dizer. Logo yoksa sayfa 1-bit kalır."""
+    page = Image.new("RGB" if logo_path else "1", layout.page_size, "white" if logo_path else 1)
+    draw = ImageDraw.Draw(page)
+    font = _caption_font(max(8, int(layout.caption_px * 0.8))) if layout.caption else None
+    for i, (data, name) in enumerate(entries):
+        col, row = i % layout.cols, i // layout.cols
+        x = layout.margin + col * (layout.cell[0] + layout.gap)
+        y = layout.margin + row * (layout.cell[1] + layout.gap)
+        matrix = make_matrix(data)
+        # Keskin modüller için tam sayı ölçek; kod hücreye ortalanır
+        box_size = max(1, layout.code_px // len(matrix))
+        code = render_matrix(matrix, box_size)
+        if logo_path:
+            code = add_logo(code, logo_path)
+        offset = (layout.code_px - code.width) // 2
+        page.paste(code, (x + offset, y + offset))
+        if font:
+            label = name or data
+            draw.text((x + layout.code_px // 2, y + layout.code_px + layout.caption_px // 2),
+                      label[:60], fill=0, font=font, anchor="mm")
+    return page.mode, page.size, page.tobytes()
+
+
+def write_sheets(entries, pdf_path, layout=None, logo_path=None, max_workers=None, progress=None):
+    """Kodları PDF sayfalarına dizer. Sayfalar paralel çizilir, sırayla eklenir.
+
+    Her sayfa PDF'e eklendikten sonra bellekten atılır (append=True),
+    böylece binlerce kodluk çıktıda tüm sayfalar aynı anda bellekte tutulmaz.
+    Yazılan sayfa sayısını döndürür.
+    """
+    layout = layout or SheetLayout()
+    per_page = layout.per_page
+    pages = [entries[i:i + per_page] for i in range(0, len(entries), per_page)]
+    with process_pool(max_workers) as pool:
+        for index, (mode, size, data) in enumerate(pool.map(render_sheet, pages, [layout] * len(pages),
+                                                            [logo_path] * len(pages))):
+            page = Image.frombytes(mode, size, data)
+            page.save(pdf_path, format="PDF", resolution=layout.dpi, append=index > 0)
+            if progress:
+                progress(min((index + 1) * per_page, len(entries)), len(entries))
+    return len(pages)
@@ -1,25 +1,58 @@
 #!/usr/bin/env python3
 import sys
 import os
-import qrcode
-from PIL import Image
-from pyzbar.pyzbar import decode
+from qrscan import scan_image, scan_folder, write_csv
+from qrbatch import render_code, read_entries, write_codes, write_sheets
+from qtimage import pil_to_qimage
 from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, 
                              QLabel, QPushButton, QTextEdit, QFileDialog, 
                              QMessageBox, QFrame)
 from PyQt5.QtGui import QPixmap, QColor, QPalette, QIcon
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal
 
 # Debian/Pardus grafik uyumluluğu
 os.environ['QT_QPA_PLATFORM'] = 'xcb'
 
+# Yazarken önizlemenin yenilenmesi için beklenen süre (ms)
+LIVE_PREVIEW_DELAY = 250
+
+class QRRenderThread(QThread):
+    """QR kodunu arka planda üretir; uzun ERROR_CORRECT_H içerikleri yazmayı dondurmaz."""
+    rendered = pyqtSignal(object, str)
+
+    def __init__(self, data, logo_path, parent=None):
+        super().__init__(parent)
+        self.data = data
+        self.logo_path = logo_path
+
+    def run(self):
+        error = ""
+        try:
+            try:
+                img = render_code(self.data, logo_path=self.logo_path)
+            except Exception as e:
+                if not self.logo_path: raise
+                # Logo okunamazsa logosuz kod üretilir, hata bildirilir
+                error = f"Logo error: {e}"
+                img = render_code(self.data)
+            self.rendered.emit(img, error)
+        except Exception as e:
+            self.rendered.emit(None, str(e))
+
 class QRTool(QWidget):
     def __init__(self):
         super().__init__()
-        self.initUI()
-        self.setAcceptDrops(True)
         self.current_qr_img = None
         self.logo_path = None
+        self.render_thread = None
+        self.render_pending = False
+
+        self.preview_timer = QTimer()
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.timeout.connect(self.start_live_render)
+
+        self.initUI()
+        self.setAcceptDrops(True)
 
     def initUI(self):
         self.setWindowTitle('QFast QR Tool')
@@ -51,6 +84,7 @@ class QRTool(QWidget):
         self.text_input.setPlaceholderText("Type content to be converted to QR code...")
         self.text_input.setMaximumHeight(80)
         self.text_input.setStyleSheet("color: white; background-color: #222;")
+        self.text_input.textChanged.connect(lambda: self.preview_timer.start(LIVE_PREVIEW_DELAY))
         left_layout.addWidget(self.text_input)
 
         self.btn_select_logo = QPushButton("Select Center Logo (Optional)")
@@ -77,6 +111,10 @@ class QRTool(QWidget):
         self.btn_save.clicked.connect(self.save_qr)
         left_layout.addWidget(self.btn_save)
 
+        self.btn_batch = QPushButton("BATCH FROM LIST (CSV / TXT)")
+        self.btn_batch.clicked.connect(self.generate_batch)
+        left_layout.addWidget(self.btn_batch)
+
         # --- RIGHT PANEL: READER ---
         right_frame = QFrame()
         right_frame.setFrameShape(QFrame.StyledPanel)
@@ -96,6 +134,10 @@ class QRTool(QWidget):
         self.btn_open.clicked.connect(self.open_qr)
         right_layout.addWidget(self.btn_open)
 
+        self.btn_scan_folder = QPushButton("SCAN FOLDER (EXPORT CSV)")
+        self.btn_scan_folder.clicked.connect(self.scan_folder_to_csv)
+        right_layout.addWidget(self.btn_scan_folder)
+
         lbl_result = QLabel("Decoded Result:")
         lbl_result.setStyleSheet(label_style)
         right_layout.addWidget(lbl_result)
@@ -127,43 +169,114 @@ class QRTool(QWidget):
         if path:
             self.logo_path = path
             self.label_logo_info.setText(f"Selected: {os.path.basename(path)}")
+            self.preview_timer.start(LIVE_PREVIEW_DELAY)
+
+    def get_logo(self):
+        return self.logo_path if self.logo_path and os.path.exists(self.logo_path) else None
+
+    def show_qr(self, qr_img):
+        # PNG'ye kaydedip geri okumak yerine doğrudan QImage -> QPixmap
+        self.current_qr_img = qr_img.convert('RGBA')
+        pixmap = QPixmap.fromImage(pil_to_qimage(self.current_qr_img))
+        self.qr_preview.setPixmap(pixmap.scaled(220, 220, Qt.KeepAspectRatio))
+        self.btn_save.setEnabled(True)
+
+    def clear_preview(self):
+        self.current_qr_img = None
+        self.qr_preview.clear()
+        self.qr_preview.setText("Preview")
+        self.btn_save.setEnabled(False)
+
+    def start_live_render(self):
+        if self.render_thread is not None:
+            # Önceki üretim bitince en güncel metinle tekrar başlatılır
+            self.render_pending = True
+            return
+        data = self.text_input.toPlainText().strip()
+        if not data:
+            self.clear_preview()
+            return
+        self.render_thread = QRRenderThread(data, self.get_logo(), self)
+        self.render_thread.rendered.connect(self.on_qr_rendered)
+        self.render_thread.finished.connect(self.on_render_finished)
+        self.render_thread.start()
+
+    def on_qr_rendered(self, qr_img, error):
+        if self.render_pending:
+            return  # Metin bu arada değişti; yenisi zaten sırada
+        if qr_img is not None:
+            self.show_qr(qr_img)
+        if error:
+            self.label_logo_info.setText(error)
+
+    def on_render_finished(self):
+        self.render_thread.deleteLater()
+        self.render_thread = None
+        if self.render_pending:
+            self.render_pending = False
+            self.start_live_render()
 
     def generate_qr(self):
         data = self.text_input.toPlainText().strip()
         if not data: return
 
-        qr = qrcode.QRCode(version=1, box_size=10, border=4, error_correction=qrcode.constants.ERROR_CORRECT_H)
-        qr.add_data(data)
-        qr.make(fit=True)
-
-        qr_img = qr.make_image(fill_color="black", back_color="white").convert('RGBA')
-        
-        if self.logo_path and os.path.exists(self.logo_path):
+        self.preview_timer.stop()
+        qr_img = render_code(data)
+        if self.get_logo():
             try:
-                logo = Image.open(self.logo_path).convert("RGBA")
-                qr_width, qr_height = qr_img.size
-                logo_max_size = int(qr_width * 0.22) 
-                logo.thumbnail((logo_max_size, logo_max_size), Image.LANCZOS)
-                
-                logo_w, logo_h = logo.size
-                padding = 6 
-                bg_w, bg_h = logo_w + padding, logo_h + padding
-                white_bg = Image.new("RGBA", (bg_w, bg_h), "white")
-                
-                bg_pos = ((qr_width - bg_w) // 2, (qr_height - bg_h) // 2)
-                logo_pos = ((qr_width - logo_w) // 2, (qr_height - logo_h) // 2)
-                
-                qr_img.paste(white_bg, bg_pos)
-                qr_img.paste(logo, logo_pos, mask=logo)
+                qr_img = render_code(data, logo_path=self.logo_path)
             except Exception as e:
                 QMessageBox.warning(self, "Logo Error", str(e))
 
-        self.current_qr_img = qr_img
-        temp_path = "temp_qr_preview.png"
-        self.current_qr_img.save(temp_path)
-        self.qr_preview.setPixmap(QPixmap(temp_path).scaled(220, 220, Qt.KeepAspectRatio))
-        self.btn_save.setEnabled(True)
-        if os.path.exists(temp_path): os.remove(temp_path)
+        self.show_qr(qr_img)
+
+    def generate_batch(self):
+        list_path, _ = QFileDialog.getOpenFileName(self, "Select List", "", "Lists (*.csv *.txt);;All Files (*)")
+        if not list_path: return
+        try:
+            entries = read_entries(list_path)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Could not read list: {str(e)}")
+            return
+        if not entries:
+            QMessageBox.warning(self, "Empty List", "No entries found in the selected file.")
+            return
+
+        box = QMessageBox(self)
+        box.setWindowTitle("Batch QR")
+        box.setText(f"{len(entries)} entries found. Choose output type:")
+        btn_png = box.addButton("PNG Files", QMessageBox.AcceptRole)
+        btn_pdf = box.addButton("PDF Sheets", QMessageBox.AcceptRole)
+        box.addButton(QMessageBox.Cancel)
+        box.exec_()
+
+        self.btn_batch.setEnabled(False)
+        try:
+            if box.clickedButton() == btn_png:
+                out_dir = QFileDialog.getExistingDirectory(self, "Select Output Folder", os.path.dirname(list_path))
+                if not out_dir: return
+                success, failures = write_codes(entries, out_dir, logo_path=self.get_logo(),
+                                                progress=self.on_batch_progress)
+                msg = f"{success} QR codes saved to {out_dir}"
+                if failures:
+                    msg += f"\n{len(failures)} failed (first: {failures[0][1]})"
+                QMessageBox.information(self, "Batch QR", msg)
+            elif box.clickedButton() == btn_pdf:
+                base = os.path.splitext(list_path)[0] + "_qr.pdf"
+                pdf_path, _ = QFileDialog.getSaveFileName(self, "Save PDF", base, "PDF Files (*.pdf)")
+                if not pdf_path: return
+                pages = write_sheets(entries, pdf_path, logo_path=self.get_logo(),
+                                     progress=self.on_batch_progress)
+                QMessageBox.information(self, "Batch QR", f"{len(entries)} QR codes laid out on {pages} pages.")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", str(e))
+        finally:
+            self.btn_batch.setText("BATCH FROM LIST (CSV / TXT)")
+            self.btn_batch.setEnabled(True)
+
+    def on_batch_progress(self, done, total):
+        self.btn_batch.setText(f"Generating... {done}/{total}")
+        QApplication.processEvents()
 
     def dragEnterEvent(self, event):
         if event.mimeData().hasUrls():
@@ -201,18 +314,45 @@ class QRTool(QWidget):
 
     def decode_qr_image(self, path):
         try:
-            img = Image.open(path)
-            decoded_objects = decode(img)
-            if decoded_objects:
-                result = decoded_objects[0].data.decode('utf-8')
-                self.text_output.setText(result)
-                self.label_drop.setText(f"Read: {os.path.basename(path)}")
+            codes = scan_image(path)
+            if codes:
+                if len(codes) == 1:
+                    self.text_output.setText(codes[0].text)
+                else:
+                    self.text_output.setText("\n".join(f"[{c.index}] {c.text}" for c in codes))
+                self.label_drop.setText(f"Read: {os.path.basename(path)} ({len(codes)} code(s))")
             else:
                 self.text_output.setText("No QR Code found!")
                 self.label_drop.setText("QR Not Found")
         except Exception as e:
             QMessageBox.critical(self, "Error", str(e))
 
+    def scan_folder_to_csv(self):
+        directory = QFileDialog.getExistingDirectory(self, "Select Folder to Scan")
+        if not directory: return
+        csv_path, _ = QFileDialog.getSaveFileName(self, "Save Results", os.path.join(directory, "qr_results.csv"),
+                                                  "CSV Files (*.csv)")
+        if not csv_path: return
+
+        self.btn_scan_folder.setEnabled(False)
+        try:
+            results = scan_folder(directory, progress=self.on_scan_progress)
+            rows = write_csv(results, csv_path, base_dir=directory)
+            failed = sum(1 for _, codes in results if isinstance(codes, Exception))
+            found = sum(1 for _, codes in results if not isinstance(codes, Exception) and codes)
+            self.text_output.setText(f"{len(results)} images scanned, {found} with codes, {rows} codes total."
+                                     + (f" {failed} unreadable." if failed else "")
+                                     + f"\nSaved: {csv_path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", str(e))
+        finally:
+            self.btn_scan_folder.setText("SCAN FOLDER (EXPORT CSV)")
+            self.btn_scan_folder.setEnabled(True)
+
+    def on_scan_progress(self, done, total):
+        self.btn_scan_folder.setText(f"Scanning... {done}/{total}")
+        QApplication.processEvents()
+
     def copy_output(self):
         QApplication.clipboard().setText(self.text_output.toPlainText())
 
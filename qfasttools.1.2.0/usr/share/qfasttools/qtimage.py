@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""PIL ve Qt resimleri arasında ara dosya ya da PNG kodlaması olmadan dönüşüm."""
+from PyQt5.QtGui import QImage
+
+
+def pil_to_qimage(img):
+    """PIL resmini kendi belleğine sahip bir QImage'a çevirir (PNG kodlaması olmadan)."""
+    if img.mode == "RGBA":
+        data = img.tobytes("raw", "RGBA")
+        return QImage(data, img.width, img.height, img.width * 4, QImage.Format_RGBA8888).copy()
+    data = img.convert("RGB").tobytes("raw", "RGB")
+    return QImage(data, img.width, img.height, img.width * 3, QImage.Format_RGB888).copy()
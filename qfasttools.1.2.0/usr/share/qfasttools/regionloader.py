@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""Büyük TIFF/PNG dosyalarından sadece istenen bölgeyi çözen yardımcı modül.
+
+Tam bitmap hiçbir zaman belleğe alınmaz: TIFF için yalnızca kırpma alanıyla
+kesişen tile/strip'ler, PNG için ise satır bantları sırayla çözülür.
+Uygunluk is_region_loadable() ile önceden sorulur; False ise çağıran taraf
+normal Image.open() yolunu kullanır. Desteklenmeyen bir dosyayla çağrılırsa
+read_region() ve build_preview() ValueError fırlatır.
+"""
+import io
+import math
+import struct
+import zlib
+from PIL import Image, TiffImagePlugin
+
+# Bu boyutun altındaki resimler için normal (tam) çözme zaten hızlıdır
+REGION_LOAD_MIN_PIXELS = 24 * 1000 * 1000
+
+# PNG bant boyutu (filtrelenmiş ham veri, bayt)
+PNG_BAND_BYTES = 16 * 1024 * 1024
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+PNG_COLOR_TYPES = {0: ("L", 1), 2: ("RGB", 3), 3: ("P", 1), 4: ("LA", 2), 6: ("RGBA", 4)}
+
+# Tek parçalık TIFF oluştururken kaynaktan aynen kopyalanan etiketler
+TIFF_COPY_TAGS = (258, 259, 262, 266, 277, 317, 320, 338, 339, 347, 530, 531, 532)
+
+
+def open_unchecked(path):
+    """Decompression bomb kontrolü olmadan açar; pikseller zaten çözülmeyecek."""
+    old_limit = Image.MAX_IMAGE_PIXELS
+    Image.MAX_IMAGE_PIXELS = None
+    try:
+        return Image.open(path)
+    finally:
+        Image.MAX_IMAGE_PIXELS = old_limit
+
+
+def get_image_size(path):
+    with open_unchecked(path) as img:
+        return img.size
+
+
+def is_region_loadable(path):
+    """Dosya büyük ve bölgesel okumaya uygun bir TIFF/PNG ise True döner."""
+    try:
+        with open_unchecked(path) as img:
+            w, h = img.size
+            if w * h < REGION_LOAD_MIN_PIXELS:
+                return False
+            if img.format == 'TIFF':
+                return _tiff_layout(img) is not None
+            if img.format == 'PNG':
+                return _png_header(path) is not None
+    except Exception:
+        pass
+    return False
+
+
+def read_region(path, box):
+    """(left, top, right, bottom) kutusunu çözer.
+
+    Kutu resmin dışındaysa ya da dosya bölgesel okumaya uygun değilse ValueError fırlatır.
+    """
+    with open_unchecked(path) as img:
+        fmt = img.format
+        w, h = img.size
+    left, top, right, bottom = (int(round(v)) for v in box)
+    left, top = max(0, left), max(0, top)
+    right, bottom = min(w, right), min(h, bottom)
+    if right <= left or bottom <= top:
+        raise ValueError("Selection is outside the image.")
+
+    out = None
+    for x, y, piece in _iter_pieces(path, fmt, (left, top, right, bottom)):
+        if out is None:
+            out = Image.new(piece.mode, (right - left, bottom - top))
+            if piece.mode == 'P':
+                out.putpalette(piece.getpalette())
+        # Parçanın sadece kutuyla kesişen kısmını yapıştır
+        ix0, iy0 = max(x, left), max(y, top)
+        ix1, iy1 = min(x + piece.width, right), min(y + piece.height, bottom)
+        if ix1 <= ix0 or iy1 <= iy0:
+            continue
+        part = piece.crop((ix0 - x, iy0 - y, ix1 - x, iy1 - y))
+        out.paste(part, (ix0 - left, iy0 - top))
+    return out
+
+
+def build_preview(path, max_side):
+    """Resmi parça parça çözüp küçülterek önizleme üretir.
+
+    Dosya bölgesel okumaya uygun değilse ValueError fırlatır.
+    """
+    with open_unchecked(path) as img:
+        fmt = img.format
+        w, h = img.size
+    scale = min(1.0, max_side / max(w, h))
+    pw, ph = max(1, int(w * scale)), max(1, int(h * scale))
+
+    out = None
+    for x, y, piece in _iter_pieces(path, fmt, (0, 0, w, h)):
+        if out is None:
+            mode = "RGBA" if piece.mode in ("LA", "RGBA", "P") else ("L" if piece.mode == "L" else "RGB")
+            out = Image.new(mode, (pw, ph))
+        tx0, ty0 = int(x * scale), int(y * scale)
+        tx1 = max(tx0 + 1, int(min(w, x + piece.width) * scale))
+        ty1 = max(ty0 + 1, int(min(h, y + piece.height) * scale))
+        piece = piece.crop((0, 0, min(piece.width, w - x), min(piece.height, h - y)))
+        out.paste(piece.convert(out.mode).resize((tx1 - tx0, ty1 - ty0), Image.BOX), (tx0, ty0))
+    return out
+
+
+def _iter_pieces(path, fmt, box):
+    if fmt == 'TIFF':
+        with open_unchecked(path) as img:
+            if _tiff_layout(img) is not None:
+                yield from _iter_tiff_pieces(img, box)
+                return
+    elif fmt == 'PNG':
+        if _png_header(path) is not None:
+            yield from _iter_png_bands(path, box)
+            return
+    raise ValueError("Region reading is not supported for this file.")
+
+
+# --------------------------------------------------------------------
+# TIFF: sadece kesişen tile/strip'leri çöz
+
+def _tiff_layout(img):
+    tags = img.tag_v2
+    if tags.get(284, 1) != 1:  # PlanarConfiguration: sadece "chunky"
+        return None
+    w, h = img.size
+    if 322 in tags and 324 in tags:
+        tile_w, tile_h = tags[322], tags[323]
+        offsets, counts = tags[324], tags[325]
+    elif 273 in tags:
+        tile_w, tile_h = w, tags.get(278, h)
+        offsets, counts = tags[273], tags[279]
+    else:
+        return None
+    if len(offsets) < 2:
+        return None  # Tek parçalı dosyada bölgesel okumanın kazancı yok
+    return tile_w, min(tile_h, h), offsets, counts
+
+
+def _iter_tiff_pieces(img, box):
+    left, top, right, bottom = box
+    w, h = img.size
+    tile_w, tile_h, offsets, counts = _tiff_layout(img)
+    across = math.ceil(w / tile_w)
+    is_tiled = 322 in img.tag_v2
+
+    for index, (offset, count) in enumerate(zip(offsets, counts)):
+        x = (index % across) * tile_w
+        y = (index // across) * tile_h
+        if x >= right or x + tile_w <= left or y >= bottom or y + tile_h <= top:
+            continue
+        # Strip'lerin sonuncusu kısa olabilir, tile'lar ise her zaman tam boydur
+        piece_h = tile_h if is_tiled else min(tile_h, h - y)
+        img.fp.seek(offset)
+        data = img.fp.read(count)
+        yield x, y, _decode_tiff_chunk(img.tag_v2, tile_w, piece_h, data)
+
+
+def _decode_tiff_chunk(src_tags, width, height, data):
+    """Tek bir sıkıştırılmış tile/strip'i bellek içi tek parçalık TIFF olarak çözer.
+
+    Parça verisi ham kopyalandığından başlık kaynağın bayt sırasıyla (II/MM)
+    yazılır; yoksa büyük-endian 16-bit örnekler ters okunur.
+    """
+    endian = "<" if src_tags.prefix == b"II" else ">"
+    header = src_tags.prefix + struct.pack(endian + "HL", 42, 8)
+    ifd = TiffImagePlugin.ImageFileDirectory_v2(ifh=header)
+    for tag in TIFF_COPY_TAGS:
+        if tag in src_tags:
+            ifd[tag] = src_tags[tag]
+            ifd.tagtype[tag] = src_tags.tagtype[tag]
+    ifd[256] = width
+    ifd[257] = height
+    ifd[278] = height
+    ifd[279] = len(data)
+    ifd[273] = 0  # tobytes() bunu IFD'nin sonuna göre düzeltir
+    for tag in (256, 257, 278, 273, 279):
+        ifd.tagtype[tag] = 4  # LONG
+
+    buf = header + ifd.tobytes(8) + data
+    piece = Image.open(io.BytesIO(buf))
+    piece.load()
+    return piece
+
+
+# --------------------------------------------------------------------
+# PNG: satırları bant bant çöz, kırpma alanının altına inmeden dur
+
+def _png_header(path):
+    """Akış halinde okunabilecek (8-bit, interlace'siz) PNG'nin başlığını döndürür."""
+    with open(path, 'rb') as f:
+        if f.read(8) != PNG_SIGNATURE:
+            return None
+        length, ctype = struct.unpack(">I4s", f.read(8))
+        if ctype != b'IHDR':
+            return None
+        w, h, depth, color, _, _, interlace = struct.unpack(">IIBBBBB", f.read(13))
+        if depth != 8 or interlace != 0 or color not in PNG_COLOR_TYPES:
+            return None
+        f.read(4)
+        palette = None
+        while True:
+            head = f.read(8)
+            if len(head) < 8:
+                return None
+            length, ctype = struct.unpack(">I4s", head)
+            if ctype == b'IDAT':
+                break
+            if ctype == b'tRNS':
+                return None  # Renk anahtarlı şeffaflık: tam çözme yoluna bırak
+            if ctype == b'PLTE':
+                palette = f.read(length)
+                f.read(4)
+            else:
+                f.seek(length + 4, io.SEEK_CUR)
+    if color == 3 and palette is None:
+        return None
+    return w, h, color, palette
+
+
+def _iter_png_idat(f):
+    f.seek(8)
+    while True:
+        head = f.read(8)
+        if len(head) < 8:
+            return
+        length, ctype = struct.unpack(">I4s", head)
+        if ctype == b'IDAT':
+            yield f.read(length)
+            f.read(4)
+        elif ctype == b'IEND':
+            return
+        else:
+            f.seek(length + 4, io.SEEK_CUR)
+
+
+def _iter_png_bands(path, box):
+    """Filtrelenmiş satırları PIL'in zip çözücüsüyle bant bant açar.
+
+    Her bant, bir önceki bandın son ham satırı (filtre 0) başa eklenerek
+    çözülür; böylece Up/Average/Paeth filtreleri doğru referansı görür.
+    """
+    _, top, _, bottom = box
+    w, h, color, palette = _png_header(path)
+    mode, bpp = PNG_COLOR_TYPES[color]
+    stride = w * bpp + 1
+    band_rows = max(1, PNG_BAND_BYTES // stride)
+
+    inflater = zlib.decompressobj()
+    pending = b''
+    prev_raw = None
+    y = 0
+    with open(path, 'rb') as f:
+        chunks = _iter_png_idat(f)
+        while y < min(h, bottom):
+            rows = min(band_rows, h - y)
+            need = rows * stride
+            while len(pending) < need:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    pending += inflater.flush()
+                    break
+                pending += inflater.decompress(chunk)
+            band_data, pending = pending[:need], pending[need:]
+            if len(band_data) < need:
+                raise ValueError("PNG data is truncated.")
+
+            lead = 0
+            if prev_raw is not None:
+                band_data = b'\x00' + prev_raw + band_data
+                lead = 1
+            band = Image.frombytes(mode, (w, rows + lead), zlib.compress(band_data, 0), "zip", mode)
+            if mode == 'P':
+                band.putpalette(palette)
+            prev_raw = band.crop((0, rows + lead - 1, w, rows + lead)).tobytes()
+
+            if y + rows > top:
+                yield 0, y, band.crop((0, lead, w, rows + lead))
+            y += rows
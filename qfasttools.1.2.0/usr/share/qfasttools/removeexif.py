@@ -8,6 +8,7 @@ from PyQt5.QtGui import QPixmap, QPalette, QColor, QIcon
 from PyQt5.QtCore import Qt
 from PIL import Image
 from PIL.ExifTags import TAGS
+from outputnames import claim_unique_path, discard_claim, strip_suffix
 
 # Debian/Pardus grafik uyumluluğu
 os.environ['QT_QPA_PLATFORM'] = 'xcb'
@@ -148,18 +149,11 @@ class QFastExifCleaner(QWidget):
     def get_unique_path(self):
         directory = os.path.dirname(self.image_path)
         name_part, extension = os.path.splitext(os.path.basename(self.image_path))
-        
-        if "_exif_cleaned" in name_part:
-            name_part = name_part.split("_exif_cleaned")[0]
-        
-        counter = 1
-        while True:
-            new_filename = f"{name_part}_exif_cleaned{counter:02d}{extension}"
-            full_path = os.path.join(directory, new_filename)
-            if not os.path.exists(full_path): return full_path
-            counter += 1
+        name_part = strip_suffix(name_part, "_exif_cleaned")
+        return claim_unique_path(directory, f"{name_part}_exif_cleaned", extension, digits=2)
 
     def save_cleaned_image(self):
+        output_path = None
         try:
             img = Image.open(self.image_path)
             
@@ -177,6 +171,7 @@ class QFastExifCleaner(QWidget):
             self.btn_clear.setEnabled(False)
             
         except Exception as e:
+            discard_claim(output_path)
             QMessageBox.critical(self, "Error", f"Save failed: {e}")
 
 if __name__ == '__main__':
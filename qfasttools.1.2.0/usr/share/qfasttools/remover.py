@@ -1,12 +1,14 @@
 #!/usr/bin/env python3
 import sys
 import os
-from PIL import Image
+from PIL import Image, ImageChops
+from undohistory import UndoHistory
 from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, 
                              QLabel, QPushButton, QMessageBox, QFrame, 
                              QSlider, QCheckBox)
 from PyQt5.QtGui import QPixmap, QColor, QPalette, QImage, QCursor, QIcon
 from PyQt5.QtCore import Qt
+from outputnames import claim_unique_path, discard_claim
 
 # Debian/Pardus grafik uyumluluğu
 os.environ['QT_QPA_PLATFORM'] = 'xcb'
@@ -18,7 +20,7 @@ class ColorTransparencyTool(QWidget):
         self.setAcceptDrops(True)
         self.input_path = None
         self.current_pil_img = None
-        self.history = [] 
+        self.history = UndoHistory()
 
     def initUI(self):
         # Pencere Başlığı Güncellendi
@@ -120,7 +122,7 @@ class ColorTransparencyTool(QWidget):
     def load_image(self, path):
         self.input_path = path
         self.current_pil_img = Image.open(path).convert("RGBA")
-        self.history = [] 
+        self.history.clear()
         self.btn_undo.setEnabled(False)
         self.btn_save.setEnabled(False)
         self.update_preview()
@@ -159,35 +161,34 @@ class ColorTransparencyTool(QWidget):
             self.color_preview.setStyleSheet(f"background-color: rgb{selected_rgb}; border: 1px solid white;")
             self.apply_transparency(*selected_rgb)
 
+    def build_color_mask(self, r_sel, g_sel, b_sel, tolerance):
+        """Seçilen renge tolerans içinde yakın, görünür pikseller için 'L' maske döndürür."""
+        r, g, b, a = self.current_pil_img.split()
+        mask = a.point(lambda v: 255 if v > 0 else 0)
+        for band, sel in ((r, r_sel), (g, g_sel), (b, b_sel)):
+            lut = [255 if abs(v - sel) <= tolerance else 0 for v in range(256)]
+            mask = ImageChops.darker(mask, band.point(lut))
+        return mask
+
     def apply_transparency(self, r_sel, g_sel, b_sel):
-        self.history.append(self.current_pil_img.copy())
+        tolerance = self.slider_tolerance.value()
+        mask = self.build_color_mask(r_sel, g_sel, b_sel, tolerance)
+        if mask.getbbox() is None: return
+
+        # Tam kopya yerine sadece değişen piksellerin maskesi saklanır
+        self.history.push_mask(self.current_pil_img, mask)
         self.btn_undo.setEnabled(True)
 
-        img = self.current_pil_img.copy()
-        data = img.getdata()
-        tolerance = self.slider_tolerance.value()
-        
-        new_data = []
-        for item in data:
-            if item[3] > 0 and (abs(item[0] - r_sel) <= tolerance and 
-                                abs(item[1] - g_sel) <= tolerance and 
-                                abs(item[2] - b_sel) <= tolerance):
-                new_data.append((255, 255, 255, 0))
-            else:
-                new_data.append(item)
-
-        img.putdata(new_data)
-        self.current_pil_img = img
+        self.current_pil_img.paste((255, 255, 255, 0), mask=mask)
         self.update_preview()
         self.btn_save.setEnabled(True)
 
     def undo_step(self):
-        if self.history:
-            self.current_pil_img = self.history.pop()
+        if self.history.undo(self.current_pil_img):
             self.update_preview()
-            if not self.history:
-                self.btn_undo.setEnabled(False)
-                self.btn_save.setEnabled(False)
+        if not self.history.can_undo():
+            self.btn_undo.setEnabled(False)
+            self.btn_save.setEnabled(False)
 
     def save_image(self):
         if not self.current_pil_img or not self.input_path: return
@@ -195,11 +196,7 @@ class ColorTransparencyTool(QWidget):
         dir_name = os.path.dirname(self.input_path)
         base_name = os.path.splitext(os.path.basename(self.input_path))[0]
         
-        counter = 1
-        final_path = os.path.join(dir_name, f"{base_name}_removed{counter}.png")
-        while os.path.exists(final_path):
-            counter += 1
-            final_path = os.path.join(dir_name, f"{base_name}_removed{counter}.png")
+        final_path = claim_unique_path(dir_name, f"{base_name}_removed", ".png")
 
         try:
             save_args = {"format": "PNG"}
@@ -212,6 +209,7 @@ class ColorTransparencyTool(QWidget):
             self.current_pil_img.save(final_path, **save_args)
             QMessageBox.information(self, "Saved", f"File saved to original folder:\n{os.path.basename(final_path)}")
         except Exception as e:
+            discard_claim(final_path)
             QMessageBox.critical(self, "Error", f"Save failed: {str(e)}")
 
 if __name__ == '__main__':
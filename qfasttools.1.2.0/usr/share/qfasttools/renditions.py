@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Tek çözmeden çok çıktı: her kaynak için (boyut, biçim, kalite) listesindeki
+tüm kopyaları (rendition) üretir.
+
+Kaynak bir kez açılır; JPEG'de çözücüye en büyük çıktının boyutu draft() ile
+bildirilir, böylece 2048 px'lik bir çıktı için 6000 px'lik fotoğraf tam
+çözülmez. Kopyalar büyükten küçüğe üretilir ve her küçültme orijinalden değil
+bir önceki (en yakın büyük) kopyadan yapılır. Dosyalar işçi süreçlerde
+paralel işlenir.
+"""
+import os
+from concurrent.futures import as_completed
+from PIL import Image, ImageOps
+from convertengine import to_target_mode, build_save_args
+from encoderprofiles import format_options
+from outputnames import claim_unique_path, discard_claim, atomic_path
+from workerpool import process_pool
+from resampling import DRAFT_FORMATS
+
+try:
+    import pillow_avif
+except ImportError:
+    pass
+
+DEFAULT_SPEC = "2048:JPEG:85, 1024:WebP:80, 256:AVIF:50"
+FORMAT_NAMES = {"jpg": "JPEG", "jpeg": "JPEG", "webp": "WebP", "avif": "AVIF", "png": "PNG"}
+EXTENSIONS = {"JPEG": ".jpg", "WebP": ".webp", "AVIF": ".avif", "PNG": ".png"}
+
+
+class Rendition:
+    """Uzun kenarı size piksel olan bir çıktı (büyütme yapılmaz)."""
+    def __init__(self, size, fmt, quality):
+        self.size = size
+        self.fmt = fmt
+        self.quality = quality
+
+    def __repr__(self):
+        return f"{self.size}:{self.fmt}:{self.quality}"
+
+
+def parse_spec(spec):
+    """'2048:jpeg:85, 1024:webp:80' biçimindeki listeyi okur. Kalite isteğe bağlıdır (85)."""
+    renditions = []
+    for part in spec.replace(";", ",").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        fields = [f.strip() for f in part.split(":")]
+        if len(fields) not in (2, 3):
+            raise ValueError(f"Invalid rendition '{part}', expected size:format[:quality]")
+        fmt = FORMAT_NAMES.get(fields[1].lower())
+        if fmt is None:
+            raise ValueError(f"Unsupported rendition format '{fields[1]}'")
+        size = int(fields[0])
+        quality = int(fields[2]) if len(fields) == 3 else 85
+        if size < 1 or not 1 <= quality <= 100:
+            raise ValueError(f"Invalid size or quality in '{part}'")
+        renditions.append(Rendition(size, fmt, quality))
+    if not renditions:
+        raise ValueError("No renditions specified")
+    return renditions
+
+
+def fit_long_edge(size, long_edge):
+    w, h = size
+    scale = min(1.0, long_edge / max(w, h))
+    return max(1, round(w * scale)), max(1, round(h * scale))
+
+
+def open_source(path, largest):
+    """Kaynağı en büyük çıktıya yetecek çözünürlükte açar ve EXIF yönünü uygular."""
+    img = Image.open(path)
+    if img.format in DRAFT_FORMATS:
+        # draft istenen boyuttan küçük olmayan en yakın 1/2, 1/4, 1/8 ölçeği seçer
+        # (EXIF yönü en/boyu değiştirse de uzun kenar aynıdır)
+        img.draft(img.mode, fit_long_edge(img.size, largest))
+    # exif_transpose, döndürülmüş kopyanın EXIF'inden yön etiketini de kaldırır
+    return ImageOps.exif_transpose(img)
+
+
+def render_file(path, jobs, keep_exif=True):
+    """İşçi süreçte çalışır: [(Rendition, hedef)] listesini üretir, [(hedef, hata)] döndürür."""
+    results = []
+    try:
+        largest = max(r.size for r, _ in jobs)
+        current = open_source(path, largest)
+        exif = current.info.get("exif") if keep_exif else None
+    except Exception as e:
+        return [(dst, str(e)) for _, dst in jobs]
+
+    resized = {}
+    # Büyükten küçüğe: her küçültme bir önceki kopyadan yapılır
+    for rendition, dst in sorted(jobs, key=lambda job: -job[0].size):
+        try:
+            target = fit_long_edge(current.size, rendition.size)
+            if target not in resized:
+                if target != current.size:
+                    current = current.resize(target, Image.LANCZOS, reducing_gap=3.0)
+                resized[target] = current
+            img = to_target_mode(resized[target], rendition.fmt)
+            save_args = build_save_args(rendition.fmt, rendition.quality, exif,
+                                        format_options(None, rendition.fmt))
+            with atomic_path(dst) as tmp:
+                img.save(tmp, **save_args)
+            results.append((dst, None))
+        except Exception as e:
+            results.append((dst, str(e)))
+    return results
+
+
+def plan_outputs(path, renditions, out_dir=None):
+    """Her kopya için çıktı adını ana süreçte rezerve eder: photo_1024.webp gibi."""
+    directory = out_dir or os.path.dirname(path)
+    base = os.path.splitext(os.path.basename(path))[0]
+    return [(r, claim_unique_path(directory, f"{base}_{r.size}", EXTENSIONS[r.fmt], sep="_", bare_first=True))
+            for r in renditions]
+
+
+def output_patterns(renditions):
+    """plan_outputs() adlarının kalıpları; kaynak klasörü tekrar tarandığında girdi sayılmazlar."""
+    patterns = []
+    for r in renditions:
+        ext = EXTENSIONS[r.fmt]
+        patterns += [f"*_{r.size}{ext}", f"*_{r.size}_[0-9]*{ext}"]
+    return patterns
+
+
+def render_batch(paths, renditions, out_dir=None, keep_exif=True, max_workers=None, progress=None):
+    """Her kaynak dosya bir işçi görevidir. (yazılan kopya sayısı, [(hedef, hata)]) döndürür.
+
+    progress(done, total) her dosya bittiğinde ana süreçte çağrılır.
+    """
+    written, failures = 0, []
+    total = len(paths)
+    with process_pool(max_workers) as pool:
+        futures = [pool.submit(render_file, path, plan_outputs(path, renditions, out_dir), keep_exif)
+                   for path in paths]
+        for done, future in enumerate(as_completed(futures), 1):
+            for dst, error in future.result():
+                if error is None:
+                    written += 1
+                else:
+                    discard_claim(dst)
+                    failures.append((dst, error))
+            if progress:
+                progress(done, total)
+    return written, failures
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Resize aracı için yeniden örnekleme motoru ve filtre kıyaslaması.
+
+Büyük küçültmelerde LANCZOS'u tam çözünürlükten çalıştırmak gereksizdir:
+JPEG çözücüsü draft() ile hedefin birkaç katına yetecek DCT ölçeğinde
+(1/2, 1/4, 1/8) çözer, ardından Image.reduce() tam katlı kutu ön-küçültmesi yapar
+(resize(reducing_gap=...)) ve son LANCZOS geçişi hedefin sadece birkaç katı
+büyüklükteki resim üzerinde çalışır. Bu modül Qt içermez.
+"""
+import math
+import time
+from PIL import Image, ImageChops, ImageStat
+
+FILTERS = {
+    "Lanczos": Image.LANCZOS,
+    "Bicubic": Image.BICUBIC,
+    "Hamming": Image.HAMMING,
+    "Bilinear": Image.BILINEAR,
+    "Box": Image.BOX,
+    "Nearest": Image.NEAREST,
+}
+DEFAULT_FILTER = "Lanczos"
+# reduce() sonrası resim hedefin en az bu katı kalır; 3 ve üstünde sonuç tam
+# çözünürlükten örneklemeden gözle ayırt edilemez
+REDUCING_GAP = 3.0
+# draft() destekleyen biçimler; MPO, ek önizleme kareli fotoğraf makinesi JPEG'idir
+DRAFT_FORMATS = ('JPEG', 'MPO')
+BENCHMARK_FACTOR = 4
+
+
+def resize_image(img, size, method=Image.LANCZOS, fast=True):
+    """Açılmış (henüz yüklenmemiş) resmi size boyutuna getirir.
+
+    fast açıkken JPEG hedefe yetecek en küçük DCT ölçeğinde çözülür ve
+    reduce() ön-küçültmesi yapılır. NEAREST (piksel sanatı) her zaman tam
+    çözünürlükten örneklenir.
+    """
+    if not fast or method == Image.NEAREST:
+        return img.resize(size, method)
+    if img.format in DRAFT_FORMATS:
+        # Image.thumbnail gibi hedefin REDUCING_GAP katına kadar çözülür; küçültmenin
+        # son (en az 3 katlık) kısmını DCT ölçekleyicisi değil seçilen filtre yapar
+        img.draft(img.mode, (int(size[0] * REDUCING_GAP), int(size[1] * REDUCING_GAP)))
+    return img.resize(size, method, reducing_gap=REDUCING_GAP)
+
+
+def psnr(a, b):
+    """İki resim arasındaki PSNR (dB); aynıysa inf."""
+    diff = ImageChops.difference(a.convert('RGB'), b.convert('RGB'))
+    mse = sum(ImageStat.Stat(diff).sum2) / (diff.width * diff.height * 3)
+    return math.inf if mse == 0 else 10 * math.log10(255 ** 2 / mse)
+
+
+class BenchmarkResult:
+    def __init__(self, name, fast):
+        self.name = name
+        self.fast = fast
+        self.seconds = 0.0
+        self.megapixels = 0.0
+        self.scores = []
+
+    @property
+    def label(self):
+        return f"{self.name} ({'draft+reduce' if self.fast else 'full'})"
+
+    @property
+    def throughput(self):
+        return self.megapixels / self.seconds if self.seconds else 0.0
+
+    @property
+    def mean_psnr(self):
+        finite = [s for s in self.scores if s != math.inf]
+        if not finite:
+            return math.inf
+        return sum(finite) / len(finite)
+
+
+def _timed_resize(path, factor, method, fast):
+    start = time.perf_counter()
+    with Image.open(path) as img:
+        size = (max(1, img.width // factor), max(1, img.height // factor))
+        megapixels = img.width * img.height / 1e6
+        out = resize_image(img, size, method, fast)
+    return out, time.perf_counter() - start, megapixels
+
+
+def benchmark(paths, factor=BENCHMARK_FACTOR, progress=None):
+    """Her filtreyi tam çözünürlük ve draft+reduce yollarıyla dosyalar üzerinde çalıştırır.
+
+    Süre, dosyayı açma ve çözmeyi de içerir (draft'ın kazancı oradadır).
+    Kalite, tam çözünürlükten LANCZOS sonucuna göre PSNR olarak ölçülür.
+    progress(done, total) her dosya bittiğinde çağrılır.
+    """
+    results = [BenchmarkResult(name, fast) for name in FILTERS for fast in (False, True)
+               if not (fast and FILTERS[name] == Image.NEAREST)]
+    for done, path in enumerate(paths, 1):
+        reference = None
+        for result in results:
+            out, seconds, megapixels = _timed_resize(path, factor, FILTERS[result.name], result.fast)
+            if reference is None:
+                reference = out  # ilk sıradaki: LANCZOS, tam çözünürlük
+            result.seconds += seconds
+            result.megapixels += megapixels
+            result.scores.append(psnr(reference, out))
+        if progress:
+            progress(done, len(paths))
+    return results
+
+
+def format_benchmark(results):
+    lines = [f"{'mode':<26} {'MP/s':>7} {'PSNR':>8}"]
+    for r in sorted(results, key=lambda r: -r.throughput):
+        score = "ref" if r.mean_psnr == math.inf else f"{r.mean_psnr:.1f} dB"
+        lines.append(f"{r.label:<26} {r.throughput:>7.1f} {score:>8}")
+    return "\n".join(lines)
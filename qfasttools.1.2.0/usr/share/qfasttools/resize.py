@@ -2,12 +2,20 @@
 
 import sys
 import os
+import html
 from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, 
                              QLabel, QLineEdit, QRadioButton, QPushButton, 
-                             QGroupBox, QMessageBox, QCheckBox, QFrame, QGridLayout)
+                             QGroupBox, QMessageBox, QCheckBox, QFrame, QGridLayout, QComboBox)
 from PyQt5.QtGui import QIcon, QPalette, QColor
 from PyQt5.QtCore import Qt
-from PIL import Image
+import ssimquality
+import renditions
+import resampling
+import sizeplan
+import batchresize
+import discovery
+from resizemanifest import ResizeManifest
+from jobjournal import JobJournal
 
 # Debian/Pardus grafik uyumluluğu
 os.environ['QT_QPA_PLATFORM'] = 'xcb'
@@ -107,6 +115,34 @@ class QFastResizer(QWidget):
         self.edit_percent.setPlaceholderText("Example: 50")
         grid_layout.addWidget(self.edit_percent, 2, 1)
 
+        # Boyut planı: kenar/kutu kipleri ve büyütmeme; toplu iş önce başlıklardan planlanır
+        self.sizing_modes = {
+            "Exact (width / height)": sizeplan.EXACT,
+            "Long edge = width": sizeplan.LONG_EDGE,
+            "Short edge = width": sizeplan.SHORT_EDGE,
+            "Fit in box": sizeplan.FIT,
+            "Fill box & center crop": sizeplan.FILL,
+        }
+        grid_layout.addWidget(QLabel("Sizing:"), 6, 0)
+        self.combo_sizing = QComboBox()
+        self.combo_sizing.addItems(list(self.sizing_modes))
+        grid_layout.addWidget(self.combo_sizing, 6, 1)
+        self.cb_no_upscale = QCheckBox("Never upscale")
+        grid_layout.addWidget(self.cb_no_upscale, 7, 0)
+        self.btn_preview = QPushButton("Preview Plan")
+        self.btn_preview.setToolTip("Reads only image headers and lists every output size before any pixel work.")
+        self.btn_preview.clicked.connect(self.preview_plan)
+        grid_layout.addWidget(self.btn_preview, 7, 1)
+
+        # Rendition Mode: tek çözmeyle birden çok boyut/biçim çıktısı
+        self.rb_renditions = QRadioButton("Rendition Mode (size:format:quality, ...)")
+        self.rb_renditions.toggled.connect(self.toggle_modes)
+        grid_layout.addWidget(self.rb_renditions, 8, 0, 1, 2)
+        self.edit_renditions = QLineEdit(renditions.DEFAULT_SPEC)
+        self.edit_renditions.setToolTip("Long edge in px, JPEG/WebP/AVIF/PNG, quality. "
+                                        "Each source is decoded once; smaller outputs are scaled from larger ones.")
+        grid_layout.addWidget(self.edit_renditions, 9, 0, 1, 2)
+
         main_layout.addWidget(options_frame)
 
         # Metaveri kutucuğu
@@ -115,15 +151,32 @@ class QFastResizer(QWidget):
         self.cb_keep_exif.setStyleSheet("margin-left: 5px; font-weight: bold; color: #aaaaaa;")
         main_layout.addWidget(self.cb_keep_exif)
 
+        # Algısal kalite: JPEG/WebP/AVIF çıktılarda SSIM hedefini karşılayan en düşük kalite
+        self.cb_auto_quality = QCheckBox(f"Auto Quality (SSIM ≥ {ssimquality.DEFAULT_SSIM_TARGET})")
+        self.cb_auto_quality.setStyleSheet("margin-left: 5px; font-weight: bold; color: #aaaaaa;")
+        if not ssimquality.is_available():
+            self.cb_auto_quality.setEnabled(False)
+            self.cb_auto_quality.setToolTip("Requires NumPy (python3-numpy).")
+        main_layout.addWidget(self.cb_auto_quality)
+
         # Resampling Ayarı
         resampling_group = QGroupBox("Resampling Method")
         resampling_group.setStyleSheet("QGroupBox { color: #aaaaaa; }")
         resampling_layout = QHBoxLayout()
-        self.rb_smooth = QRadioButton("Smooth (LANCZOS)")
-        self.rb_smooth.setChecked(True)
-        self.rb_pixel = QRadioButton("Pixelated (NEAREST)")
-        resampling_layout.addWidget(self.rb_smooth)
-        resampling_layout.addWidget(self.rb_pixel)
+        self.combo_filter = QComboBox()
+        self.combo_filter.addItems(list(resampling.FILTERS))
+        self.combo_filter.setCurrentText(resampling.DEFAULT_FILTER)
+        self.combo_filter.setToolTip("Nearest keeps hard pixel edges (pixel art).")
+        # JPEG draft() + reduce() ön-küçültmesi; büyük küçültmelerde birkaç kat hızlı
+        self.cb_fast = QCheckBox("Fast downscale")
+        self.cb_fast.setChecked(True)
+        self.cb_fast.setToolTip("Decodes JPEG at the nearest DCT scale and box-reduces before the final filter.")
+        self.btn_benchmark = QPushButton("Benchmark")
+        self.btn_benchmark.setToolTip("Compares speed and quality of every filter on the dropped images (1/4 size).")
+        self.btn_benchmark.clicked.connect(self.run_benchmark)
+        resampling_layout.addWidget(self.combo_filter)
+        resampling_layout.addWidget(self.cb_fast)
+        resampling_layout.addWidget(self.btn_benchmark)
         resampling_group.setLayout(resampling_layout)
         main_layout.addWidget(resampling_group)
 
@@ -157,12 +210,18 @@ class QFastResizer(QWidget):
     def toggle_modes(self):
         self.update_ui_states()
         if self.rb_resolution.isChecked(): self.edit_percent.clear()
-        else: self.edit_width.clear(); self.edit_height.clear()
+        elif self.rb_percent.isChecked(): self.edit_width.clear(); self.edit_height.clear()
 
     def update_ui_states(self):
         res_active = self.rb_resolution.isChecked()
         self.edit_width.setEnabled(res_active); self.edit_height.setEnabled(res_active)
-        self.cb_keep_ratio.setEnabled(res_active); self.edit_percent.setEnabled(not res_active)
+        self.cb_keep_ratio.setEnabled(res_active); self.edit_percent.setEnabled(self.rb_percent.isChecked())
+        rendition_active = self.rb_renditions.isChecked()
+        self.edit_renditions.setEnabled(rendition_active)
+        self.combo_sizing.setEnabled(res_active)
+        self.cb_no_upscale.setEnabled(not rendition_active); self.btn_preview.setEnabled(not rendition_active)
+        self.cb_auto_quality.setEnabled(not rendition_active and ssimquality.is_available())
+        self.combo_filter.setEnabled(not rendition_active); self.cb_fast.setEnabled(not rendition_active)
 
     def reset_ui(self):
         self.selected_files = []
@@ -177,61 +236,115 @@ class QFastResizer(QWidget):
         self.selected_files = [u.toLocalFile() for u in event.mimeData().urls()]
         if self.selected_files: self.update_drop_label_info()
 
-    def get_unique_path(self, directory, base_name, extension):
-        counter = 0
-        while True:
-            candidate = f"{base_name}_resized{f'_{counter}' if counter > 0 else ''}{extension}"
-            full_path = os.path.join(directory, candidate)
-            if not os.path.exists(full_path): return full_path
-            counter += 1
+    def process_renditions(self, spec, keep_exif=True):
+        try:
+            wanted = renditions.parse_spec(spec)
+            self.btn_do.setEnabled(False)
+            QApplication.processEvents()
+
+            def on_progress(done, total):
+                self.drop_label.setText(f"\n\nRendering {done}/{total}...\n\n")
+                QApplication.processEvents()
+
+            written, failures = renditions.render_batch(self.selected_files, wanted, None, keep_exif,
+                                                        progress=on_progress)
+            report = [f"{written} renditions written from {len(self.selected_files)} images."]
+            report += [f"{os.path.basename(dst)}: {error}" for dst, error in failures[:10]]
+            QMessageBox.information(self, "Success", "\n".join(report))
+        except Exception as e:
+            QMessageBox.critical(self, "Error", str(e))
+        finally:
+            self.btn_do.setEnabled(True)
+            self.reset_ui()
+
+    def gui_options(self):
+        if self.rb_resolution.isChecked():
+            w, h = self.edit_width.text(), self.edit_height.text()
+            sizing, width, height, percent = self.sizing_modes[self.combo_sizing.currentText()], \
+                int(w) if w else None, int(h) if h else None, None
+        else:
+            p = self.edit_percent.text()
+            sizing, width, height, percent = sizeplan.PERCENT, None, None, int(p) if p else None
+        return batchresize.ResizeOptions(
+            sizing, width, height, percent, self.cb_keep_ratio.isChecked(), self.cb_no_upscale.isChecked(),
+            resampling.FILTERS[self.combo_filter.currentText()], self.cb_fast.isChecked(),
+            self.cb_keep_exif.isChecked(),
+            ssimquality.DEFAULT_SSIM_TARGET if self.cb_auto_quality.isChecked() else None)
+
+    def preview_plan(self):
+        if not self.selected_files:
+            QMessageBox.warning(self, "Error", "No images selected!")
+            return
+        try:
+            plan = sizeplan.make_plan(self.selected_files, *self.gui_options().plan_args())
+        except ValueError as e:
+            QMessageBox.warning(self, "Warning", str(e))
+            return
+        box = QMessageBox(QMessageBox.Information, "Resize Plan", plan.summary(), parent=self)
+        lines = [item.describe() for item in plan.items]
+        lines += [f"{os.path.basename(path)}: {error}" for path, error in plan.errors]
+        box.setDetailedText("\n".join(lines))
+        box.exec_()
+
+    def process_image(self):
+        if not self.selected_files:
+            QMessageBox.warning(self, "Error", "No images selected!")
+            return
+        if self.rb_renditions.isChecked():
+            self.process_renditions(self.edit_renditions.text(), keep_exif=self.cb_keep_exif.isChecked())
+            return
+
+        try:
+            try:
+                opts = self.gui_options()
+                plan = sizeplan.make_plan(self.selected_files, *opts.plan_args())
+            except ValueError as e:
+                QMessageBox.warning(self, "Warning", str(e))
+                return
+
+            self.btn_do.setEnabled(False)
+            report = [f"{os.path.basename(path)}: {error}" for path, error in plan.errors]
+            done = []
+
+            def on_result(path, out_path, line, error):
+                if error: report.append(f"{os.path.basename(path)}: {error}")
+                elif line: report.append(line)
+                done.append(path)
+                self.drop_label.setText(f"\n\nResizing {len(done)}/{len(plan.items)}...\n\n")
+                QApplication.processEvents()
+
+            # Plan en büyük dosyadan küçüğe sıralıdır; işçiler büyük dosyalardan başlar
+            batchresize.run_plan(plan, opts, on_result=on_result)
+            QMessageBox.information(self, "Success", "\n".join(["Processing complete!"] + report))
+        except Exception as e:
+            QMessageBox.critical(self, "Error", str(e))
+        finally:
+            self.btn_do.setEnabled(True)
+            self.reset_ui()
 
-    def process_image(self, silent=False, cli_params=None):
+    def run_benchmark(self):
         if not self.selected_files:
-            if not silent: QMessageBox.warning(self, "Error", "No images selected!")
+            QMessageBox.warning(self, "Error", "Drop a few camera images to benchmark first!")
             return
+        self.btn_benchmark.setEnabled(False)
+        QApplication.processEvents()
+
+        def on_progress(done, total):
+            self.drop_label.setText(f"\n\nBenchmarking {done}/{total}...\n\n")
+            QApplication.processEvents()
 
         try:
-            if cli_params:
-                mode, w, h, target_dir, keep_exif = cli_params
-                method = Image.LANCZOS
-            else:
-                mode = "r" if self.rb_resolution.isChecked() else "p"
-                w = self.edit_width.text()
-                h = self.edit_height.text()
-                perc = self.edit_percent.text()
-                method = Image.LANCZOS if self.rb_smooth.isChecked() else Image.NEAREST
-                target_dir = None
-                keep_exif = self.cb_keep_exif.isChecked()
-                if mode == "r" and not (w or h):
-                    QMessageBox.warning(self, "Warning", "Please enter width or height!")
-                    return
-
-            for file_path in self.selected_files:
-                img = Image.open(file_path)
-                orig_w, orig_h = img.size
-                exif_data = img.info.get('exif') if keep_exif else None
-
-                if mode == "r":
-                    new_w = int(w) if w else orig_w
-                    new_h = int(h) if h else int(orig_h * (new_w / orig_w))
-                else:
-                    val = perc if not cli_params else w
-                    p = int(val) / 100
-                    new_w, new_h = int(orig_w * p), int(orig_h * p)
-
-                save_dir = target_dir if target_dir else os.path.dirname(file_path)
-                base_name, ext = os.path.splitext(os.path.basename(file_path))
-                out_path = self.get_unique_path(save_dir, base_name, ext)
-
-                resized = img.resize((new_w, new_h), method)
-                resized.save(out_path, exif=exif_data) if exif_data else resized.save(out_path)
-
-            if not silent: QMessageBox.information(self, "Success", "Processing complete!")
+            results = resampling.benchmark(self.selected_files, progress=on_progress)
+            box = QMessageBox(QMessageBox.Information, "Resampling Benchmark",
+                              f"{len(self.selected_files)} images downscaled to 1/{resampling.BENCHMARK_FACTOR}. "
+                              "PSNR is measured against full-resolution Lanczos.", parent=self)
+            box.setInformativeText(f"<pre>{html.escape(resampling.format_benchmark(results))}</pre>")
+            box.exec_()
         except Exception as e:
-            if not silent: QMessageBox.critical(self, "Error", str(e))
-            else: print(f"CLI Error: {e}")
+            QMessageBox.critical(self, "Error", str(e))
         finally:
-            if not silent: self.reset_ui()
+            self.btn_benchmark.setEnabled(True)
+            self.update_drop_label_info()
 
     def show_about(self):
         about_msg = QMessageBox(self)
@@ -268,22 +381,55 @@ def print_help():
     help_text = """
 QFast Image Resizer - CLI Help Guide
 ------------------------------------
-Usage: qfast [mode] [parameters] [source_file] [target_directory(optional)]
+Usage: qfast [mode] [parameters] [inputs...] [target_directory(optional)]
 
 Modes:
   r : Resolution Mode (Pixel based)
   p : Percent Mode (Percentage based)
+  f : Rendition Mode (one decode, several size:format:quality outputs)
+
+Inputs:
+  FILE          : An image file
+  DIRECTORY     : Every image in the directory and its subdirectories
+  'GLOB'        : A quoted pattern, e.g. 'shots/**/*.jpg'
+  -             : NUL separated paths from stdin (e.g., find ... -print0 | qfast ...)
+  A last directory after one or more FILEs is the target directory. With directory,
+  glob or stdin inputs every directory is an input; use -o DIR for the target.
 
 Parameters:
   wXXX : Set Width (e.g., w800) or Percentage (e.g., w50)
   hXXX : Set Height (e.g., h600) - Only for Resolution Mode
   m    : Keep Metadata (EXIF)
+  long / short : Resolution Mode, wXXX is the long / short edge
+  fit / fill   : Resolution Mode, fit inside or fill (center crop) the wXXX x hXXX box
+  nu   : Never upscale
+  sXX  : Auto quality for JPEG/WebP/AVIF, lowest quality with SSIM >= XX% (e.g., s98)
+  SIZE:FORMAT[:QUALITY],... : Rendition list for mode f (e.g., 2048:jpeg:85,1024:webp:80)
+  -o DIR, --output DIR     : Target directory (created if missing)
+  -j N, --jobs N           : Parallel worker processes (default: CPU count)
+  --include PAT            : Only files whose name or path matches PAT (repeatable)
+  --exclude PAT            : Skip files whose name or path matches PAT (repeatable)
+  --incremental            : Skip inputs unchanged since the last run with the same parameters;
+                             changed inputs overwrite their previous output instead of a new _01 copy
+  --manifest FILE          : Manifest for --incremental (default: ~/.cache/qfasttools/resize-manifest.sqlite3)
+  --journal FILE           : Job journal; rerun the same command after a crash to resume where it stopped.
+                             Removed when every file succeeded.
 
 Examples:
   qfast r w800 photo.jpg           -> Resize photo to 800px width (aspect ratio kept)
   qfast r w1920 h1080 m photo.jpg  -> Resize to 1920x1080 and keep metadata
   qfast p w50 photo.jpg            -> Resize photo to 50% of its original size
   qfast r w400 photo.jpg /tmp/     -> Resize and save to /tmp directory
+  qfast r long w2048 nu photo.jpg  -> Long edge 2048px, smaller images are left as they are
+  qfast r fill w1080 h1080 photo.jpg -> 1080x1080 square, center cropped
+  qfast p w50 s98 photo.jpg        -> Resize to 50% with the smallest quality keeping SSIM >= 0.98
+  qfast f 2048:jpeg:85,1024:webp:80,256:avif:50 m photo.jpg /tmp/
+                                   -> JPEG 2048px, WebP 1024px and AVIF 256px from one decode
+  qfast r long w1600 -j 8 --exclude '*_resized*' ~/Pictures -o /tmp/web
+                                   -> Whole tree, 8 processes, skip earlier outputs
+  find . -name '*.png' -print0 | qfast p w50 -
+  qfast r long w1600 --incremental ~/Pictures -o /srv/web
+                                   -> Nightly re-sync, only new or changed photos are processed
 ------------------------------------
 Author: A. Serhat KILICOGLU (shampuan)
     """
@@ -296,39 +442,103 @@ def run_cli(args):
             return
 
         mode = args[0].lower()
-        if mode not in ['r', 'p']:
-            raise Exception("Invalid mode! Use 'r' for Resolution or 'p' for Percent.")
-
-        width = None; height = None; source = None; target = None; keep_exif = False
-
-        for arg in args[1:]:
+        if mode not in ['r', 'p', 'f']:
+            raise Exception("Invalid mode! Use 'r' for Resolution, 'p' for Percent or 'f' for Renditions.")
+
+        width = None; height = None; target = None; keep_exif = False; ssim_target = None
+        spec = None; sizing = sizeplan.EXACT; no_upscale = False
+        inputs = []; jobs = None; include = []; exclude = []; incremental = False; manifest_path = None
+        journal_path = None
+        cli_sizing = {'long': sizeplan.LONG_EDGE, 'short': sizeplan.SHORT_EDGE, 'fit': sizeplan.FIT,
+                      'fill': sizeplan.FILL}
+
+        rest = iter(args[1:])
+        def take_value(option):
+            v = next(rest, None)
+            if v is None: raise Exception(f"{option} needs a value.")
+            return v
+
+        for arg in rest:
             a = arg.lower()
-            if a.startswith('w'): width = a.replace('w', '')
+            if a in ['-j', '--jobs']: jobs = int(take_value(arg))
+            elif a in ['-o', '--output']: target = take_value(arg)
+            elif a == '--include': include.append(take_value(arg))
+            elif a == '--exclude': exclude.append(take_value(arg))
+            elif a == '--incremental': incremental = True
+            elif a == '--manifest': manifest_path = take_value(arg); incremental = True
+            elif a == '--journal': journal_path = take_value(arg)
+            # Var olan yol ve glob kalıbı her zaman girdidir (ör. "wallpapers" klasörü genişlik değildir)
+            elif arg == '-' or os.path.exists(arg) or any(c in arg for c in discovery.GLOB_CHARS): inputs.append(arg)
+            elif a in cli_sizing: sizing = cli_sizing[a]
+            elif a == 'nu': no_upscale = True
+            elif ':' in a: spec = arg
+            elif a.startswith('w'): width = a.replace('w', '')
             elif a.startswith('h'): height = a.replace('h', '')
             elif a == 'm': keep_exif = True
-            elif os.path.isfile(arg): source = arg
-            elif os.path.isdir(arg): target = arg
-
-        if not source:
+            elif a.startswith('s') and a[1:].replace('.', '', 1).isdigit():
+                value = float(a[1:])
+                ssim_target = value / 100 if value > 1 else value
+            else: raise Exception(f"Unknown parameter or missing file: {arg}")
+
+        # Eski kullanım: dosyalardan sonra gelen klasör hedef klasördür. Girdiler arasında
+        # klasör ya da kalıp varsa son klasör de girdidir; hedef sadece -o ile verilir.
+        if (target is None and len(inputs) > 1 and os.path.isdir(inputs[-1])
+                and all(os.path.isfile(arg) for arg in inputs[:-1])):
+            target = inputs.pop()
+        if not inputs:
             raise Exception("Source file not found or not specified.")
+        if target: os.makedirs(target, exist_ok=True)
+
+        if mode == 'f':
+            wanted = renditions.parse_spec(spec or renditions.DEFAULT_SPEC)
+            paths = discovery.iter_inputs(inputs, include, exclude, skip=renditions.output_patterns(wanted))
+            written, failures = renditions.render_batch(list(paths), wanted, target, keep_exif, max_workers=jobs)
+            for dst, error in failures: print(f"FAILED {dst}: {error}")
+            print(f"SUCCESS: {written} renditions written")
+            return
         if not width:
             raise Exception("Width or Percentage (wXXX) must be specified.")
-        
-        app = QApplication(sys.argv)
-        app.setStyle("Fusion")
-        logic = QFastResizer(cli_files=[source])
-        logic.process_image(silent=True, cli_params=(mode, width, height, target, keep_exif))
-        print(f"SUCCESS: Processed {os.path.basename(source)}")
+
+        if mode == 'p':
+            opts = batchresize.ResizeOptions(sizeplan.PERCENT, percent=int(width), no_upscale=no_upscale)
+        else:
+            opts = batchresize.ResizeOptions(sizing, int(width), int(height) if height else None,
+                                             no_upscale=no_upscale)
+        opts.keep_exif = keep_exif
+        opts.ssim_target = ssim_target
+        opts.target_dir = target
+        paths = discovery.iter_inputs(inputs, include, exclude, skip=batchresize.OUTPUT_PATTERNS)
+
+        def on_result(path, out_path, report, error):
+            if error: print(f"FAILED {path}: {error}")
+            else: print(report or f"OK {path} -> {out_path}")
+
+        manifest = ResizeManifest(manifest_path) if incremental else None
+        journal = JobJournal(journal_path) if journal_path else None
+        if journal and journal.resumed:
+            print(f"Resuming: {journal.resumed} images already done")
+        try:
+            ok, failed, skipped = batchresize.run_stream(paths, opts, jobs, on_result, manifest, journal)
+        finally:
+            if manifest: manifest.close()
+            if journal: journal.close()
+        print(f"SUCCESS: Processed {ok} images" + (f", {skipped} skipped" if skipped else "")
+              + (f", {failed} failed" if failed else ""))
+        if journal:
+            print("\n".join(journal.throughput_report()))
+            # Hatasız biten işin günlüğüne gerek kalmaz; hatalıysa tekrar çalıştırma sadece kalanları yapar
+            if not failed: journal.remove()
     except Exception as e:
         print(f"CLI Error: {e}")
         print("Type 'qfast help' for usage instructions.")
 
 if __name__ == '__main__':
-    app = QApplication(sys.argv)
-    app.setStyle("Fusion") # Dark theme desteği için Fusion stili şarttır
-    if len(sys.argv) > 1 and (sys.argv[1].lower() in ['r', 'p', 'help', '-h', '--help']):
+    # Komut satırı kipi Qt penceresi açmaz; ekransız sunucularda da çalışır
+    if len(sys.argv) > 1 and (sys.argv[1].lower() in ['r', 'p', 'f', 'help', '-h', '--help']):
         run_cli(sys.argv[1:])
     else:
+        app = QApplication(sys.argv)
+        app.setStyle("Fusion") # Dark theme desteği için Fusion stili şarttır
         files = sys.argv[1:] if len(sys.argv) > 1 else None
         ex = QFastResizer(cli_files=files)
         ex.show()
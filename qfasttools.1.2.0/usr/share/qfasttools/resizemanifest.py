@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Artımlı toplu boyutlandırma için manifesto (~/.cache/qfasttools/resize-manifest.sqlite3).
+
+Her kayıt: kaynak yolu + ayar özeti -> boyut, mtime, içerik özeti ve çıktı
+yolu. Tekrar çalıştırmada boyutu ve mtime'ı aynı, çıktısı yerinde duran
+kaynak hiç açılmaz. Sadece mtime değişmişse (dokunulmuş, kopyalanmış dosya)
+içerik özeti karşılaştırılır; içerik aynıysa yeniden işlenmez. Değişen
+kaynakların çıktısı yeni bir _01 kopyası yerine aynı çıktı yoluna yeniden
+yazılır.
+"""
+import os
+import json
+import sqlite3
+import hashlib
+import threading
+from cachedir import user_cache_dir
+
+# Boyutlandırma davranışı değişirse eski kayıtlar eşleşmesin
+MANIFEST_VERSION = 1
+
+
+def params_key(settings):
+    """Ayar sözlüğünün kısa özeti; sıralama ve sayı/yol biçimi sabit tutulur."""
+    text = json.dumps(settings, sort_keys=True, default=str)
+    return hashlib.blake2b(f"{MANIFEST_VERSION}:{text}".encode('utf-8'), digest_size=12).hexdigest()
+
+
+class ManifestEntry:
+    def __init__(self, size, mtime_ns, digest, output):
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.digest = digest
+        self.output = output
+
+    def same_stat(self, st):
+        return self.size == st.st_size and self.mtime_ns == st.st_mtime_ns
+
+
+class ResizeManifest:
+    def __init__(self, path=None):
+        self.path = path or os.path.join(user_cache_dir(), 'resize-manifest.sqlite3')
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+        with self._lock, self.db:
+            self.db.execute("PRAGMA journal_mode=WAL")
+            # WAL'de NORMAL güvenlidir; her kayıtta fsync beklenmez
+            self.db.execute("PRAGMA synchronous=NORMAL")
+            self.db.execute("CREATE TABLE IF NOT EXISTS entries ("
+                            "source TEXT NOT NULL, params TEXT NOT NULL, size INTEGER NOT NULL, "
+                            "mtime_ns INTEGER NOT NULL, digest TEXT NOT NULL, output TEXT NOT NULL, "
+                            "PRIMARY KEY (source, params))")
+            self.db.execute("CREATE INDEX IF NOT EXISTS entries_output ON entries(output)")
+
+    def close(self):
+        with self._lock:
+            self.db.close()
+
+    def lookup(self, source, params):
+        with self._lock:
+            row = self.db.execute("SELECT size, mtime_ns, digest, output FROM entries "
+                                  "WHERE source = ? AND params = ?", (source, params)).fetchone()
+        return ManifestEntry(*row) if row else None
+
+    def is_output(self, path):
+        """Yol daha önceki bir çalıştırmanın çıktısı mı? (çıktı kaynak klasörüne yazıldıysa
+        bir sonraki taramada girdi sanılmasın)"""
+        with self._lock:
+            return self.db.execute("SELECT 1 FROM entries WHERE output = ? LIMIT 1", (path,)).fetchone() is not None
+
+    def record(self, source, params, st, digest, output):
+        with self._lock, self.db:
+            self.db.execute("INSERT OR REPLACE INTO entries (source, params, size, mtime_ns, digest, output) "
+                            "VALUES (?, ?, ?, ?, ?, ?)",
+                            (source, params, st.st_size, st.st_mtime_ns, digest, output))
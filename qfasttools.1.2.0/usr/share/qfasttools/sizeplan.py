@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Resize aracı için toplu boyut planlayıcısı.
+
+Tüm dosyaların boyutları piksel çözülmeden, sadece başlıktan okunur ve her
+dosyanın çıktı boyutu (gerekirse kırpma kutusu) işe başlamadan hesaplanır.
+Böylece toplu iş önizlenebilir, süresi tahmin edilebilir ve en büyük dosyalar
+önce işlenir (paralel işte en uzun iş sona kalmaz). Bu modül Qt içermez.
+"""
+import os
+from PIL import Image
+
+# Boyutlandırma kipleri
+EXACT = "exact"          # genişlik/yükseklik; biri boşsa oran korunarak türetilir
+PERCENT = "percent"
+LONG_EDGE = "long-edge"
+SHORT_EDGE = "short-edge"
+FIT = "fit"              # kutuya sığdır, oran korunur
+FILL = "fill"            # kutuyu doldur, taşan kısım ortadan kırpılır
+MODES = (EXACT, PERCENT, LONG_EDGE, SHORT_EDGE, FIT, FILL)
+
+# Süre tahmini için varsayılan işlem hızı (kaynak megapiksel / saniye)
+DEFAULT_THROUGHPUT = 40.0
+
+
+class PlanItem:
+    def __init__(self, path, source_size, size, crop=None):
+        self.path = path
+        self.source_size = source_size
+        self.size = size        # yeniden örnekleme sonrası boyut
+        self.crop = crop        # size içinde (sol, üst, sağ, alt) ya da None
+
+    @property
+    def output_size(self):
+        if self.crop:
+            return self.crop[2] - self.crop[0], self.crop[3] - self.crop[1]
+        return self.size
+
+    @property
+    def source_pixels(self):
+        return self.source_size[0] * self.source_size[1]
+
+    def describe(self):
+        (sw, sh), (ow, oh) = self.source_size, self.output_size
+        text = f"{os.path.basename(self.path)}: {sw}x{sh} -> {ow}x{oh}"
+        if self.crop:
+            text += f" (scaled {self.size[0]}x{self.size[1]}, center crop)"
+        elif self.size == self.source_size:
+            text += " (unchanged)"
+        return text
+
+
+def read_size(path):
+    """Sadece başlığı okur; Image.open pikselleri load() çağrılana kadar çözmez."""
+    with Image.open(path) as img:
+        return img.size
+
+
+def _scaled(source, scale):
+    return max(1, round(source[0] * scale)), max(1, round(source[1] * scale))
+
+
+def compute_size(source, mode, width=None, height=None, percent=None, keep_ratio=True, no_upscale=False):
+    """Tek kaynak boyutu için (yeni boyut, kırpma kutusu) döndürür."""
+    sw, sh = source
+    if mode == EXACT:
+        if width and height:
+            size = (width, height)
+        elif width:
+            size = (width, max(1, round(sh * width / sw)) if keep_ratio else sh)
+        elif height:
+            size = (max(1, round(sw * height / sh)) if keep_ratio else sw, height)
+        else:
+            size = source
+        if no_upscale and (size[0] > sw or size[1] > sh):
+            # Oranı bozmamak için iki kenar aynı katsayıyla küçültülür
+            shrink = min(sw / size[0], sh / size[1])
+            size = (max(1, round(size[0] * shrink)), max(1, round(size[1] * shrink)))
+        return size, None
+
+    if mode == PERCENT:
+        scale = percent / 100
+    elif mode == LONG_EDGE:
+        scale = width / max(sw, sh)
+    elif mode == SHORT_EDGE:
+        scale = width / min(sw, sh)
+    elif mode == FIT:
+        scale = min(width / sw, height / sh)
+    elif mode == FILL:
+        scale = max(width / sw, height / sh)
+    else:
+        raise ValueError(f"Unknown sizing mode '{mode}'")
+    if no_upscale:
+        scale = min(1.0, scale)
+    size = _scaled(source, scale)
+
+    crop = None
+    if mode == FILL:
+        cw, ch = min(width, size[0]), min(height, size[1])
+        if (cw, ch) != size:
+            left, top = (size[0] - cw) // 2, (size[1] - ch) // 2
+            crop = (left, top, left + cw, top + ch)
+    return size, crop
+
+
+def required_values(mode):
+    """Kipin kullandığı alanlar: genişlik, yükseklik, yüzde."""
+    return {
+        EXACT: (), PERCENT: ("percent",), LONG_EDGE: ("width",), SHORT_EDGE: ("width",),
+        FIT: ("width", "height"), FILL: ("width", "height"),
+    }[mode]
+
+
+class Plan:
+    """Toplu işin tamamı: en büyük kaynak önce sıralanmış öğeler ve okunamayan dosyalar."""
+    def __init__(self, items, errors):
+        self.items = items
+        self.errors = errors
+
+    @property
+    def source_megapixels(self):
+        return sum(item.source_pixels for item in self.items) / 1e6
+
+    @property
+    def output_megapixels(self):
+        return sum(w * h for w, h in (item.output_size for item in self.items)) / 1e6
+
+    def estimate_seconds(self, throughput=DEFAULT_THROUGHPUT):
+        return self.source_megapixels / throughput if throughput else 0.0
+
+    def summary(self, throughput=DEFAULT_THROUGHPUT):
+        text = (f"{len(self.items)} images, {self.source_megapixels:.1f} MP in, "
+                f"{self.output_megapixels:.1f} MP out, about {self.estimate_seconds(throughput):.0f} s")
+        if self.errors:
+            text += f", {len(self.errors)} unreadable"
+        return text
+
+
+def make_plan(paths, mode, width=None, height=None, percent=None, keep_ratio=True, no_upscale=False):
+    """Tüm dosyalar için planı başlık okumalarıyla çıkarır; piksel çözülmez."""
+    missing = [name for name in required_values(mode)
+               if not {"width": width, "height": height, "percent": percent}[name]]
+    if mode == EXACT and not (width or height):
+        missing.append("width or height")
+    if missing:
+        raise ValueError(f"Sizing mode '{mode}' needs: {', '.join(missing)}")
+
+    items, errors = [], []
+    for path in paths:
+        try:
+            source = read_size(path)
+        except Exception as e:
+            errors.append((path, str(e)))
+            continue
+        size, crop = compute_size(source, mode, width, height, percent, keep_ratio, no_upscale)
+        items.append(PlanItem(path, source, size, crop))
+    # En büyük iş önce: toplu işin sonunda tek bir dev dosya beklenmez
+    items.sort(key=lambda item: item.source_pixels, reverse=True)
+    return Plan(items, errors)
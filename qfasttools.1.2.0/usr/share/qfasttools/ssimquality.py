@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Algısal kalite (SSIM) hedefine göre JPEG/WebP/AVIF kalite seçimi.
+
+Kaynak ile kodlanmış sonucun parlaklık (luma) düzlemleri küçültülerek
+NumPy ile karşılaştırılır; 8x8 pencereli SSIM, integral görüntüler üzerinden
+tek seferde hesaplanır. Hedef skoru karşılayan en düşük kalite, aday
+kaliteler paralel kodlanarak ikili aramayla bulunur.
+NumPy kurulu değilse is_available() False döner ve araçlar sabit kaliteyle kaydeder.
+"""
+import io
+import os
+import time
+from PIL import Image
+from convertengine import ParallelEncoder, SearchResult, candidates
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DEFAULT_SSIM_TARGET = 0.98
+# SSIM bu boyuta küçültülmüş luma üzerinde hesaplanır (daha fazla küçültme blok
+# bozulmalarını gizler ve skoru şişirir)
+SSIM_MAX_SIDE = 1024
+SSIM_WINDOW = 8
+SSIM_C1 = (0.01 * 255) ** 2
+SSIM_C2 = (0.03 * 255) ** 2
+# Aranan kalite aralığı; üst uç bile hedefe ulaşamazsa o kullanılır
+SSIM_QUALITY_RANGE = (10, 98)
+
+SSIM_EXTENSIONS = {'.jpg': 'JPEG', '.jpeg': 'JPEG', '.webp': 'WebP', '.avif': 'AVIF'}
+
+
+def is_available():
+    return np is not None
+
+
+def luma_plane(img, max_side=SSIM_MAX_SIDE):
+    """Resmin küçültülmüş gri düzlemini float32 dizi olarak döndürür."""
+    if img.mode in ('RGBA', 'LA', 'PA') or (img.mode == 'P' and 'transparency' in img.info):
+        rgba = img.convert('RGBA')
+        flat = Image.new('RGB', rgba.size, (255, 255, 255))
+        flat.paste(rgba, mask=rgba.getchannel('A'))
+        img = flat
+    gray = img.convert('L')
+    factor = max(1, -(-max(gray.size) // max_side))
+    if factor > 1:
+        gray = gray.reduce(factor)
+    return np.asarray(gray, dtype=np.float32)
+
+
+def _window_means(plane, w):
+    """w x w kayan pencere ortalamaları (integral görüntü ile, 'valid' bölge)."""
+    integral = np.pad(plane, ((1, 0), (1, 0))).astype(np.float64).cumsum(0).cumsum(1)
+    sums = integral[w:, w:] - integral[:-w, w:] - integral[w:, :-w] + integral[:-w, :-w]
+    return sums / (w * w)
+
+
+def ssim(a, b, window=SSIM_WINDOW):
+    """İki luma düzlemi arasındaki ortalama SSIM skoru (1.0 = özdeş)."""
+    w = min(window, a.shape[0], a.shape[1])
+    mu_a, mu_b = _window_means(a, w), _window_means(b, w)
+    var_a = _window_means(a * a, w) - mu_a * mu_a
+    var_b = _window_means(b * b, w) - mu_b * mu_b
+    cov = _window_means(a * b, w) - mu_a * mu_b
+    num = (2 * mu_a * mu_b + SSIM_C1) * (2 * cov + SSIM_C2)
+    den = (mu_a * mu_a + mu_b * mu_b + SSIM_C1) * (var_a + var_b + SSIM_C2)
+    return float((num / den).mean())
+
+
+def search_quality_for_ssim(img, save_args, target=DEFAULT_SSIM_TARGET, threads=None):
+    """Hedef SSIM'i karşılayan en düşük kaliteyi bulur; SearchResult.score skoru taşır.
+
+    Hiçbir kalite hedefe ulaşmazsa aralığın üst ucu fits=False ile döndürülür.
+    """
+    start = time.perf_counter()
+    reference = luma_plane(img)
+    scores = {}
+
+    def score(q, data):
+        if q not in scores:
+            with Image.open(io.BytesIO(data)) as decoded:
+                scores[q] = ssim(reference, luma_plane(decoded))
+        return scores[q]
+
+    q_min, q_max = SSIM_QUALITY_RANGE
+    with ParallelEncoder(img, save_args, threads) as encoder:
+        encoded = encoder.encoded
+        for q, data in zip((q_min, q_max), encoder.encode_many((q_min, q_max))):
+            score(q, data)
+        if scores[q_min] >= target:
+            best, fits = q_min, True
+        elif scores[q_max] < target:
+            best, fits = q_max, False
+        else:
+            lo, hi = q_min, q_max  # lo yetersiz, hi yeterli
+            while True:
+                points = candidates(lo, hi, encoder.threads)
+                if not points:
+                    break
+                for q, data in zip(points, encoder.encode_many(points)):
+                    if score(q, data) >= target:
+                        hi = q
+                        break
+                    lo = q
+            best, fits = hi, True
+    return SearchResult(best, encoded[best], len(encoded), time.perf_counter() - start, fits, scores[best])
+
+
+def ssim_format_for_path(path):
+    """Çıktı uzantısı SSIM araması destekleyen bir biçimse Pillow biçim adını döndürür."""
+    return SSIM_EXTENSIONS.get(os.path.splitext(path)[1].lower())
+
+
+def save_with_target_ssim(img, path, save_args=None, target=DEFAULT_SSIM_TARGET):
+    """Resmi hedef SSIM'i karşılayan en düşük kaliteyle kaydeder.
+
+    Biçim desteklenmiyorsa ya da NumPy yoksa sabit kaliteyle kaydeder ve None döndürür;
+    aksi halde SearchResult döndürür (quality, score).
+    """
+    save_args = dict(save_args or {})
+    fmt = ssim_format_for_path(path)
+    if fmt is None or not is_available():
+        img.save(path, **save_args)
+        return None
+    save_args["format"] = fmt
+    if fmt == "JPEG" and img.mode not in ("RGB", "L", "CMYK"):
+        img = img.convert("RGB")
+    result = search_quality_for_ssim(img, save_args, target)
+    with open(path, 'wb') as f:
+        f.write(result.data)
+    return result
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Değişen bölgeleri saklayan, bellek bütçeli geri alma (undo) motoru.
+
+Her adımda resmin tamamı yerine sadece değişen dikdörtgen (RegionDelta) ya da
+sıkıştırılmış değişen-piksel maskesi (MaskDelta) tutulur. Adım sayısı sabit
+değildir; toplam boyut bütçeyi aşınca en eski adımlar silinir.
+"""
+import zlib
+from collections import deque
+from PIL import Image
+
+DEFAULT_UNDO_BUDGET_MB = 256
+
+
+def image_nbytes(img):
+    return img.width * img.height * len(img.getbands())
+
+
+class RegionDelta:
+    """Değişiklikten önceki dikdörtgen bölgenin kopyası."""
+    def __init__(self, image, box):
+        self.box = box
+        self.region = image.crop(box)
+        self.nbytes = image_nbytes(self.region)
+
+    def restore(self, image):
+        image.paste(self.region, self.box[:2])
+
+
+class MaskDelta:
+    """Değişen piksellerin maskesi ve eski değerleri, zlib ile sıkıştırılmış."""
+    def __init__(self, image, mask):
+        self.box = mask.getbbox()
+        self.mode = image.mode
+        if self.box is None:
+            self.nbytes = 0
+            return
+        region_mask = mask.crop(self.box).convert("1")
+        region = image.crop(self.box)
+        # Değişmeyen pikseller sıfırlanır, böylece çok iyi sıkışır
+        region = Image.composite(region, Image.new(self.mode, region.size), region_mask)
+        self.size = region.size
+        self.mask_data = zlib.compress(region_mask.tobytes(), 1)
+        self.region_data = zlib.compress(region.tobytes(), 1)
+        self.nbytes = len(self.mask_data) + len(self.region_data)
+
+    def restore(self, image):
+        if self.box is None:
+            return
+        region_mask = Image.frombytes("1", self.size, zlib.decompress(self.mask_data))
+        region = Image.frombytes(self.mode, self.size, zlib.decompress(self.region_data))
+        image.paste(region, self.box[:2], region_mask)
+
+
+class UndoHistory:
+    def __init__(self, budget_mb=DEFAULT_UNDO_BUDGET_MB):
+        self.budget = budget_mb * 1024 * 1024
+        self.steps = deque()
+        self.total = 0
+
+    def clear(self):
+        self.steps.clear()
+        self.total = 0
+
+    def can_undo(self):
+        return len(self.steps) > 0
+
+    def push_region(self, image, box):
+        self._push(RegionDelta(image, box))
+
+    def push_mask(self, image, mask):
+        self._push(MaskDelta(image, mask))
+
+    def _push(self, delta):
+        self.steps.append(delta)
+        self.total += delta.nbytes
+        # Bütçe aşılırsa en eski adımları at (son adım her zaman kalır)
+        while self.total > self.budget and len(self.steps) > 1:
+            self.total -= self.steps.popleft().nbytes
+
+    def undo(self, image):
+        """Son adımı resmin üzerine yerinde geri yazar."""
+        if not self.steps:
+            return False
+        delta = self.steps.pop()
+        self.total -= delta.nbytes
+        delta.restore(image)
+        return True
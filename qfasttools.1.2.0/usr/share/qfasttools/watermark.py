@@ -6,14 +6,20 @@ from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout,
                              QLineEdit, QComboBox, QGroupBox, QFrame, QButtonGroup, 
                              QListWidget, QListWidgetItem, QSpinBox, QCheckBox, 
                              QColorDialog, QMessageBox)
-from PyQt5.QtGui import QPalette, QColor, QPixmap, QPainter, QFont, QPen, QFontDatabase, QIcon
+from PyQt5.QtGui import (QPalette, QColor, QPixmap, QPainter, QFont, QPen, QFontDatabase, QIcon,
+                         QImage, QFontMetrics, QCursor)
 from PyQt5.QtCore import Qt
+from PIL import Image
+from outputnames import claim_unique_path, discard_claim
+from watermarkengine import (WATERMARK_MARGIN, calculate_pos, read_size,
+                             scale_logo, run_batch)
 
 class WatermarkTool(QWidget):
     def __init__(self):
         super().__init__()
         self.watermark_image_path = ""
         self.current_pixmap = None
+        self.logo_cache = {}
         self.text_color = QColor(255, 255, 255)
         self.initUI()
         self.setAcceptDrops(True)
@@ -130,6 +136,17 @@ class WatermarkTool(QWidget):
         com_lay.addWidget(QLabel("Position:")); com_lay.addWidget(self.combo_pos); com_lay.addWidget(self.lbl_alpha); com_lay.addWidget(self.slider_alpha)
         self.group_common.setLayout(com_lay)
 
+        # Çıktı ayarları (kalite ve metaveri)
+        self.group_output = QGroupBox("Output")
+        out_lay = QHBoxLayout()
+        self.spin_quality = QSpinBox()
+        self.spin_quality.setRange(1, 100); self.spin_quality.setValue(95)
+        self.spin_quality.setToolTip("JPEG / WebP quality")
+        self.check_exif = QCheckBox("Keep EXIF")
+        self.check_exif.setChecked(True)
+        out_lay.addWidget(QLabel("Quality:")); out_lay.addWidget(self.spin_quality); out_lay.addWidget(self.check_exif)
+        self.group_output.setLayout(out_lay)
+
         # 4. Watermark Drop Area
         self.drop_area_wm = QLabel(">>>  DROP LOGO HERE  <<<")
         self.drop_area_wm.setAlignment(Qt.AlignCenter)
@@ -143,6 +160,7 @@ class WatermarkTool(QWidget):
         right_panel.addWidget(self.group_text)
         right_panel.addWidget(self.group_image)
         right_panel.addWidget(self.group_common)
+        right_panel.addWidget(self.group_output)
         right_panel.addWidget(self.drop_area_wm)
         right_panel.addStretch()
 
@@ -212,36 +230,113 @@ class WatermarkTool(QWidget):
         self.current_pixmap = QPixmap(path)
         self.update_preview()
 
+    def get_logo_pixmap(self, width=None):
+        """Logo dosyası bir kez yüklenir; ölçeklenmiş halleri genişliğe göre saklanır."""
+        path = self.watermark_image_path
+        if (path, None) not in self.logo_cache:
+            self.logo_cache = {(path, None): QPixmap(path)}
+        logo = self.logo_cache[(path, None)]
+        if width is None or logo.isNull():
+            return logo
+        if (path, width) not in self.logo_cache:
+            self.logo_cache[(path, width)] = logo.scaledToWidth(width, Qt.SmoothTransformation)
+        return self.logo_cache[(path, width)]
+
+    def build_text_font(self):
+        font = QFont(self.combo_font.currentText(), self.spin_font_size.value())
+        font.setBold(self.check_bold.isChecked()); font.setItalic(self.check_italic.isChecked()); font.setUnderline(self.check_under.isChecked())
+        return font
+
+    def render_text_overlay(self):
+        """Yazıyı sadece kendi boyutunda şeffaf bir katmana çizer ve PIL resmi olarak döndürür."""
+        text = self.input_text.text()
+        if not text: return None
+        alpha = self.slider_alpha.value() / 100.0
+
+        # QPixmap ile aynı DPI kullanılsın ki önizleme ile çıktı aynı boyutta olsun
+        dpm = round(QPixmap(1, 1).logicalDpiY() / 0.0254)
+        probe = QImage(1, 1, QImage.Format_RGBA8888)
+        probe.setDotsPerMeterX(dpm); probe.setDotsPerMeterY(dpm)
+        font = self.build_text_font()
+        fm = QFontMetrics(font, probe)
+        w, h = max(1, fm.width(text)), max(1, fm.height())
+        pad = fm.height() // 4  # italik taşmaları için
+
+        qimg = QImage(w + pad, h, QImage.Format_RGBA8888)
+        qimg.setDotsPerMeterX(dpm); qimg.setDotsPerMeterY(dpm)
+        qimg.fill(Qt.transparent)
+        painter = QPainter(qimg)
+        painter.setFont(font)
+        painter.setPen(QPen(QColor(self.text_color.red(), self.text_color.green(), self.text_color.blue(), int(alpha * 255))))
+        painter.drawText(0, fm.ascent(), text)
+        painter.end()
+
+        ptr = qimg.constBits()
+        ptr.setsize(qimg.byteCount())
+        overlay = Image.frombuffer("RGBA", (qimg.width(), qimg.height()), bytes(ptr), "raw", "RGBA", qimg.bytesPerLine(), 1)
+        return overlay, (w, h)
+
     def process_all_files(self):
         count = self.file_list.count()
         if count == 0:
             QMessageBox.warning(self, "Error", "No files to process!")
             return
 
-        success_count = 0
+        pos_type = self.combo_pos.currentText()
+        alpha = self.slider_alpha.value() / 100.0
+        text_overlay = self.render_text_overlay() if self.radio_text.isChecked() else None
+        logo = None
+        if not self.radio_text.isChecked() and self.watermark_image_path:
+            logo = Image.open(self.watermark_image_path).convert("RGBA")
+
+        # Filigran katmanı her farklı çıktı boyutu için bir kez hazırlanır
+        overlays = {}
+        jobs = []
+        failed = 0
         for i in range(count):
-            item = self.file_list.item(i)
-            original_path = item.data(Qt.UserRole)
-            
-            pix = QPixmap(original_path)
-            processed_pix = self.apply_watermark_logic(pix)
-            
-            if processed_pix:
-                dir_name = os.path.dirname(original_path)
-                base_name, ext = os.path.splitext(os.path.basename(original_path))
-                
-                counter = 1
-                while True:
-                    new_name = f"{base_name}.watermarked{counter}{ext}"
-                    save_path = os.path.join(dir_name, new_name)
-                    if not os.path.exists(save_path):
-                        break
-                    counter += 1
-                
-                if processed_pix.save(save_path):
-                    success_count += 1
-
-        QMessageBox.information(self, "Success", f"{success_count} files saved successfully.")
+            original_path = self.file_list.item(i).data(Qt.UserRole)
+            try:
+                size = read_size(original_path)
+            except Exception:
+                failed += 1
+                continue
+            if size not in overlays:
+                cw, ch = size
+                overlay, pos = None, (0, 0)
+                if text_overlay:
+                    overlay, (ow, oh) = text_overlay
+                    pos = calculate_pos(cw, ch, ow, oh, pos_type, WATERMARK_MARGIN)
+                elif logo:
+                    overlay = scale_logo(logo, int(cw * self.slider_scale.value() / 100.0), alpha)
+                    pos = calculate_pos(cw, ch, overlay.width, overlay.height, pos_type, WATERMARK_MARGIN)
+                overlays[size] = (overlay, pos)
+            overlay, pos = overlays[size]
+
+            dir_name = os.path.dirname(original_path)
+            base_name, ext = os.path.splitext(os.path.basename(original_path))
+            save_path = claim_unique_path(dir_name, f"{base_name}.watermarked", ext)
+            jobs.append((original_path, save_path, overlay, pos))
+
+        QApplication.setOverrideCursor(QCursor(Qt.WaitCursor))
+        try:
+            success_count = run_batch(jobs, quality=self.spin_quality.value(),
+                                      keep_exif=self.check_exif.isChecked(),
+                                      progress=self.on_batch_progress)
+        finally:
+            QApplication.restoreOverrideCursor()
+            self.btn_doit.setText("Do it!")
+
+        # Okunamayan dosyalar işe hiç girmez; kalanlar işçide başarısız olanlardır
+        failed += len(jobs) - success_count
+        message = f"{success_count} files saved successfully."
+        if failed:
+            message += f"\n{failed} files could not be processed."
+        QMessageBox.information(self, "Success", message)
+
+    def on_batch_progress(self, done, total, save_path, ok):
+        if not ok: discard_claim(save_path)
+        self.btn_doit.setText(f"Processing... {done}/{total}")
+        QApplication.processEvents()
 
     def apply_watermark_logic(self, target_pixmap):
         if target_pixmap.isNull(): return None
@@ -250,14 +345,12 @@ class WatermarkTool(QWidget):
         painter = QPainter(result_pixmap)
         pos_type = self.combo_pos.currentText()
         alpha = self.slider_alpha.value() / 100.0
-        margin = 40
+        margin = WATERMARK_MARGIN
 
         if self.radio_text.isChecked():
             text = self.input_text.text()
             if text:
-                font = QFont(self.combo_font.currentText(), self.spin_font_size.value())
-                font.setBold(self.check_bold.isChecked()); font.setItalic(self.check_italic.isChecked()); font.setUnderline(self.check_under.isChecked())
-                painter.setFont(font)
+                painter.setFont(self.build_text_font())
                 color = QColor(self.text_color.red(), self.text_color.green(), self.text_color.blue(), int(alpha * 255))
                 painter.setPen(QPen(color))
                 fm = painter.fontMetrics()
@@ -267,11 +360,11 @@ class WatermarkTool(QWidget):
                 painter.drawText(x, y + fm.ascent(), text)
         else:
             if self.watermark_image_path:
-                wm_pix = QPixmap(self.watermark_image_path)
+                wm_pix = self.get_logo_pixmap()
                 if not wm_pix.isNull():
                     scale = self.slider_scale.value() / 100.0
                     nw = int(result_pixmap.width() * scale)
-                    wm_pix = wm_pix.scaledToWidth(nw, Qt.SmoothTransformation)
+                    wm_pix = self.get_logo_pixmap(nw)
                     x, y = self.calculate_pos(result_pixmap.width(), result_pixmap.height(), wm_pix.width(), wm_pix.height(), pos_type, margin)
                     painter.setOpacity(alpha)
                     painter.drawPixmap(x, y, wm_pix)
@@ -290,11 +383,7 @@ class WatermarkTool(QWidget):
             self.lbl_preview.setPixmap(scaled)
 
     def calculate_pos(self, cw, ch, ow, oh, p, m):
-        if p == "Bottom Right": return cw - ow - m, ch - oh - m
-        if p == "Top Right": return cw - ow - m, m
-        if p == "Bottom Left": return m, ch - oh - m
-        if p == "Top Left": return m, m
-        return (cw - ow) // 2, (ch - oh) // 2
+        return calculate_pos(cw, ch, ow, oh, p, m)
 
     def resizeEvent(self, event):
         self.update_preview()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Watermark Studio için PIL tabanlı, çok işlemli toplu filigran motoru.
+
+Filigran katmanı (yazı ya da logo) ana işlemde her farklı çıktı boyutu için
+bir kez hazırlanır. İşçi süreçler resmi açar, sadece filigranın kapladığı
+bölgeyi alpha_composite ile birleştirir ve EXIF/ICC bilgisini koruyarak kaydeder.
+"""
+import os
+from concurrent.futures import as_completed
+from PIL import Image
+from workerpool import process_pool
+
+WATERMARK_MARGIN = 40
+QUALITY_FORMATS = ('JPEG', 'WEBP', 'AVIF')
+
+
+def calculate_pos(cw, ch, ow, oh, p, m=WATERMARK_MARGIN):
+    if p == "Bottom Right": return cw - ow - m, ch - oh - m
+    if p == "Top Right": return cw - ow - m, m
+    if p == "Bottom Left": return m, ch - oh - m
+    if p == "Top Left": return m, m
+    return (cw - ow) // 2, (ch - oh) // 2
+
+
+def read_size(path):
+    """Sadece başlığı okuyarak (piksel çözmeden) boyutu döndürür."""
+    with Image.open(path) as img:
+        return img.size
+
+
+def apply_opacity(overlay, opacity):
+    overlay = overlay.convert("RGBA")
+    if opacity < 1.0:
+        alpha = overlay.getchannel("A").point(lambda v: int(v * opacity))
+        overlay.putalpha(alpha)
+    return overlay
+
+
+def scale_logo(logo, target_width, opacity):
+    """Logoyu hedef resmin genişliğine göre ölçekler (QPixmap.scaledToWidth eşdeğeri)."""
+    nw = max(1, target_width)
+    nh = max(1, int(logo.height * nw / logo.width))
+    return apply_opacity(logo.resize((nw, nh), Image.LANCZOS), opacity)
+
+
+def composite_region(img, overlay, pos):
+    """Filigranı sadece kapladığı bölgede birleştirir; resmin geri kalanına dokunmaz."""
+    if overlay is None:
+        return img
+    x, y = pos
+    # Resim dışına taşan kısımları kes
+    ox0, oy0 = max(0, -x), max(0, -y)
+    ox1, oy1 = min(overlay.width, img.width - x), min(overlay.height, img.height - y)
+    if ox1 <= ox0 or oy1 <= oy0:
+        return img
+    if ox0 or oy0 or ox1 < overlay.width or oy1 < overlay.height:
+        overlay = overlay.crop((ox0, oy0, ox1, oy1))
+    box = (x + ox0, y + oy0, x + ox1, y + oy1)
+
+    if img.mode not in ("RGB", "RGBA", "L"):
+        img = img.convert("RGBA" if "A" in img.getbands() or "transparency" in img.info else "RGB")
+    region = img.crop(box).convert("RGBA")
+    region.alpha_composite(overlay)
+    img.paste(region.convert(img.mode), box[:2])
+    return img
+
+
+def watermark_file(src, dst, overlay, pos, quality=95, keep_exif=True):
+    """İşçi süreçte çalışır: tek bir dosyayı filigranlar ve kaydeder."""
+    with Image.open(src) as img:
+        fmt = img.format
+        exif = img.info.get('exif') if keep_exif else None
+        icc = img.info.get('icc_profile')
+        img.load()
+        out = composite_region(img, overlay, pos)
+
+    save_fmt = Image.registered_extensions().get(os.path.splitext(dst)[1].lower(), fmt)
+    save_args = {"format": save_fmt}
+    if save_fmt in QUALITY_FORMATS:
+        save_args["quality"] = quality
+        if out.mode not in ("RGB", "L") and save_fmt == 'JPEG':
+            out = out.convert("RGB")
+    if exif:
+        save_args["exif"] = exif
+    if icc:
+        save_args["icc_profile"] = icc
+    out.save(dst, **save_args)
+    return dst
+
+
+def run_batch(jobs, quality=95, keep_exif=True, max_workers=None, progress=None):
+    """jobs: (src, dst, overlay, pos) listesi. Başarılı dosya sayısını döndürür.
+
+    progress(done, total, dst, ok) her dosya bittiğinde ana işlemde çağrılır.
+    """
+    total = len(jobs)
+    success = 0
+    done = 0
+    with process_pool(max_workers) as pool:
+        futures = {pool.submit(watermark_file, src, dst, overlay, pos, quality, keep_exif): dst
+                   for src, dst, overlay, pos in jobs}
+        for future in as_completed(futures):
+            done += 1
+            ok = future.exception() is None
+            success += ok
+            if progress:
+                progress(done, total, futures[future], ok)
+    return success
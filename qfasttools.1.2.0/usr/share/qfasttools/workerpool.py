@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""Toplu işlerin ortak süreç havuzu.
+
+İşçiler "spawn" ile başlatılır: fork, ana süreçteki Qt ve iş parçacığı
+durumunu (kilitler dahil) kopyalar ve kilitlenmelere yol açabilir. spawn her
+işçide ana betiği __mp_main__ olarak yeniden içe aktarır; GUI betiklerinde bu
+PyQt5'in de yüklenmesi demektir. Pencere ve QApplication bu yüzden sadece
+"if __name__ == '__main__'" bloğunda oluşturulur, işçilerin çalıştırdığı iş
+birimleri Qt içermeyen motor modüllerindedir.
+"""
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+
+def process_pool(max_workers=None):
+    return ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(),
+                               mp_context=multiprocessing.get_context("spawn"))